@@ -0,0 +1,2 @@
+-- Track how many times the worker has attempted each job (retry limit and crash recovery)
+ALTER TABLE analysis_jobs ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;
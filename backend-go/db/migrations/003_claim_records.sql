@@ -0,0 +1,32 @@
+-- Claims and verification results as typed rows (queryable without parsing report text)
+CREATE TABLE IF NOT EXISTS claims (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_id UUID NOT NULL REFERENCES analysis_jobs(id) ON DELETE CASCADE,
+    deck_id UUID REFERENCES pitch_decks(id) ON DELETE CASCADE,
+    investor_id UUID REFERENCES investors(id) ON DELETE CASCADE,
+    claim_index INTEGER NOT NULL,
+    claim_text TEXT NOT NULL,
+    metric VARCHAR(50),
+    value NUMERIC,
+    unit VARCHAR(10),
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS claim_verifications (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    claim_id UUID NOT NULL REFERENCES claims(id) ON DELETE CASCADE,
+    job_id UUID NOT NULL REFERENCES analysis_jobs(id) ON DELETE CASCADE,
+    deck_id UUID REFERENCES pitch_decks(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL,
+    evidence TEXT,
+    source_urls TEXT[],
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_claims_job ON claims(job_id);
+CREATE INDEX IF NOT EXISTS idx_claims_deck ON claims(deck_id);
+CREATE INDEX IF NOT EXISTS idx_claims_metric_value ON claims(metric, value);
+CREATE INDEX IF NOT EXISTS idx_verifications_claim ON claim_verifications(claim_id);
+CREATE INDEX IF NOT EXISTS idx_verifications_job ON claim_verifications(job_id);
+CREATE INDEX IF NOT EXISTS idx_verifications_status_created ON claim_verifications(status, created_at);
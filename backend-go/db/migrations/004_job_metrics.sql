@@ -0,0 +1,20 @@
+-- Per-attempt pipeline instrumentation: stage wall time, LLM usage, search calls and cache hits
+CREATE TABLE IF NOT EXISTS job_metrics (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_id UUID NOT NULL REFERENCES analysis_jobs(id) ON DELETE CASCADE,
+    attempt INTEGER NOT NULL DEFAULT 0,
+    status VARCHAR(50) NOT NULL,
+    total_seconds DOUBLE PRECISION NOT NULL,
+    llm_calls INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    search_calls INTEGER NOT NULL DEFAULT 0,
+    stage_seconds JSONB,
+    llm_usage JSONB,
+    counters JSONB,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_job_metrics_job ON job_metrics(job_id);
+CREATE INDEX IF NOT EXISTS idx_job_metrics_created ON job_metrics(created_at);
@@ -43,6 +43,7 @@ type AnalysisJob struct {
 	FinalReport         *string    `db:"final_report" json:"final_report,omitempty"`
 	FinalReportGCSPath  *string    `db:"final_report_gcs_path" json:"final_report_gcs_path,omitempty"`
 	ErrorMessage        *string    `db:"error_message" json:"error_message,omitempty"`
+	Attempts            int        `db:"attempts" json:"attempts"`
 	StartedAt           *time.Time `db:"started_at" json:"started_at,omitempty"`
 	CompletedAt         *time.Time `db:"completed_at" json:"completed_at,omitempty"`
 	CreatedAt           time.Time  `db:"created_at" json:"created_at"`
@@ -52,6 +53,13 @@ type AnalysisJob struct {
 const (
 	JobStatusPending   = "pending"
 	JobStatusRunning   = "running"
+	JobStatusRetrying  = "retrying"
 	JobStatusCompleted = "completed"
 	JobStatusFailed    = "failed"
+
+	// Checkpoints a running job passes through; claims_extracted and
+	// verification_results are filled in as soon as they are reached
+	JobStatusExtracted   = "extracted"
+	JobStatusClaimsReady = "claims_ready"
+	JobStatusVerified    = "verified"
 )
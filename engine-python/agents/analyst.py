@@ -1,23 +1,9 @@
-import os
-from crewai import Agent, LLM
 from typing import Optional
+from crewai import Agent
 
-def get_llm():
-    """Get the configured LLM (OpenAI or fallback)."""
-    openai_key = os.getenv("OPENAI_API_KEY")
-    if openai_key and openai_key != 'YOUR_OPENAI_API_KEY_HERE' and openai_key != 'NA':
-        return LLM(
-            model="openai/gpt-4o-mini",
-            api_key=openai_key,
-            temperature=0.7
-        )
-    # Fallback to local Ollama
-    return LLM(
-        model="ollama/llama3.2",
-        base_url="http://localhost:11434"
-    )
+from llm import get_llm
 
-def create_analyst_agent(investor_context: Optional[str] = None):
+def create_analyst_agent(investor_context: Optional[str] = None, memo_context: Optional[str] = None):
     base_backstory = (
         "You are a cynical, detail-oriented venture capital analyst. You take the claims "
         "extracted by the Scribe and the verification report from the Researcher, and you "
@@ -36,12 +22,20 @@ def create_analyst_agent(investor_context: Optional[str] = None):
         )
     else:
         personalized_backstory = base_backstory
+
+    if memo_context:
+        personalized_backstory = (
+            f"{personalized_backstory}\n\n"
+            f"Relevant excerpts from this investor's past deal memos:\n"
+            f"{memo_context}\n\n"
+            f"Where this deck resembles a past deal, say so and apply the same reasoning."
+        )
     
     return Agent(
         role='Adversarial Analyst',
         goal='Identify red flags, missing information, and generate key questions tailored to the investor',
         backstory=personalized_backstory,
-        llm=get_llm(),
+        llm=get_llm("analyst"),
         tools=[],
         verbose=True,
         allow_delegation=False
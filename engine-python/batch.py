@@ -0,0 +1,218 @@
+"""
+Batch Analysis
+Runs a set of pitch decks through the same pipeline and caches as the worker,
+several at a time, without going through the queue or the UI. Each deck's
+claims, verification report and final report are written to the output
+directory, and summary.csv records status, timings and LLM usage per deck.
+
+Decks can be given as directories (every PDF / txt inside), globs or files,
+and/or a manifest: a CSV with a `path` column (and optional `investor_id`),
+or a plain list with one path per line. Relative manifest paths are resolved
+against the manifest's directory.
+
+Usage (from engine-python/):
+    python batch.py ../decks "../demo-day/*.pdf" [--manifest decks.csv]
+        [--investor ID] [--concurrency 4] [--output outputs/batch]
+"""
+import argparse
+import csv
+import glob
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from db.models import SessionLocal
+from extraction import start_ocr_pool
+from metrics import track_job
+from pipeline import parse_claims
+from worker import analyze_deck, get_investor_profile
+
+# Decks analyzed at once; each one already runs its own stages in parallel
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_OUTPUT_DIR = os.getenv("BATCH_OUTPUT_DIR", "outputs/batch")
+
+DECK_EXTENSIONS = (".pdf", ".txt")
+STAGE_COLUMNS = ("extraction", "ocr", "scribe", "verification", "personalization", "analyst")
+SUMMARY_COLUMNS = (
+    ["deck", "investor_id", "status", "seconds", "claims", "llm_calls", "prompt_tokens",
+     "completion_tokens", "search_calls", "cache_hits"]
+    + [f"{name}_seconds" for name in STAGE_COLUMNS]
+    + ["output", "error"]
+)
+
+
+def read_manifest(path: str) -> List[Tuple[str, Optional[str]]]:
+    """Decks listed in a manifest as (path, investor_id or None)."""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, newline="") as f:
+        text = f.read()
+
+    entries = []
+    first = text.lstrip().splitlines()[0] if text.strip() else ""
+    if "path" in [column.strip() for column in first.split(",")]:
+        for row in csv.DictReader(text.splitlines()):
+            deck = (row.get("path") or "").strip()
+            if deck:
+                entries.append((deck, (row.get("investor_id") or "").strip() or None))
+    else:
+        for line in text.splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                entries.append((line, None))
+    decks = []
+    for deck, investor_id in entries:
+        deck = os.path.join(base, deck)
+        if os.path.isfile(deck):
+            decks.append((deck, investor_id))
+        else:
+            print(f"[Batch] Skipping {deck}: not found")
+    return decks
+
+
+def collect_decks(inputs: List[str]) -> List[str]:
+    """Expand directories and globs into deck files, in a stable order without duplicates."""
+    decks = []
+    for item in inputs:
+        if os.path.isdir(item):
+            found = sorted(os.path.join(item, name) for name in os.listdir(item))
+        elif glob.has_magic(item):
+            found = sorted(glob.glob(item, recursive=True))
+        elif os.path.isfile(item):
+            found = [item]
+        else:
+            print(f"[Batch] Skipping {item}: not found")
+            continue
+        decks.extend(
+            path for path in found
+            if os.path.isfile(path) and path.lower().endswith(DECK_EXTENSIONS)
+        )
+
+    seen, unique = set(), []
+    for deck in decks:
+        key = os.path.abspath(deck)
+        if key not in seen:
+            seen.add(key)
+            unique.append(deck)
+    return unique
+
+
+def load_profiles(investor_ids) -> Dict[str, Optional[Dict]]:
+    """SQL profiles for the investors (None where unknown or the database is unreachable)."""
+    profiles = {}
+    for investor_id in investor_ids:
+        db = SessionLocal()
+        try:
+            profiles[investor_id] = get_investor_profile(db, investor_id)
+        except Exception as e:
+            reason = str(e).splitlines()[0] if str(e) else type(e).__name__
+            print(f"[Batch] No SQL profile for investor {investor_id} ({reason}); using the Vector DB profile only")
+            profiles[investor_id] = None
+        finally:
+            db.close()
+    return profiles
+
+
+def output_names(decks: List[str]) -> List[str]:
+    """One output directory name per deck, from its file name (suffixed on collisions)."""
+    names, used = [], set()
+    for deck in decks:
+        stem = re.sub(r"[^A-Za-z0-9._-]+", "_", os.path.splitext(os.path.basename(deck))[0]) or "deck"
+        name, n = stem, 1
+        while name in used:
+            n += 1
+            name = f"{stem}_{n}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def write_output(path: str, text: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text or "")
+
+
+def analyze(deck: str, investor_id: Optional[str], profile: Optional[Dict], out_dir: str) -> Dict:
+    """Analyze one deck and write its outputs. Returns its summary row; never raises."""
+    row = {"deck": deck, "investor_id": investor_id or "", "status": "completed", "output": out_dir, "error": ""}
+    claims = ""
+    with track_job(os.path.basename(out_dir)) as job:
+        try:
+            claims, verification, report = analyze_deck(investor_id, profile, deck_path=deck)
+            write_output(os.path.join(out_dir, "claims.txt"), claims)
+            write_output(os.path.join(out_dir, "verification_report.md"), verification)
+            write_output(os.path.join(out_dir, "final_report.md"), report)
+        except Exception as e:
+            print(f"[Batch] {deck} failed: {e}")
+            row.update(status="failed", error=str(e))
+
+    totals = job.totals()
+    summary = job.to_dict()
+    row.update({
+        "seconds": round(summary["seconds"], 2),
+        "claims": len(parse_claims(claims)) if claims else 0,
+        "llm_calls": totals["calls"],
+        "prompt_tokens": totals["prompt_tokens"],
+        "completion_tokens": totals["completion_tokens"],
+        "search_calls": int(summary["counters"].get("search_call", 0)),
+        "cache_hits": int(sum(v for k, v in summary["counters"].items() if k.startswith("cache_hit:"))),
+    })
+    for name in STAGE_COLUMNS:
+        row[f"{name}_seconds"] = round(summary["stages"].get(name, 0.0), 2)
+    print(f"[Batch] {deck}: {row['status']} in {row['seconds']:.1f}s ({row['claims']} claims)")
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a batch of pitch decks")
+    parser.add_argument("inputs", nargs="*", help="Deck files, directories or globs (PDF / txt)")
+    parser.add_argument("--manifest", help="CSV with path[,investor_id] columns, or one deck path per line")
+    parser.add_argument("--investor", default=os.getenv("INVESTOR_ID"),
+                        help="Investor to personalize for (manifest investor_id takes precedence)")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="Decks analyzed at once")
+    parser.add_argument("--output", default=BATCH_OUTPUT_DIR, help="Directory for reports and summary.csv")
+    args = parser.parse_args()
+
+    jobs = [(deck, args.investor) for deck in collect_decks(args.inputs)]
+    if args.manifest:
+        jobs += [(deck, investor_id or args.investor) for deck, investor_id in read_manifest(args.manifest)]
+    # The same deck for the same investor is only analyzed once
+    jobs = list({(os.path.abspath(deck), investor_id): (deck, investor_id) for deck, investor_id in jobs}.values())
+    if not jobs:
+        parser.error("no decks found")
+
+    investors = {investor_id for _, investor_id in jobs if investor_id}
+    profiles = load_profiles(sorted(investors))
+    names = output_names([deck for deck, _ in jobs])
+    print(f"[Batch] {len(jobs)} deck(s), {args.concurrency} at a time, writing to {args.output}")
+
+    start_ocr_pool()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        rows = list(pool.map(
+            lambda job, name: analyze(job[0], job[1], profiles.get(job[1]), os.path.join(args.output, name)),
+            jobs, names,
+        ))
+    wall = time.perf_counter() - started
+
+    os.makedirs(args.output, exist_ok=True)
+    summary_path = os.path.join(args.output, "summary.csv")
+    with open(summary_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    failed = [row for row in rows if row["status"] != "completed"]
+    print(f"[Batch] {len(rows) - len(failed)}/{len(rows)} completed in {wall:.1f}s; summary at {summary_path}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
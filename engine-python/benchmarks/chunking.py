@@ -0,0 +1,126 @@
+"""
+Scribe Input Benchmark
+Compares what the Scribe is sent for each bundled deck: the old single-prompt
+truncation (first 4000 chars), raw chunked extraction, and compacted chunked
+extraction (boilerplate stripped, densest slides within the token budget).
+
+Every chunk is sent as a Scribe-shaped chat completion through the shared LLM
+client and timed, once serially and once `--concurrency` at a time. By default
+the calls go to the local stub LLM (benchmarks/stubs.py), whose latency grows
+with prompt size; --live sends them to the configured provider instead.
+Reports input tokens, calls, claims returned and the measured wall times.
+
+Usage (from engine-python/):
+    python -m benchmarks.chunking [--chunk-tokens 1000] [--budget-tokens 8000] [--concurrency 4] [--live]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DECKS = ["pitch_deck.pdf", "shopify-pitch-deck.pdf", "mock_pitch_deck.txt"]
+TRUNCATE_CHARS = 4000
+
+# Same instructions the worker's Scribe task carries
+SCRIBE_SYSTEM = (
+    "You are an expert financial analyst and scribe. Your job is to read pitch decks "
+    "and extract every specific claim made by the founders. You focus on numbers, "
+    "dates, partnership names, and growth metrics. You ignore vague marketing fluff."
+)
+SCRIBE_TASK = """Extract key claims from the following pitch deck text.
+Focus on the COMPANY being pitched (ignore sample dashboard data like example store names).
+Extract specific numbers, metrics, market sizes, growth rates, and revenue figures about the company.
+
+PITCH DECK TEXT:
+{chunk}"""
+
+
+def extract_claims(chunk: str) -> List[str]:
+    from llm import complete
+    from pipeline import parse_claims
+
+    answer = complete("scribe", [
+        {"role": "system", "content": SCRIBE_SYSTEM},
+        {"role": "user", "content": SCRIBE_TASK.format(chunk=chunk)},
+    ])
+    return parse_claims((answer or "").split("Final Answer:")[-1])
+
+
+def timed_run(chunks: List[str], concurrency: int) -> Tuple[float, int]:
+    """Extract claims from every chunk, `concurrency` calls at a time. Returns (seconds, unique claims)."""
+    from pipeline import merge_claims
+
+    if not chunks:
+        return 0.0, 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunks)))) as pool:
+        claims = merge_claims(list(pool.map(extract_claims, chunks)))
+    return time.perf_counter() - started, len(claims)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time truncated, chunked and compacted Scribe extraction")
+    parser.add_argument("--chunk-tokens", type=int, default=1000)
+    parser.add_argument("--budget-tokens", type=int, default=8000, help="Compaction budget (0 = no limit)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--live", action="store_true", help="Call the configured LLM instead of the stub")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Stub LLM seconds per call")
+    parser.add_argument("--llm-latency-per-1k", type=float, default=0.2, help="Stub LLM seconds per 1000 tokens")
+    args = parser.parse_args()
+
+    stubs = None
+    if not args.live:
+        from benchmarks.stubs import StubServer
+
+        stubs = StubServer(0, args.llm_latency, args.llm_latency_per_1k, 0).start()
+        os.environ.update({
+            "OPENAI_API_KEY": "stub",
+            "OPENAI_API_BASE": f"{stubs.url}/v1",
+            "LLM_MODEL": "openai/stub",
+        })
+    # Every call must reach the LLM to be timed
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+
+    from extraction import extract_document
+    from pipeline import chunk_pages, compact_pages, count_tokens
+
+    target = "live LLM" if args.live else (
+        f"stub LLM ({args.llm_latency}s per call + {args.llm_latency_per_1k}s per 1k tokens)"
+    )
+    print(f"Measured Scribe calls against the {target}, concurrency {args.concurrency}")
+    # Connection setup is not part of any one mode's timing
+    extract_claims("Warm-up: ARR of $1M.")
+    print(f"{'deck':<26}{'pages':>7}{'mode':>11}{'tokens':>8}{'calls':>7}{'claims':>8}{'serial s':>10}{'conc s':>8}")
+    for name in DECKS:
+        path = os.path.join(REPO_ROOT, name)
+        if not os.path.exists(path):
+            print(f"{name:<26}missing")
+            continue
+        doc = extract_document(path)
+        pages = [p["text"] for p in doc["pages"] if p["text"].strip()]
+        truncated = "\n\n".join(pages)[:TRUNCATE_CHARS]
+        compacted, stats = compact_pages(pages, args.budget_tokens)
+
+        for mode, chunks in (
+            ("truncated", [truncated] if truncated else []),
+            ("chunked", chunk_pages(pages, args.chunk_tokens)),
+            ("compacted", chunk_pages(compacted, args.chunk_tokens)),
+        ):
+            tokens = sum(count_tokens(chunk) for chunk in chunks)
+            serial, claims = timed_run(chunks, 1)
+            concurrent, _ = timed_run(chunks, args.concurrency)
+            print(f"{name:<26}{len(pages):>7}{mode:>11}{tokens:>8}{len(chunks):>7}{claims:>8}"
+                  f"{serial:>10.2f}{concurrent:>8.2f}")
+        print(f"{'':<26}{'':>7}{'':>11}  {stats['pages_out']}/{stats['pages_in']} slides kept after compaction")
+
+    if stubs:
+        stubs.shutdown()
+
+
+if __name__ == "__main__":
+    main()
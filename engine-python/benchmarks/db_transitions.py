@@ -0,0 +1,145 @@
+"""
+Job State Transition Benchmark
+Measures job lifecycle transitions per second (started -> completed) for the
+old read-then-write ORM updates vs the single conditional UPDATE statements in
+db.models.
+
+Runs against a throwaway SQLite file by default; pass --url to point it at a
+local Postgres that already has the schema applied (rows it creates are deleted).
+
+Usage (from engine-python/):
+    python -m benchmarks.db_transitions [--jobs 2000] [--threads 1] [--url postgresql://...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    id CHAR(32) PRIMARY KEY,
+    deck_id CHAR(32),
+    investor_id CHAR(32),
+    status VARCHAR(50) DEFAULT 'pending',
+    claims_extracted JSON,
+    verification_results JSON,
+    final_report TEXT,
+    final_report_gcs_path TEXT,
+    error_message TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def legacy_started(db, models, job_id):
+    job = models.get_job_by_id(db, job_id)
+    if job:
+        job.status = "running"
+        job.attempts = (job.attempts or 0) + 1
+        job.started_at = models.func.now()
+        db.commit()
+
+
+def legacy_completed(db, models, job_id):
+    job = models.get_job_by_id(db, job_id)
+    if job:
+        job.status = "completed"
+        job.claims_extracted = {"raw": "claims"}
+        job.verification_results = {"raw": "verification"}
+        job.final_report = "report"
+        job.completed_at = models.func.now()
+        db.commit()
+
+
+def conditional_started(db, models, job_id):
+    return models.update_job_started(db, job_id)
+
+
+def conditional_completed(db, models, job_id, attempt=None):
+    models.update_job_completed(db, job_id, "claims", "verification", "report", attempt=attempt)
+
+
+def run(models, job_ids, threads, started, completed):
+    """Drive every job through started -> completed; returns transitions per second."""
+    chunks = [job_ids[i::threads] for i in range(threads)]
+
+    def worker(ids):
+        db = models.SessionLocal()
+        try:
+            for job_id in ids:
+                attempt = started(db, models, job_id)
+                if completed is conditional_completed:
+                    completed(db, models, job_id, attempt)
+                else:
+                    completed(db, models, job_id)
+        finally:
+            db.close()
+
+    pool = [threading.Thread(target=worker, args=(ids,)) for ids in chunks]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return 2 * len(job_ids) / (time.perf_counter() - start)
+
+
+def seed(models, count):
+    db = models.SessionLocal()
+    ids = [uuid.uuid4() for _ in range(count)]
+    db.add_all(models.AnalysisJob(id=job_id, status="pending", attempts=0) for job_id in ids)
+    db.commit()
+    db.close()
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job state transitions")
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--url", help="Database URL (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    tmp = None
+    if not args.url:
+        tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        args.url = f"sqlite:///{tmp.name}"
+    os.environ["DATABASE_URL"] = args.url
+
+    from sqlalchemy import text
+    import db.models as models
+
+    if args.url.startswith("sqlite"):
+        with models.engine.begin() as conn:
+            conn.execute(text(SQLITE_SCHEMA))
+
+    print(f"[Bench] {args.jobs} jobs, {args.threads} thread(s), {args.url.split('@')[-1]}")
+    results = {}
+    for name, started, completed in (
+        ("select + update (old)", legacy_started, legacy_completed),
+        ("conditional update", conditional_started, conditional_completed),
+    ):
+        job_ids = seed(models, args.jobs)
+        results[name] = run(models, job_ids, args.threads, started, completed)
+        print(f"[Bench] {name:<24}{results[name]:>10.0f} transitions/s")
+        with models.engine.begin() as conn:
+            conn.execute(models.AnalysisJob.__table__.delete().where(models.AnalysisJob.id.in_(job_ids)))
+
+    old, new = results.values()
+    print(f"[Bench] speedup: {new / old:.2f}x")
+
+    if tmp:
+        models.engine.dispose()
+        os.unlink(tmp.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+End-to-End Pipeline Benchmark
+Runs the worker pipeline (extraction -> chunked Scribe -> claim verification ->
+Analyst) on the bundled decks against local stand-ins only: the mock LLM and
+search stubs from benchmarks.stubs, and the local NumPy vector store. Nothing
+leaves the machine, so runs are repeatable.
+
+Each concurrency level runs in a fresh subprocess (own caches, own peak RSS)
+and reports throughput, p50/p95 job latency, peak RSS and LLM usage.
+
+Usage (from engine-python/):
+    python -m benchmarks.pipeline [--concurrency 1,2,4] [--jobs 6] [--llm-latency 0.5]
+        [--warm-caches] [--with-memory] [--json outputs/benchmarks/pipeline.json]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENGINE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(ENGINE_DIR)
+DECKS = ["mock_pitch_deck.txt", "pitch_deck.pdf", "shopify-pitch-deck.pdf"]
+LOG_DIR = os.path.join(ENGINE_DIR, "outputs", "benchmarks")
+
+BENCH_INVESTOR = "benchmark-investor"
+BENCH_PROFILE = {
+    "thesis": "B2B SaaS with strong recurring revenue",
+    "deal_breakers": ["Burn rate > 3x revenue"],
+    "focus_areas": ["B2B SaaS", "Developer Tools"],
+    "notes": "",
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def child_env(args, stub_url: str, workdir: str) -> Dict[str, str]:
+    """Environment that points every external dependency at a local stand-in."""
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": "benchmark",
+        "LLM_MODEL": "openai/gpt-4o-mini",
+        "OPENAI_API_BASE": f"{stub_url}/v1",
+        "OPENAI_BASE_URL": f"{stub_url}/v1",
+        "SERPER_API_KEY": "benchmark",
+        "SERPER_BASE_URL": stub_url,
+        "VECTOR_STORE": "local",
+        "LOCAL_VECTOR_DIR": os.path.join(workdir, "vectors"),
+        "CACHE_DIR": os.path.join(workdir, "cache"),
+        "FACT_VECTOR_DIR": os.path.join(workdir, "cache", "claim_vectors"),
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+        "METRICS_PORT": "0",
+    })
+    # Stage models on other providers then fall back to LLM_MODEL on the stub
+    env.pop("GOOGLE_API_KEY", None)
+    env.pop("GEMINI_API_KEY", None)
+    if not args.warm_caches:
+        # Measure the cold path: nothing computed by one job is reused by the next
+        env.update({
+            "EXTRACTION_CACHE_MAX_ENTRIES": "0",
+            "SEARCH_CACHE_MAX_ENTRIES": "0",
+            "FACT_CACHE_ENABLED": "false",
+            "LLM_CACHE_ENABLED": "false",
+        })
+    if not args.with_memory:
+        # Claim similarity matching would load the embedding model inside the timed stages
+        env["FACT_SIMILARITY_ENABLED"] = "false"
+    return env
+
+
+def run_level(concurrency: int, jobs: int, with_memory: bool) -> Dict:
+    """Child process: run `jobs` analyses with `concurrency` slots and return the measurements."""
+    import worker
+    from metrics import track_job
+
+    decks = [os.path.join(REPO_ROOT, name) for name in DECKS if os.path.exists(os.path.join(REPO_ROOT, name))]
+    investor_id = BENCH_INVESTOR if with_memory else None
+    if with_memory:
+        from personalization import InvestorMemory
+        with open(os.path.join(REPO_ROOT, "mock_pitch_deck.txt")) as f:
+            sample = f.read()
+        InvestorMemory(backend="local").store_memos(
+            BENCH_INVESTOR,
+            [{"memo_id": f"bench-{i}", "text": f"Memo {i}: passed on a similar deck.\n\n{sample}"}
+             for i in range(20)],
+        )
+
+    def run_job(index: int) -> Dict:
+        deck = decks[index % len(decks)]
+        with track_job(f"bench-{index}") as job:
+            worker.run_pipeline(investor_id, BENCH_PROFILE if with_memory else None, deck_path=deck)
+        return {"deck": os.path.basename(deck), **job.to_dict(), "totals": job.totals()}
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(run_job, range(jobs)))
+    wall = time.perf_counter() - started
+
+    latencies = [r["seconds"] for r in results]
+    stage_totals: Dict[str, float] = {}
+    for r in results:
+        for name, seconds in r["stages"].items():
+            stage_totals[name] = stage_totals.get(name, 0.0) + seconds
+    return {
+        "concurrency": concurrency,
+        "jobs": jobs,
+        "wall_seconds": round(wall, 3),
+        "jobs_per_minute": round(60 * jobs / wall, 2),
+        "p50_seconds": round(percentile(latencies, 50), 3),
+        "p95_seconds": round(percentile(latencies, 95), 3),
+        # ru_maxrss is KiB on Linux; children covers the OCR process pool
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_child_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        "llm_calls": sum(r["totals"]["calls"] for r in results),
+        "llm_tokens": sum(r["totals"]["prompt_tokens"] + r["totals"]["completion_tokens"] for r in results),
+        "mean_stage_seconds": {k: round(v / jobs, 3) for k, v in stage_totals.items()},
+        "jobs_detail": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark")
+    parser.add_argument("--concurrency", default="1,2,4", help="Comma-separated worker concurrency levels")
+    parser.add_argument("--jobs", type=int, default=6, help="Jobs per level (decks are cycled)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Mock LLM seconds per call")
+    parser.add_argument("--llm-latency-per-1k", type=float, default=0.2, help="Mock LLM seconds per 1000 tokens")
+    parser.add_argument("--search-latency", type=float, default=0.2, help="Stub search seconds per call")
+    parser.add_argument("--warm-caches", action="store_true", help="Let jobs reuse cached extraction / search / verdicts")
+    parser.add_argument("--with-memory", action="store_true",
+                        help="Seed the local vector store and include memo retrieval (needs the embedding model)")
+    parser.add_argument("--json", help="Write the full results to this file")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_level(args.child, args.jobs, args.with_memory)
+        with open(args.result_file, "w") as f:
+            json.dump(result, f)
+        return
+
+    from benchmarks.stubs import StubServer
+
+    stubs = StubServer(0, args.llm_latency, args.llm_latency_per_1k, args.search_latency).start()
+    os.makedirs(LOG_DIR, exist_ok=True)
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    print(f"[Bench] Stubs at {stubs.url}; {args.jobs} jobs per level; levels {levels}; "
+          f"{'warm' if args.warm_caches else 'cold'} caches")
+
+    results = []
+    for level in levels:
+        with tempfile.TemporaryDirectory(prefix="sago-bench-") as workdir:
+            result_file = os.path.join(workdir, "result.json")
+            log_path = os.path.join(LOG_DIR, f"pipeline_c{level}.log")
+            command = [sys.executable, "-m", "benchmarks.pipeline", "--child", str(level),
+                       "--jobs", str(args.jobs), "--result-file", result_file]
+            if args.with_memory:
+                command.append("--with-memory")
+            with open(log_path, "w") as log:
+                code = subprocess.call(command, cwd=ENGINE_DIR, env=child_env(args, stubs.url, workdir),
+                                       stdout=log, stderr=subprocess.STDOUT)
+            if code != 0 or not os.path.exists(result_file):
+                print(f"[Bench] concurrency={level} failed (exit {code}), see {log_path}")
+                continue
+            with open(result_file) as f:
+                results.append(json.load(f))
+
+    print(f"\n{'conc':>5}{'jobs':>6}{'wall s':>9}{'jobs/min':>10}{'p50 s':>8}{'p95 s':>8}"
+          f"{'RSS MB':>8}{'OCR MB':>8}{'LLM calls':>11}{'tokens':>9}")
+    for r in results:
+        print(f"{r['concurrency']:>5}{r['jobs']:>6}{r['wall_seconds']:>9.1f}{r['jobs_per_minute']:>10.1f}"
+              f"{r['p50_seconds']:>8.1f}{r['p95_seconds']:>8.1f}{r['peak_rss_mb']:>8.0f}"
+              f"{r['peak_child_rss_mb']:>8.0f}{r['llm_calls']:>11}{r['llm_tokens']:>9}")
+    for r in results:
+        stages = ", ".join(f"{k}={v:.2f}s" for k, v in r["mean_stage_seconds"].items())
+        print(f"[Bench] concurrency={r['concurrency']} mean per job: {stages}")
+    print(f"[Bench] Stub calls: {stubs.calls}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump({"settings": vars(args), "levels": results}, f, indent=2)
+        print(f"[Bench] Results written to {args.json}")
+    stubs.shutdown()
+
+
+if __name__ == "__main__":
+    main()
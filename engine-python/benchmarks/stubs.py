@@ -0,0 +1,187 @@
+"""
+Benchmark Stubs
+Deterministic local stand-ins for the paid APIs, served from one HTTP server:
+- POST /v1/chat/completions: OpenAI-compatible mock LLM. Used by the CrewAI
+  agents (via OPENAI_API_BASE) and by ClaimVerifierTool.
+- POST /search: Serper-compatible stub (point SERPER_BASE_URL at the server).
+
+Latency is modelled as a fixed per-call delay plus a per-1000-token delay, so
+prompt size changes show up in benchmark timings the way they would live.
+
+Run standalone (from engine-python/):
+    python -m benchmarks.stubs --port 8089
+"""
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+STATUSES = ("CONFIRMED", "CONTRADICTED", "UNVERIFIED")
+
+
+def _stable_index(text: str, modulo: int) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest(), 16) % modulo
+
+
+def _count_tokens(text: str) -> int:
+    # Close enough to BPE counts for English prose; only used for modelled latency
+    return max(1, len(text) // 4)
+
+
+def _scribe_answer(prompt: str) -> str:
+    """Echo the deck lines that carry figures back as claims."""
+    deck = prompt.split("PITCH DECK TEXT:", 1)[-1]
+    claims = []
+    for line in deck.splitlines():
+        line = re.sub(r"\s+", " ", line).strip(" -*•")
+        if len(line) >= 15 and re.search(r"\d", line) and line not in claims:
+            claims.append(line)
+    return "\n".join(f"- {claim}" for claim in claims[:15]) or "- No specific claims found in this section."
+
+
+def _verifier_answer(prompt: str) -> str:
+    match = re.search(r'Claim: "(.*?)"', prompt, re.DOTALL)
+    claim = match.group(1) if match else prompt[:80]
+    status = STATUSES[_stable_index(claim, len(STATUSES))]
+    slug = hashlib.sha256(claim.encode("utf-8")).hexdigest()[:10]
+    return (
+        f"- Status: {status}\n"
+        f"- Evidence: Benchmark stub sources {status.lower()} the claim.\n"
+        # Cites the first result mock_search returned for the same claim
+        f"- Source: https://stub.local/articles/{slug}-1"
+    )
+
+
+def _analyst_answer(prompt: str) -> str:
+    urls = sorted(set(re.findall(r"https://stub\.local/\S+", prompt)))
+    references = "\n".join(f"- {url}" for url in urls) or "- None"
+    return (
+        "## Red Flags\n- Benchmark stub report.\n\n"
+        "## Missing Information\n- Unit economics.\n\n"
+        "## Questions for Founders\n- How is revenue recognised?\n\n"
+        f"## References\n{references}"
+    )
+
+
+def mock_completion(messages: List[Dict]) -> str:
+    """Pick a deterministic answer from the prompt's shape."""
+    prompt = "\n".join(str(m.get("content") or "") for m in messages)
+    if "strict fact checker" in prompt:
+        return _verifier_answer(prompt)
+    if "PITCH DECK TEXT:" in prompt:
+        answer = _scribe_answer(prompt)
+    else:
+        answer = _analyst_answer(prompt)
+    # CrewAI agents without tools parse a ReAct-style final answer
+    return f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+
+
+def mock_search(query: str, num: int) -> List[Dict]:
+    slug = hashlib.sha256(query.encode("utf-8")).hexdigest()[:10]
+    return [
+        {
+            "title": f"Stub result {i + 1} for {query[:60]}",
+            "link": f"https://stub.local/articles/{slug}-{i + 1}",
+            "snippet": f"Independent coverage of: {query[:120]}",
+        }
+        for i in range(num)
+    ]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, payload: Dict, status: int = 200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        path = self.path.split("?")[0]
+        request = self._read_json()
+
+        if path.endswith("/chat/completions"):
+            content = mock_completion(request.get("messages", []))
+            prompt_tokens = _count_tokens(json.dumps(request.get("messages", [])))
+            completion_tokens = _count_tokens(content)
+            time.sleep(server.llm_latency + server.llm_latency_per_1k * (prompt_tokens + completion_tokens) / 1000)
+            server.count("llm")
+            self._send_json({
+                "id": f"chatcmpl-stub-{_stable_index(content, 10 ** 8)}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+        elif path == "/search":
+            time.sleep(server.search_latency)
+            server.count("search")
+            self._send_json({"organic": mock_search(request.get("q", ""), int(request.get("num", 5)))})
+        else:
+            self._send_json({"error": f"unknown endpoint {path}"}, status=404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, llm_latency: float = 0.5, llm_latency_per_1k: float = 0.2,
+                 search_latency: float = 0.2):
+        super().__init__(("127.0.0.1", port), StubHandler)
+        self.llm_latency = llm_latency
+        self.llm_latency_per_1k = llm_latency_per_1k
+        self.search_latency = search_latency
+        self.calls = {"llm": 0, "search": 0}
+        self._lock = threading.Lock()
+
+    def count(self, kind: str):
+        with self._lock:
+            self.calls[kind] += 1
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "StubServer":
+        threading.Thread(target=self.serve_forever, name="stubs", daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the mock LLM and search stubs")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-latency-per-1k", type=float, default=0.2)
+    parser.add_argument("--search-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    server = StubServer(args.port, args.llm_latency, args.llm_latency_per_1k, args.search_latency)
+    print(f"[Stubs] OPENAI_API_BASE={server.url}/v1 SERPER_BASE_URL={server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# Cache module
+from .store import CacheStore, CACHE_DIR
+from .results import (
+    ResultCache, bytes_digest, file_digest, text_digest, profile_digest, memo_version, bump_memo_version
+)
+from .facts import FactCache, get_fact_cache, normalize_claim
@@ -0,0 +1,167 @@
+"""
+Claim Fact Cache
+Global store of verified claims shared across decks. A new claim that matches a
+recently verified one - exactly after normalization, or by embedding similarity -
+reuses that verdict without any search or LLM call. Similar claims only count
+as the same fact when their figures (amounts, percentages, years) are equal.
+"""
+import os
+import re
+import time
+import threading
+from typing import Callable, Dict, List, Optional
+
+from pipeline.records import parse_figures
+from .store import CacheStore, CACHE_DIR
+
+# false turns the fact cache off (every claim is searched and judged); with
+# similarity off only exact matches are reused and no embedding model is loaded
+FACT_CACHE_ENABLED = os.getenv("FACT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+FACT_SIMILARITY_ENABLED = os.getenv("FACT_SIMILARITY_ENABLED", "true").lower() in ("1", "true", "yes")
+# Verdicts older than this are re-verified (market figures move)
+FACT_FRESHNESS = float(os.getenv("FACT_FRESHNESS", str(30 * 24 * 3600)))
+# Cosine similarity above which two claims are treated as the same fact
+FACT_SIMILARITY_THRESHOLD = float(os.getenv("FACT_SIMILARITY_THRESHOLD", "0.92"))
+FACT_CACHE_MAX_ENTRIES = int(os.getenv("FACT_CACHE_MAX_ENTRIES", "50000"))
+FACT_VECTOR_DIR = os.getenv("FACT_VECTOR_DIR", os.path.join(CACHE_DIR, "claim_vectors"))
+# Near matches considered per lookup (the best one whose figures agree is reused)
+FACT_SIMILAR_CANDIDATES = 3
+# Embeddings of verdicts evicted from the exact store are pruned every this many stores
+FACT_VECTOR_PRUNE_EVERY = int(os.getenv("FACT_VECTOR_PRUNE_EVERY", "500"))
+
+
+def normalize_claim(claim: str) -> str:
+    """Case-, whitespace- and punctuation-insensitive form of a claim."""
+    claim = re.sub(r"[^\w$%.,]+", " ", claim.lower())
+    return re.sub(r"\s+", " ", claim).strip(" .,")
+
+
+class FactCache:
+    def __init__(
+        self,
+        embed: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        vector_dir: str = FACT_VECTOR_DIR,
+        path: Optional[str] = None,
+        enabled: bool = True,
+    ):
+        """
+        embed: batch embedding function for similarity matching; when None only
+        exact (normalized) matches are reused.
+        enabled: when False nothing is looked up or stored.
+        """
+        self.enabled = enabled
+        self.exact = CacheStore(
+            "claim_facts", ttl=FACT_FRESHNESS, max_entries=FACT_CACHE_MAX_ENTRIES, path=path
+        )
+        self.embed = embed
+        self.vector_dir = vector_dir
+        self._vectors = None
+        self._lock = threading.Lock()
+        self._stores_since_prune = 0
+        self.similar_hits = 0
+
+    def _vector_store(self):
+        if self._vectors is None:
+            from personalization.vector_store import LocalVectorStore
+            self._vectors = LocalVectorStore(self.vector_dir)
+        return self._vectors
+
+    def lookup(self, claim: str) -> Optional[Dict]:
+        """A fresh verdict for this claim or a near-identical one, else None."""
+        if not self.enabled:
+            return None
+        record = self.exact.get(normalize_claim(claim))
+        if record is not None or self.embed is None:
+            return record
+
+        try:
+            vector = self.embed([claim])[0]
+            with self._lock:
+                matches = self._vector_store().query(vector, top_k=FACT_SIMILAR_CANDIDATES)
+        except Exception as e:
+            print(f"[FactCache] Similarity lookup skipped: {e}")
+            return None
+
+        # "TAM is $10B" and "TAM is $100B" embed almost identically; only a claim
+        # stating the same figures may share a verdict
+        figures = parse_figures(claim)
+        for match in matches:
+            record = match["metadata"]
+            if match["score"] < FACT_SIMILARITY_THRESHOLD:
+                break
+            if time.time() - record.get("verified_at", 0) > FACT_FRESHNESS:
+                continue
+            if parse_figures(record.get("claim", "")) != figures:
+                continue
+            self.similar_hits += 1
+            return {**record, "similarity": match["score"]}
+        return None
+
+    def store(self, claim: str, status: str, result: str, sources: List[str]):
+        """Record a verdict for later reuse."""
+        if not self.enabled:
+            return
+        key = normalize_claim(claim)
+        record = {
+            "claim": claim,
+            "status": status,
+            "result": result,
+            "sources": sources,
+            "verified_at": time.time(),
+        }
+        self.exact.set(key, record)
+
+        if self.embed is None:
+            return
+        try:
+            vector = self.embed([claim])[0]
+            with self._lock:
+                self._vector_store().upsert([{"id": key, "values": vector, "metadata": record}])
+                self._stores_since_prune += 1
+                if self._stores_since_prune >= FACT_VECTOR_PRUNE_EVERY:
+                    self._stores_since_prune = 0
+                    self._prune_vectors()
+        except Exception as e:
+            print(f"[FactCache] Could not index claim embedding: {e}")
+
+    def _prune_vectors(self) -> int:
+        """Drop embeddings whose verdict has expired or been evicted from the exact store."""
+        live = set(self.exact.keys())
+        vectors = self._vector_store()
+        stale = [vid for vid in vectors.ids() if vid not in live]
+        vectors.delete(stale)
+        if stale:
+            print(f"[FactCache] Pruned {len(stale)} stale claim embeddings")
+        return len(stale)
+
+    def prune(self) -> int:
+        """Prune the similarity index now. Returns the number of embeddings removed."""
+        if self.embed is None:
+            return 0
+        with self._lock:
+            return self._prune_vectors()
+
+    def stats(self) -> Dict:
+        return {**self.exact.stats(), "similar_hits": self.similar_hits}
+
+
+_fact_cache: Optional[FactCache] = None
+_fact_cache_lock = threading.Lock()
+
+
+def get_fact_cache() -> FactCache:
+    """
+    Process-wide fact cache, with similarity matching if it is enabled and the
+    embedding model is available (FACT_CACHE_ENABLED / FACT_SIMILARITY_ENABLED).
+    """
+    global _fact_cache
+    with _fact_cache_lock:
+        if _fact_cache is None:
+            embed_texts = None
+            if FACT_CACHE_ENABLED and FACT_SIMILARITY_ENABLED:
+                try:
+                    from personalization.investor_memory import embed_texts
+                except Exception as e:
+                    print(f"[FactCache] Embeddings unavailable ({e}); exact matches only")
+            _fact_cache = FactCache(embed=embed_texts, enabled=FACT_CACHE_ENABLED)
+        return _fact_cache
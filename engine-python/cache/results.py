@@ -0,0 +1,103 @@
+"""
+Analysis Result Cache
+Content-addressed cache of pipeline outputs for byte-identical decks.
+
+- Stage entries (Scribe claims + Researcher verification) are keyed on
+  (deck hash, pipeline version) and shared across investors.
+- Report entries (Analyst output) are additionally keyed on the investor, its
+  profile digest and its memo version (bumped whenever the investor's memos change).
+"""
+import hashlib
+import json
+import os
+import threading
+import uuid
+from typing import Dict, Optional
+
+from .store import CacheStore
+
+# Entries older than this are recomputed so verification evidence does not go stale
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", str(7 * 24 * 3600)))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "2000"))
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's bytes, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def bytes_digest(data: bytes) -> str:
+    """SHA-256 of raw bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_digest(text: str) -> str:
+    """SHA-256 of a text string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def profile_digest(profile: Optional[Dict]) -> str:
+    """Stable digest of an investor profile dict ("none" when there is no investor)."""
+    if not profile:
+        return "none"
+    return text_digest(json.dumps(profile, sort_keys=True, default=str))
+
+
+_memo_versions: Optional[CacheStore] = None
+_memo_versions_lock = threading.Lock()
+
+
+def _memo_version_store() -> CacheStore:
+    global _memo_versions
+    with _memo_versions_lock:
+        if _memo_versions is None:
+            _memo_versions = CacheStore("memo_versions")
+        return _memo_versions
+
+
+def memo_version(investor_id: str) -> str:
+    """Current version of an investor's stored memos ("0" before any were stored)."""
+    return _memo_version_store().get(investor_id) or "0"
+
+
+def bump_memo_version(investor_id: str):
+    """Mark an investor's memos as changed, so reports built on the old ones are not reused."""
+    _memo_version_store().set(investor_id, uuid.uuid4().hex[:16])
+
+
+class ResultCache:
+    def __init__(self, pipeline_version: str, path: Optional[str] = None):
+        self.pipeline_version = pipeline_version
+        self.stages = CacheStore(
+            "analysis_stages", ttl=RESULT_CACHE_TTL, max_entries=RESULT_CACHE_MAX_ENTRIES, path=path
+        )
+        self.reports = CacheStore(
+            "analysis_reports", ttl=RESULT_CACHE_TTL, max_entries=RESULT_CACHE_MAX_ENTRIES, path=path
+        )
+
+    def _stage_key(self, deck_hash: str) -> str:
+        return f"{self.pipeline_version}:{deck_hash}"
+
+    def _report_key(self, deck_hash: str, investor_digest: str) -> str:
+        return f"{self.pipeline_version}:{deck_hash}:{investor_digest}"
+
+    def get_stages(self, deck_hash: str) -> Optional[Dict]:
+        """Cached {"claims", "verification"} for a deck, shared by all investors."""
+        return self.stages.get(self._stage_key(deck_hash))
+
+    def set_stages(self, deck_hash: str, claims: str, verification: str):
+        self.stages.set(self._stage_key(deck_hash), {"claims": claims, "verification": verification})
+
+    def get_report(self, deck_hash: str, investor_digest: str) -> Optional[str]:
+        """Cached Analyst report for a deck and investor profile."""
+        return self.reports.get(self._report_key(deck_hash, investor_digest))
+
+    def set_report(self, deck_hash: str, investor_digest: str, report: str):
+        self.reports.set(self._report_key(deck_hash, investor_digest), report)
+
+    def stats(self) -> Dict:
+        return {"stages": self.stages.stats(), "reports": self.reports.stats()}
@@ -0,0 +1,204 @@
+"""
+Cache Store
+Small SQLite-backed key/value store with TTL expiry, LRU eviction and hit/miss counters.
+One database file is shared by every namespace and every worker process on the host.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Directory for on-disk caches (shared by all workers on the host)
+CACHE_DIR = os.getenv("CACHE_DIR", "outputs/cache")
+
+
+class CacheStore:
+    def __init__(
+        self,
+        namespace: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        path: Optional[str] = None,
+    ):
+        """
+        namespace: logical cache name; entries from different namespaces never collide
+        ttl: seconds an entry stays valid (None = forever)
+        max_entries: least recently used entries beyond this are evicted (None = unbounded)
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path or os.path.join(CACHE_DIR, "sago_cache.db")
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+
+        # key -> Event for computations in flight in this process (single-flight)
+        self._inflight: Dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache_entries(namespace, accessed_at)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                if row is not None:
+                    self._conn.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key),
+                    )
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value and evict expired / least recently used entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), now, now),
+            )
+            if self.ttl is not None:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+                    (self.namespace, now - self.ttl),
+                )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    """
+                    DELETE FROM cache_entries WHERE namespace = ? AND key NOT IN (
+                        SELECT key FROM cache_entries WHERE namespace = ?
+                        ORDER BY accessed_at DESC LIMIT ?
+                    )
+                    """,
+                    (self.namespace, self.namespace, self.max_entries),
+                )
+            self._conn.commit()
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        should_cache: Callable[[Any], bool] = lambda value: value is not None,
+    ) -> Any:
+        """
+        Return the cached value for `key`, computing and storing it on a miss.
+        Concurrent callers asking for the same key while it is being computed
+        wait for that computation instead of starting their own.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._inflight_lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = threading.Event()
+                self._inflight[key] = event
+
+        if not leader:
+            # Another thread is computing this key; wait and re-read its result
+            event.wait()
+            with self._lock:
+                self.coalesced += 1
+                self.misses -= 1  # counted again by the re-read below
+            value = self.get(key)
+            if value is not None:
+                return value
+            # Leader's result was not cacheable (e.g. an error) - compute ourselves
+            return compute()
+
+        try:
+            value = compute()
+            if should_cache(value):
+                self.set(key, value)
+            return value
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def delete(self, key: str):
+        """Drop a single entry."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Drop every entry in this namespace."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+    def keys(self) -> List[str]:
+        """Keys of the unexpired entries in this namespace."""
+        oldest = time.time() - self.ttl if self.ttl is not None else 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM cache_entries WHERE namespace = ? AND created_at >= ?",
+                (self.namespace, oldest),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current entry count."""
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": self.size(),
+        }
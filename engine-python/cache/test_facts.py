@@ -0,0 +1,39 @@
+"""Tests for the claim fact cache switches."""
+import sys
+
+import pytest
+
+from cache import facts, store
+from cache.facts import FactCache
+
+
+def make_cache(tmp_path, **kwargs):
+    return FactCache(vector_dir=str(tmp_path / "vectors"), path=str(tmp_path / "cache.db"), **kwargs)
+
+
+def test_exact_match_is_reused(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store("ARR of $2.4M.", "CONFIRMED", "- Status: CONFIRMED", ["https://example.com"])
+    assert cache.lookup("arr of  $2.4M")["status"] == "CONFIRMED"
+    assert cache.lookup("ARR of $2.5M") is None
+
+
+def test_disabled_cache_stores_and_returns_nothing(tmp_path):
+    cache = make_cache(tmp_path, enabled=False)
+    cache.store("ARR of $2.4M", "CONFIRMED", "- Status: CONFIRMED", [])
+    assert cache.lookup("ARR of $2.4M") is None
+    assert cache.exact.get(facts.normalize_claim("ARR of $2.4M")) is None
+
+
+@pytest.mark.parametrize("enabled, similarity", [(False, True), (True, False)])
+def test_switches_keep_the_embedding_model_unloaded(tmp_path, monkeypatch, enabled, similarity):
+    monkeypatch.setattr(store, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(facts, "FACT_CACHE_ENABLED", enabled)
+    monkeypatch.setattr(facts, "FACT_SIMILARITY_ENABLED", similarity)
+    monkeypatch.setattr(facts, "_fact_cache", None)
+    monkeypatch.delitem(sys.modules, "personalization.investor_memory", raising=False)
+
+    cache = facts.get_fact_cache()
+    assert cache.embed is None
+    assert cache.enabled is enabled
+    assert "personalization.investor_memory" not in sys.modules
@@ -6,6 +6,13 @@ from .models import (
     get_investor_by_id,
     update_job_status,
     update_job_started,
+    update_job_checkpoint,
+    get_job_checkpoint,
     update_job_completed,
-    update_job_failed
+    update_job_retrying,
+    update_job_failed,
+    replace_claim_records,
+    insert_job_metrics,
+    Claim,
+    ClaimVerification
 )
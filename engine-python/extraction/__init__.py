@@ -0,0 +1,3 @@
+# Extraction module
+from .pdf import extract_pdf_pages, start_ocr_pool
+from .document import extract_document, document_text
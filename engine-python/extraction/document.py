@@ -0,0 +1,103 @@
+"""
+Document Extraction
+Single entry point for turning a pitch deck (PDF or plain text, as a path or
+raw bytes) into per-page text. Results are cached on disk by file hash so a
+re-analysis never re-parses or re-OCRs the same deck.
+"""
+import os
+import tempfile
+import time
+from typing import Dict, Union
+
+from cache import CacheStore, bytes_digest, file_digest
+from metrics import record_event
+from .pdf import extract_pdf_pages
+
+# Bump when extraction logic changes so cached page text is recomputed
+EXTRACTOR_VERSION = "1"
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "5000"))
+
+_extraction_cache = None
+
+
+def get_extraction_cache() -> CacheStore:
+    """Process-wide extraction cache (created on first use)."""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = CacheStore("extraction", max_entries=EXTRACTION_CACHE_MAX_ENTRIES)
+    return _extraction_cache
+
+
+def document_text(result: Dict) -> str:
+    """Join the non-empty pages of an extraction result."""
+    return "\n\n".join(p["text"] for p in result["pages"] if p["text"].strip())
+
+
+def _summarize_method(pages) -> str:
+    methods = {p["method"] for p in pages if p["method"] != "none"}
+    if not methods:
+        return "none"
+    return methods.pop() if len(methods) == 1 else "mixed"
+
+
+def _extract_path(path: str, head: bytes) -> list:
+    if head.startswith(b"%PDF"):
+        return extract_pdf_pages(path)
+
+    # Anything that is not a PDF is read as plain text (one page)
+    started = time.perf_counter()
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    return [{"page": 1, "text": text, "method": "plain", "seconds": time.perf_counter() - started}]
+
+
+def extract_document(source: Union[str, bytes], use_cache: bool = True) -> Dict:
+    """
+    Extract a deck from a file path or raw bytes.
+
+    Returns:
+        {
+            "file_hash": sha256 of the file bytes,
+            "pages": [{"page", "text", "method", "seconds"}, ...],
+            "method": "text" | "ocr" | "mixed" | "plain" | "none",
+            "seconds": wall time of the original extraction,
+            "cached": True if served from the extraction cache,
+        }
+    """
+    is_bytes = isinstance(source, (bytes, bytearray))
+    file_hash = bytes_digest(source) if is_bytes else file_digest(source)
+    cache_key = f"{EXTRACTOR_VERSION}:{file_hash}"
+
+    if use_cache:
+        cached = get_extraction_cache().get(cache_key)
+        if cached is not None:
+            cached["cached"] = True
+            record_event("cache_hit:extraction")
+            return cached
+
+    started = time.perf_counter()
+    if is_bytes:
+        # pdf2image/OCR workers need a path; spill bytes to a temp file
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(source)
+            pages = _extract_path(path, bytes(source[:5]))
+        finally:
+            os.remove(path)
+    else:
+        with open(source, "rb") as f:
+            head = f.read(5)
+        pages = _extract_path(source, head)
+
+    result = {
+        "file_hash": file_hash,
+        "pages": pages,
+        "method": _summarize_method(pages),
+        "seconds": time.perf_counter() - started,
+        "cached": False,
+    }
+    # Don't pin a transient OCR failure in the cache
+    if use_cache and not any("error" in p for p in pages):
+        get_extraction_cache().set(cache_key, result)
+    return result
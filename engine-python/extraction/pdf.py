@@ -0,0 +1,111 @@
+"""
+PDF Text Extraction
+Extracts text page by page with pypdf and OCRs only the pages that have no
+text layer. OCR runs on a process pool shared by all jobs in the worker, and
+each task renders just its own page, so a deck is never held in memory as a
+full set of images.
+
+The pool's processes come from a forkserver, never from forking the threaded
+worker itself (a fork copies locks held by other threads and can deadlock the
+child). Call start_ocr_pool() at startup, before other threads exist.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from metrics import stage
+
+# Pages with less text than this are treated as image-only and OCRed
+OCR_MIN_PAGE_CHARS = int(os.getenv("OCR_MIN_PAGE_CHARS", "20"))
+OCR_DPI = int(os.getenv("OCR_DPI", "150"))
+# Upper bound on OCR processes for the whole worker (shared across job slots)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 2)))
+
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+
+def start_ocr_pool() -> ProcessPoolExecutor:
+    """Create the shared OCR pool (idempotent). Later calls return the same pool."""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            context = multiprocessing.get_context("forkserver")
+            # OCR processes fork from a server that already has this module imported
+            context.set_forkserver_preload([__name__])
+            _ocr_pool = ProcessPoolExecutor(max_workers=max(1, OCR_WORKERS), mp_context=context)
+        return _ocr_pool
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    return start_ocr_pool()
+
+
+def ocr_page(pdf_path: str, page_number: int, dpi: int = OCR_DPI) -> Tuple[str, float]:
+    """Render a single page (1-based) and OCR it. Runs inside an OCR pool process."""
+    from pdf2image import convert_from_path
+    import pytesseract
+
+    started = time.perf_counter()
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number)
+    if not images:
+        return "", time.perf_counter() - started
+    try:
+        return pytesseract.image_to_string(images[0]), time.perf_counter() - started
+    finally:
+        images[0].close()
+
+
+def extract_pdf_pages(pdf_path: str) -> List[Dict]:
+    """
+    Extract every page in order as {"page", "text", "method", "seconds"}.
+    method is "text" (pypdf text layer), "ocr", or "none" when a page has no
+    text layer and OCR finds nothing. Pages whose OCR raised also carry "error".
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    pages = []
+    for i, page in enumerate(reader.pages, 1):
+        started = time.perf_counter()
+        text = page.extract_text() or ""
+        pages.append({
+            "page": i,
+            "text": text,
+            "method": "text" if len(text.strip()) >= OCR_MIN_PAGE_CHARS else "none",
+            "seconds": time.perf_counter() - started,
+        })
+
+    empty = [p for p in pages if p["method"] == "none"]
+    if not empty:
+        return pages
+
+    print(f"[Extraction] OCR on {len(empty)} of {len(pages)} pages without text")
+    with stage("ocr"):
+        _ocr_pages(pdf_path, empty)
+    return pages
+
+
+def _ocr_pages(pdf_path: str, empty: List[Dict]):
+    """OCR the given pages on the shared pool, updating them in place."""
+    try:
+        pool = _get_ocr_pool()
+        futures = [(p, pool.submit(ocr_page, pdf_path, p["page"])) for p in empty]
+        for p, future in futures:
+            try:
+                text, seconds = future.result()
+                p["seconds"] += seconds
+                if len(text.strip()) > len(p["text"].strip()):
+                    p["text"] = text
+                    p["method"] = "ocr"
+                print(f"[Extraction] OCR page {p['page']}: {len(text)} chars")
+            except Exception as e:
+                p["error"] = str(e)
+                print(f"[Extraction] OCR page {p['page']} failed: {e}")
+    except Exception as e:
+        for p in empty:
+            p["error"] = str(e)
+        print(f"[Extraction] OCR failed: {e}")
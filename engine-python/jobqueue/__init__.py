@@ -0,0 +1,2 @@
+# Job queue module
+from .reliable import JobQueue
@@ -0,0 +1,226 @@
+"""
+Reliable Job Queue
+Wraps the sago:jobs Redis list with an in-progress list per worker, heartbeats,
+crash recovery and delayed retries.
+
+Keys used (for a queue named sago:jobs):
+- sago:jobs                         pending jobs (Go backend RPUSHes here)
+- sago:jobs:processing:<worker_id>  jobs a worker has taken but not yet acked
+- sago:jobs:heartbeat:<worker_id>   expires when a worker stops heartbeating
+- sago:jobs:workers                 set of worker ids that own a processing list
+- sago:jobs:delayed                 sorted set of retries, scored by due time
+- sago:jobs:progress:<job_id>       pub/sub channel of a job's progress events
+- sago:jobs:dedup:<fingerprint>     job id running / last completed for a deck + investor
+- sago:jobs:dedup:<fingerprint>:waiting  duplicate job ids waiting for that job's result
+"""
+import json
+import os
+import random
+import socket
+import time
+from typing import Optional, Tuple
+
+import redis
+
+
+class JobQueue:
+    def __init__(
+        self,
+        redis_client,
+        queue: str,
+        worker_id: Optional[str] = None,
+        reliable: bool = True,
+        visibility_timeout: int = 60,
+        retry_base_delay: float = 30.0,
+        retry_max_delay: float = 900.0,
+    ):
+        self.redis = redis_client
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.reliable = reliable
+        self.visibility_timeout = visibility_timeout
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+
+        self.processing_key = f"{queue}:processing:{self.worker_id}"
+        self.heartbeat_key = f"{queue}:heartbeat:{self.worker_id}"
+        self.workers_key = f"{queue}:workers"
+        self.delayed_key = f"{queue}:delayed"
+
+    def fetch(self, timeout: int) -> Optional[Tuple[bytes, dict]]:
+        """
+        Block up to `timeout` seconds for the next job.
+        Returns (raw_payload, job) or None. In reliable mode the raw payload stays in
+        this worker's processing list until ack() or retry() is called with it.
+        """
+        if self.reliable:
+            raw = self.redis.blmove(self.queue, self.processing_key, timeout, "LEFT", "RIGHT")
+        else:
+            result = self.redis.blpop(self.queue, timeout=timeout)
+            raw = result[1] if result else None
+
+        if raw is None:
+            return None
+
+        try:
+            return raw, json.loads(raw)
+        except json.JSONDecodeError:
+            # Never leave an unparseable payload in the processing list
+            self.ack(raw)
+            raise
+
+    def ack(self, raw: bytes):
+        """Remove a finished job from this worker's processing list."""
+        if self.reliable:
+            self.redis.lrem(self.processing_key, 1, raw)
+
+    def retry(self, raw: bytes, job: dict, attempt: int) -> float:
+        """
+        Schedule a failed job to run again after an exponential backoff with jitter.
+        Returns the delay in seconds.
+        """
+        delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** max(attempt - 1, 0)))
+        delay = delay * random.uniform(0.8, 1.2)
+
+        payload = json.dumps({**job, "attempt": attempt + 1})
+        pipe = self.redis.pipeline()
+        pipe.zadd(self.delayed_key, {payload: time.time() + delay})
+        if self.reliable:
+            pipe.lrem(self.processing_key, 1, raw)
+        pipe.execute()
+        return delay
+
+    def progress_channel(self, job_id: str) -> str:
+        return f"{self.queue}:progress:{job_id}"
+
+    def publish_progress(self, job_id: str, status: str, **fields) -> int:
+        """
+        Publish a progress event ({"job_id", "status", "at", **fields}) on the job's
+        channel. Returns the number of subscribers that received it.
+        """
+        event = {"job_id": job_id, "status": status, "at": time.time(), **fields}
+        return self.redis.publish(self.progress_channel(job_id), json.dumps(event))
+
+    def defer(self, raw: bytes, job: dict, delay: float):
+        """Put a job back on the delayed set unchanged (not counted as an attempt)."""
+        pipe = self.redis.pipeline()
+        pipe.zadd(self.delayed_key, {json.dumps(job): time.time() + delay})
+        if self.reliable:
+            pipe.lrem(self.processing_key, 1, raw)
+        pipe.execute()
+
+    def dedup_key(self, fingerprint: str) -> str:
+        return f"{self.queue}:dedup:{fingerprint}"
+
+    def claim_leader(self, fingerprint: str, job_id: str, window: int) -> str:
+        """
+        Claim the deck + investor fingerprint for job_id for `window` seconds.
+        Returns the job that holds the claim: job_id itself, or the duplicate
+        that claimed it first.
+        """
+        key = self.dedup_key(fingerprint)
+        while True:
+            if self.redis.set(key, job_id, nx=True, ex=window):
+                return job_id
+            leader = self.redis.get(key)
+            if leader is not None:
+                return leader.decode() if isinstance(leader, bytes) else leader
+
+    def release_leader(self, fingerprint: str, job_id: str) -> bool:
+        """Drop the claim if job_id still holds it."""
+        key = self.dedup_key(fingerprint)
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                leader = pipe.get(key)
+                if (leader.decode() if isinstance(leader, bytes) else leader) != job_id:
+                    return False
+                pipe.multi()
+                pipe.delete(key)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
+
+    def add_waiting(self, fingerprint: str, job_id: str, window: int):
+        """Register a duplicate job to receive the leader's result."""
+        key = f"{self.dedup_key(fingerprint)}:waiting"
+        pipe = self.redis.pipeline()
+        pipe.sadd(key, job_id)
+        pipe.expire(key, window)
+        pipe.execute()
+
+    def pop_waiting(self, fingerprint: str) -> list:
+        """Take every duplicate job id waiting on the fingerprint."""
+        key = f"{self.dedup_key(fingerprint)}:waiting"
+        pipe = self.redis.pipeline()
+        pipe.smembers(key)
+        pipe.delete(key)
+        members, _ = pipe.execute()
+        return sorted(m.decode() if isinstance(m, bytes) else m for m in members)
+
+    def heartbeat(self):
+        """Mark this worker alive for another visibility timeout."""
+        pipe = self.redis.pipeline()
+        pipe.set(self.heartbeat_key, int(time.time()), ex=self.visibility_timeout)
+        pipe.sadd(self.workers_key, self.worker_id)
+        pipe.execute()
+
+    def promote_due(self) -> int:
+        """Move retries whose backoff has elapsed back onto the pending queue."""
+        moved = 0
+        for payload in self.redis.zrangebyscore(self.delayed_key, "-inf", time.time()):
+            # Only the worker whose ZREM succeeds requeues the job
+            if self.redis.zrem(self.delayed_key, payload):
+                self.redis.rpush(self.queue, payload)
+                moved += 1
+        return moved
+
+    def _requeue_all(self, processing_key: str) -> int:
+        """Move every job in a processing list back to the head of the queue."""
+        count = 0
+        while self.redis.lmove(processing_key, self.queue, "RIGHT", "LEFT") is not None:
+            count += 1
+        return count
+
+    def recover(self) -> int:
+        """
+        Requeue jobs left in this worker's own processing list by an earlier run
+        under the same worker id (e.g. a container restarted after a crash, which
+        keeps its hostname and pid). Call once at startup, before fetching.
+        """
+        if not self.reliable:
+            return 0
+        count = self._requeue_all(self.processing_key)
+        if count:
+            print(f"[Queue] Requeued {count} job(s) left by a previous run of worker {self.worker_id}")
+        return count
+
+    def reap(self) -> int:
+        """
+        Requeue jobs held by workers whose heartbeat has expired.
+        Recovered jobs go to the head of the queue so they are picked up first.
+        """
+        requeued = 0
+        for member in self.redis.smembers(self.workers_key):
+            worker_id = member.decode() if isinstance(member, bytes) else member
+            if worker_id == self.worker_id:
+                continue
+            if self.redis.exists(f"{self.queue}:heartbeat:{worker_id}"):
+                continue
+
+            count = self._requeue_all(f"{self.queue}:processing:{worker_id}")
+            self.redis.srem(self.workers_key, worker_id)
+            if count:
+                print(f"[Queue] Requeued {count} job(s) from dead worker {worker_id}")
+            requeued += count
+        return requeued
+
+    def close(self):
+        """Deregister on clean shutdown; anything still in-progress is handed back."""
+        if self.reliable:
+            self._requeue_all(self.processing_key)
+        pipe = self.redis.pipeline()
+        pipe.delete(self.heartbeat_key)
+        pipe.srem(self.workers_key, self.worker_id)
+        pipe.execute()
@@ -0,0 +1,214 @@
+"""Tests for JobQueue against an in-memory Redis (fakeredis)."""
+import json
+import threading
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from jobqueue.reliable import JobQueue
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def make_queue(server, worker_id="w1", **kwargs):
+    client = fakeredis.FakeRedis(server=server)
+    return JobQueue(client, "sago:jobs", worker_id=worker_id, visibility_timeout=10, **kwargs)
+
+
+def push(queue, job):
+    queue.redis.rpush(queue.queue, json.dumps(job))
+
+
+def test_fetch_moves_job_to_processing_until_acked(server):
+    queue = make_queue(server)
+    push(queue, {"job_id": "j1"})
+
+    raw, job = queue.fetch(timeout=1)
+    assert job == {"job_id": "j1"}
+    assert queue.redis.llen("sago:jobs") == 0
+    assert queue.redis.lrange(queue.processing_key, 0, -1) == [raw]
+
+    queue.ack(raw)
+    assert queue.redis.llen(queue.processing_key) == 0
+
+
+def test_fetch_returns_none_on_empty_queue(server):
+    assert make_queue(server).fetch(timeout=1) is None
+
+
+def test_fetch_drops_unparseable_payload(server):
+    queue = make_queue(server)
+    queue.redis.rpush("sago:jobs", b"not json")
+    with pytest.raises(json.JSONDecodeError):
+        queue.fetch(timeout=1)
+    assert queue.redis.llen(queue.processing_key) == 0
+
+
+def test_unreliable_fetch_uses_no_processing_list(server):
+    queue = make_queue(server, reliable=False)
+    push(queue, {"job_id": "j1"})
+    raw, job = queue.fetch(timeout=1)
+    assert job["job_id"] == "j1"
+    assert not queue.redis.exists(queue.processing_key)
+
+
+def test_retry_schedules_next_attempt_with_backoff(server):
+    queue = make_queue(server, retry_base_delay=10, retry_max_delay=100)
+    push(queue, {"job_id": "j1"})
+    raw, job = queue.fetch(timeout=1)
+
+    delay = queue.retry(raw, job, attempt=2)
+    # base * 2^(attempt-1) with +/-20% jitter
+    assert 16 <= delay <= 24
+    assert queue.redis.llen(queue.processing_key) == 0
+    [(payload, due)] = queue.redis.zrange(queue.delayed_key, 0, -1, withscores=True)
+    assert json.loads(payload) == {"job_id": "j1", "attempt": 3}
+    assert due == pytest.approx(time.time() + delay, abs=2)
+
+
+def test_retry_delay_is_capped(server):
+    queue = make_queue(server, retry_base_delay=10, retry_max_delay=30)
+    push(queue, {"job_id": "j1"})
+    raw, job = queue.fetch(timeout=1)
+    assert queue.retry(raw, job, attempt=10) <= 30 * 1.2
+
+
+def test_promote_due_only_moves_elapsed_retries(server):
+    queue = make_queue(server)
+    now = time.time()
+    queue.redis.zadd(queue.delayed_key, {json.dumps({"job_id": "due"}): now - 1})
+    queue.redis.zadd(queue.delayed_key, {json.dumps({"job_id": "later"}): now + 60})
+
+    assert queue.promote_due() == 1
+    assert [json.loads(p)["job_id"] for p in queue.redis.lrange("sago:jobs", 0, -1)] == ["due"]
+    assert queue.redis.zcard(queue.delayed_key) == 1
+
+
+def test_defer_keeps_attempt_unchanged(server):
+    queue = make_queue(server)
+    push(queue, {"job_id": "j1", "attempt": 2})
+    raw, job = queue.fetch(timeout=1)
+
+    queue.defer(raw, job, delay=5)
+    assert queue.redis.llen(queue.processing_key) == 0
+    [payload] = queue.redis.zrange(queue.delayed_key, 0, -1)
+    assert json.loads(payload) == {"job_id": "j1", "attempt": 2}
+
+
+def test_reap_requeues_jobs_of_dead_workers_first(server):
+    dead = make_queue(server, worker_id="dead")
+    alive = make_queue(server, worker_id="alive")
+    push(dead, {"job_id": "taken"})
+    push(dead, {"job_id": "pending"})
+    dead.heartbeat()
+    alive.heartbeat()
+    dead.fetch(timeout=1)
+
+    # Nothing to reap while the heartbeat is live
+    assert alive.reap() == 0
+    dead.redis.delete(dead.heartbeat_key)
+
+    assert alive.reap() == 1
+    assert [json.loads(p)["job_id"] for p in alive.redis.lrange("sago:jobs", 0, -1)] == ["taken", "pending"]
+    assert not alive.redis.sismember(alive.workers_key, "dead")
+    assert alive.redis.sismember(alive.workers_key, "alive")
+
+
+def test_reap_skips_own_processing_list(server):
+    queue = make_queue(server)
+    push(queue, {"job_id": "j1"})
+    queue.fetch(timeout=1)
+    queue.redis.sadd(queue.workers_key, queue.worker_id)
+    assert queue.reap() == 0
+    assert queue.redis.llen(queue.processing_key) == 1
+
+
+def test_close_hands_back_in_progress_jobs(server):
+    queue = make_queue(server)
+    push(queue, {"job_id": "j1"})
+    queue.heartbeat()
+    queue.fetch(timeout=1)
+
+    queue.close()
+    assert queue.redis.llen("sago:jobs") == 1
+    assert not queue.redis.exists(queue.heartbeat_key)
+    assert not queue.redis.sismember(queue.workers_key, queue.worker_id)
+
+
+def test_claim_leader_returns_first_claimant(server):
+    queue = make_queue(server)
+    assert queue.claim_leader("fp", "a", window=60) == "a"
+    assert queue.claim_leader("fp", "b", window=60) == "a"
+    assert queue.redis.ttl(queue.dedup_key("fp")) > 0
+
+
+def test_claim_leader_race_has_one_winner(server):
+    queues = [make_queue(server, worker_id=f"w{i}") for i in range(8)]
+    barrier = threading.Barrier(len(queues))
+    leaders = {}
+
+    def claim(i):
+        barrier.wait()
+        leaders[i] = queues[i].claim_leader("fp", f"job{i}", window=60)
+
+    threads = [threading.Thread(target=claim, args=(i,)) for i in range(len(queues))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    winners = set(leaders.values())
+    assert len(winners) == 1
+    winner = winners.pop()
+    assert leaders[int(winner[3:])] == winner
+
+
+def test_release_leader_only_by_holder(server):
+    queue = make_queue(server)
+    queue.claim_leader("fp", "a", window=60)
+    assert not queue.release_leader("fp", "b")
+    assert queue.release_leader("fp", "a")
+    assert queue.claim_leader("fp", "b", window=60) == "b"
+
+
+def test_waiting_set_is_popped_once(server):
+    queue = make_queue(server)
+    queue.add_waiting("fp", "b", window=60)
+    queue.add_waiting("fp", "c", window=60)
+    assert queue.pop_waiting("fp") == ["b", "c"]
+    assert queue.pop_waiting("fp") == []
+
+
+def test_publish_progress_event(server):
+    queue = make_queue(server)
+    pubsub = queue.redis.pubsub()
+    pubsub.subscribe(queue.progress_channel("j1"))
+    pubsub.get_message(timeout=1)  # subscribe confirmation
+
+    assert queue.publish_progress("j1", "claims_ready", claims=3) == 1
+    message = pubsub.get_message(timeout=1)
+    event = json.loads(message["data"])
+    assert event["job_id"] == "j1" and event["status"] == "claims_ready" and event["claims"] == 3
+
+
+def test_restart_with_same_worker_id_recovers_own_jobs(server):
+    crashed = make_queue(server, worker_id="host:1")
+    push(crashed, {"job_id": "taken"})
+    push(crashed, {"job_id": "pending"})
+    crashed.heartbeat()
+    crashed.fetch(timeout=1)
+    # Crash: no close(), and the restarted container reuses hostname and pid
+
+    restarted = make_queue(server, worker_id="host:1")
+    restarted.heartbeat()
+    assert restarted.reap() == 0
+    assert restarted.recover() == 1
+    assert restarted.redis.llen(restarted.processing_key) == 0
+    assert [json.loads(p)["job_id"] for p in restarted.redis.lrange("sago:jobs", 0, -1)] == ["taken", "pending"]
+    _, job = restarted.fetch(timeout=1)
+    assert job["job_id"] == "taken"
@@ -0,0 +1,2 @@
+# LLM provider module
+from .provider import get_llm, complete, stage_config, get_response_cache
@@ -0,0 +1,202 @@
+"""
+LLM Provider
+One place that decides which model each pipeline stage uses and hands out
+shared clients:
+- get_llm(stage): CrewAI LLM for an agent, built once per configuration and
+  reused by every agent and job in the process.
+- complete(stage, messages): direct chat completion on the pooled OpenAI
+  client (used by the claim verifier).
+
+Calls made at temperature 0 are deterministic, so their responses are cached
+on disk keyed on (model, temperature, prompt hash); re-running a deck with
+unchanged inputs then makes no LLM calls for those stages.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from cache import CacheStore
+from metrics import record_event, record_llm_usage
+from tools.http_client import get_openai_client
+
+# Default model and per-stage overrides (<STAGE>_MODEL / <STAGE>_TEMPERATURE).
+# Without LLM_MODEL the default follows whichever provider key is configured.
+LLM_MODEL = os.getenv("LLM_MODEL")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+STAGE_DEFAULTS = {
+    "scribe": {},
+    "analyst": {},
+    # The verifier has always run deterministically on the plain OpenAI client
+    "verifier": {"model": os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini"), "temperature": 0.0},
+}
+
+# API key variables per model prefix ("gemini/gemini-2.0-flash"; no prefix = OpenAI),
+# and the default model for each, in order of preference
+PROVIDER_KEYS = {
+    "openai": ("OPENAI_API_KEY",),
+    "gemini": ("GEMINI_API_KEY", "GOOGLE_API_KEY"),
+}
+PROVIDER_MODELS = {
+    "openai": "openai/gpt-4o-mini",
+    "gemini": "gemini/gemini-2.0-flash",
+}
+_PLACEHOLDER_KEYS = ("YOUR_OPENAI_API_KEY_HERE", "YOUR_GEMINI_API_KEY_HERE", "NA")
+# Gemini's OpenAI-compatible endpoint, for calls made on the plain OpenAI client
+GEMINI_OPENAI_BASE = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
+# Used when no provider key is configured
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "ollama/llama3.2")
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+
+# Response cache for temperature-0 calls
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+
+_llms: Dict[tuple, object] = {}
+_llms_lock = threading.Lock()
+_response_cache: Optional[CacheStore] = None
+_llm_class = None
+
+
+def model_provider(model: str) -> str:
+    """LiteLLM provider prefix of a model name ("openai" when there is none)."""
+    provider, _, name = model.partition("/")
+    return provider if name else "openai"
+
+
+def _provider_key(provider: str) -> Optional[str]:
+    for var in PROVIDER_KEYS.get(provider, ()):
+        key = os.getenv(var)
+        if key and key not in _PLACEHOLDER_KEYS:
+            return key
+    return None
+
+
+def default_model() -> Optional[str]:
+    """LLM_MODEL, else the default model of the first provider with a key (None if there is none)."""
+    if LLM_MODEL:
+        return LLM_MODEL
+    return next((model for provider, model in PROVIDER_MODELS.items() if _provider_key(provider)), None)
+
+
+def stage_config(stage: str) -> Dict:
+    """
+    Model, temperature, api_key and base_url for a stage, from the environment.
+    A stage model whose provider has no key gives way to the default model, and
+    that to Ollama. Providers without a known key variable are passed through
+    (LiteLLM reads their credentials itself).
+    """
+    defaults = STAGE_DEFAULTS.get(stage, {})
+    prefix = stage.upper()
+    model, api_key, base_url = OLLAMA_MODEL, None, OLLAMA_BASE_URL
+    for candidate in (os.getenv(f"{prefix}_MODEL", defaults.get("model")), default_model()):
+        if not candidate:
+            continue
+        provider = model_provider(candidate)
+        if provider == "ollama":
+            model = candidate
+            break
+        key = _provider_key(provider)
+        if key or provider not in PROVIDER_KEYS:
+            model, api_key = candidate, key
+            base_url = os.getenv("OPENAI_API_BASE") if provider == "openai" else None
+            break
+    temperature = float(os.getenv(f"{prefix}_TEMPERATURE", defaults.get("temperature", LLM_TEMPERATURE)))
+    return {"model": model, "temperature": temperature, "api_key": api_key, "base_url": base_url}
+
+
+def get_response_cache() -> CacheStore:
+    """Process-wide cache of temperature-0 responses (created on first use)."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = CacheStore("llm_responses", ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES)
+    return _response_cache
+
+
+def response_key(model: str, temperature: Optional[float], messages) -> Optional[str]:
+    """Cache key for a call, or None if the call is not deterministic / caching is off."""
+    if not LLM_CACHE_ENABLED or temperature != 0:
+        return None
+    prompt = json.dumps(messages, sort_keys=True, default=str)
+    return f"{model}:{temperature:g}:{hashlib.sha256(prompt.encode('utf-8')).hexdigest()}"
+
+
+def _cached_llm_class():
+    """CrewAI LLM subclass with the response cache (crewai is imported on first use)."""
+    global _llm_class
+    if _llm_class is not None:
+        return _llm_class
+    from crewai import LLM
+
+    class CachedLLM(LLM):
+        """CrewAI LLM that serves repeated temperature-0 prompts from the response cache."""
+
+        def call(self, messages, *args, **kwargs):
+            # Tool-calling turns depend on live tool output; only plain completions are cached
+            key = None if kwargs.get("tools") else response_key(self.model, getattr(self, "temperature", None), messages)
+            if key:
+                cached = get_response_cache().get(key)
+                if cached is not None:
+                    record_event("cache_hit:llm")
+                    return cached
+            result = super().call(messages, *args, **kwargs)
+            if key and isinstance(result, str) and result.strip():
+                get_response_cache().set(key, result)
+            return result
+
+    _llm_class = CachedLLM
+    return _llm_class
+
+
+def get_llm(stage: str):
+    """Shared CrewAI LLM for a pipeline stage ("scribe", "analyst")."""
+    config = stage_config(stage)
+    key = (config["model"], config["temperature"], config["api_key"], config["base_url"])
+    with _llms_lock:
+        llm = _llms.get(key)
+        if llm is None:
+            kwargs = {"model": config["model"], "temperature": config["temperature"]}
+            if config["api_key"]:
+                kwargs["api_key"] = config["api_key"]
+            if config["base_url"]:
+                kwargs["base_url"] = config["base_url"]
+            llm = _llms[key] = _cached_llm_class()(**kwargs)
+        return llm
+
+
+def complete(stage: str, messages: List[Dict]) -> str:
+    """
+    One chat completion for `stage` on the pooled OpenAI client, served from the
+    response cache when the stage runs at temperature 0. Raises on API errors.
+    """
+    config = stage_config(stage)
+    model, base_url, api_key = config["model"], config["base_url"], config["api_key"]
+    # The plain OpenAI client takes bare model names; Ollama and Gemini serve the same API
+    provider, _, name = model.partition("/")
+    if name and provider == "ollama":
+        model, base_url, api_key = name, f"{OLLAMA_BASE_URL.rstrip('/')}/v1", "ollama"
+    elif name and provider == "gemini":
+        model, base_url = name, GEMINI_OPENAI_BASE
+    elif name and provider == "openai":
+        model = name
+    key = response_key(model, config["temperature"], messages)
+    if key:
+        cached = get_response_cache().get(key)
+        if cached is not None:
+            record_event("cache_hit:llm")
+            return cached
+
+    client = get_openai_client(base_url=base_url, api_key=api_key)
+    response = client.chat.completions.create(
+        model=model, messages=messages, temperature=config["temperature"]
+    )
+    content = response.choices[0].message.content
+    usage = getattr(response, "usage", None)
+    record_llm_usage(getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0))
+
+    if key and content:
+        get_response_cache().set(key, content)
+    return content
@@ -0,0 +1,90 @@
+"""Tests for per-stage model and provider selection."""
+from types import SimpleNamespace
+
+import pytest
+
+from llm import provider
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for var in ("OPENAI_API_KEY", "GEMINI_API_KEY", "GOOGLE_API_KEY", "OPENAI_API_BASE",
+                "SCRIBE_MODEL", "ANALYST_MODEL", "VERIFIER_MODEL"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setattr(provider, "LLM_MODEL", None)
+    monkeypatch.setattr(provider, "LLM_CACHE_ENABLED", False)
+
+
+def test_gemini_model_runs_on_google_key(monkeypatch):
+    monkeypatch.setattr(provider, "LLM_MODEL", "gemini/gemini-2.0-flash")
+    monkeypatch.setenv("GOOGLE_API_KEY", "g-key")
+    # The worker used to blank the OpenAI key whenever a Google key was set
+    monkeypatch.setenv("OPENAI_API_KEY", "NA")
+
+    config = provider.stage_config("analyst")
+    assert config["model"] == "gemini/gemini-2.0-flash"
+    assert config["api_key"] == "g-key"
+    assert config["base_url"] is None
+
+
+def test_google_key_alone_defaults_to_gemini(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "g-key")
+    assert provider.stage_config("scribe")["model"] == "gemini/gemini-2.0-flash"
+    # The verifier's OpenAI model has no key, so it follows the default model
+    assert provider.stage_config("verifier")["model"] == "gemini/gemini-2.0-flash"
+    assert provider.stage_config("verifier")["temperature"] == 0.0
+
+
+def test_openai_key_defaults_to_openai(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("GOOGLE_API_KEY", "g-key")
+    monkeypatch.setenv("OPENAI_API_BASE", "http://proxy/v1")
+    config = provider.stage_config("scribe")
+    assert config == {
+        "model": "openai/gpt-4o-mini", "temperature": provider.LLM_TEMPERATURE,
+        "api_key": "sk-test", "base_url": "http://proxy/v1",
+    }
+    assert provider.stage_config("verifier")["model"] == "gpt-4o-mini"
+
+
+def test_stage_override_without_key_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("ANALYST_MODEL", "gemini/gemini-2.0-pro")
+    assert provider.stage_config("analyst")["model"] == "openai/gpt-4o-mini"
+    monkeypatch.setenv("GEMINI_API_KEY", "g-key")
+    assert provider.stage_config("analyst")["model"] == "gemini/gemini-2.0-pro"
+
+
+def test_no_provider_key_falls_back_to_ollama(monkeypatch):
+    monkeypatch.setattr(provider, "LLM_MODEL", "gemini/gemini-2.0-flash")
+    monkeypatch.setenv("OPENAI_API_KEY", "YOUR_OPENAI_API_KEY_HERE")
+    config = provider.stage_config("analyst")
+    assert config["model"] == provider.OLLAMA_MODEL
+    assert config["base_url"] == provider.OLLAMA_BASE_URL
+    assert config["api_key"] is None
+
+
+def test_unknown_provider_is_passed_through(monkeypatch):
+    monkeypatch.setattr(provider, "LLM_MODEL", "groq/llama-3.1-70b")
+    config = provider.stage_config("scribe")
+    assert config["model"] == "groq/llama-3.1-70b" and config["base_url"] is None
+
+
+def test_complete_sends_gemini_to_its_openai_endpoint(monkeypatch):
+    monkeypatch.setattr(provider, "LLM_MODEL", "gemini/gemini-2.0-flash")
+    monkeypatch.setenv("GOOGLE_API_KEY", "g-key")
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content="ok")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    def get_openai_client(base_url=None, api_key=None):
+        calls.append({"base_url": base_url, "api_key": api_key})
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    monkeypatch.setattr(provider, "get_openai_client", get_openai_client)
+    assert provider.complete("scribe", [{"role": "user", "content": "hi"}]) == "ok"
+    assert calls[0] == {"base_url": provider.GEMINI_OPENAI_BASE, "api_key": "g-key"}
+    assert calls[1]["model"] == "gemini-2.0-flash"
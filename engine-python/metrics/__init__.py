@@ -0,0 +1,15 @@
+# Metrics module
+from .registry import REGISTRY, METRICS_PORT, start_metrics_server
+from .collector import (
+    JobMetrics,
+    current_job,
+    track_job,
+    stage,
+    attribute_to,
+    propagate,
+    record_job_status,
+    record_stage_time,
+    record_llm_usage,
+    record_crew_usage,
+    record_event
+)
@@ -0,0 +1,176 @@
+"""
+Job Metrics
+Per-job collector for stage wall time, LLM calls / tokens, search calls and
+cache hits. The current job and stage travel in context variables, so helpers
+deep in tools and pipeline stages record against the right job without it
+being passed around. Everything recorded is also added to the process-wide
+Prometheus registry.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from .registry import REGISTRY
+
+STAGE_SECONDS = REGISTRY.histogram("sago_stage_seconds", "Wall time per pipeline stage")
+JOB_SECONDS = REGISTRY.histogram("sago_job_seconds", "Wall time per analysis job")
+JOBS_TOTAL = REGISTRY.counter("sago_jobs_total", "Analysis jobs finished, by resulting status")
+JOBS_IN_PROGRESS = REGISTRY.gauge("sago_jobs_in_progress", "Analysis jobs currently running")
+LLM_CALLS = REGISTRY.counter("sago_llm_calls_total", "LLM requests, by stage")
+LLM_TOKENS = REGISTRY.counter("sago_llm_tokens_total", "LLM tokens, by stage and kind (prompt / completion)")
+EVENTS = REGISTRY.counter("sago_events_total", "Search calls, cache hits and other pipeline events")
+
+_current_job: contextvars.ContextVar = contextvars.ContextVar("sago_job_metrics", default=None)
+_current_stage: contextvars.ContextVar = contextvars.ContextVar("sago_stage", default="other")
+
+
+class JobMetrics:
+    """Thread-safe totals for one job attempt."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.attempt = 0
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.llm: Dict[str, Dict[str, int]] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add_stage_time(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_llm(self, stage: str, prompt_tokens: int, completion_tokens: int, calls: int):
+        with self._lock:
+            usage = self.llm.setdefault(stage, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            usage["calls"] += calls
+            usage["prompt_tokens"] += prompt_tokens
+            usage["completion_tokens"] += completion_tokens
+
+    def add(self, name: str, amount: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def totals(self) -> Dict[str, int]:
+        """LLM calls and tokens summed over stages."""
+        with self._lock:
+            usages = list(self.llm.values())
+        return {
+            key: sum(usage[key] for usage in usages)
+            for key in ("calls", "prompt_tokens", "completion_tokens")
+        }
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "attempt": self.attempt,
+                "seconds": round(self.elapsed(), 3),
+                "stages": {k: round(v, 3) for k, v in self.stages.items()},
+                "llm": {k: dict(v) for k, v in self.llm.items()},
+                "counters": dict(self.counters),
+            }
+
+
+def current_job() -> Optional[JobMetrics]:
+    """The JobMetrics of the job running in this context, if any."""
+    return _current_job.get()
+
+
+@contextmanager
+def track_job(job_id: str):
+    """Collect metrics for one job attempt; yields the JobMetrics."""
+    job = JobMetrics(job_id)
+    token = _current_job.set(job)
+    JOBS_IN_PROGRESS.inc()
+    try:
+        yield job
+    finally:
+        JOBS_IN_PROGRESS.dec()
+        JOB_SECONDS.observe(job.elapsed())
+        _current_job.reset(token)
+
+
+def record_job_status(status: str):
+    JOBS_TOTAL.inc(status=status)
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage; LLM usage recorded inside it is attributed to the stage."""
+    token = _current_stage.set(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage_time(name, time.perf_counter() - start)
+        _current_stage.reset(token)
+
+
+@contextmanager
+def attribute_to(name: str):
+    """Attribute LLM usage inside the block to a stage without timing it."""
+    token = _current_stage.set(name)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+
+def record_stage_time(name: str, seconds: float):
+    """Add wall time measured elsewhere (e.g. OCR time reported by extraction)."""
+    STAGE_SECONDS.observe(seconds, stage=name)
+    job = _current_job.get()
+    if job:
+        job.add_stage_time(name, seconds)
+
+
+def record_llm_usage(prompt_tokens: int = 0, completion_tokens: int = 0, calls: int = 1):
+    """Count LLM requests and tokens against the current stage."""
+    name = _current_stage.get()
+    prompt_tokens, completion_tokens = int(prompt_tokens or 0), int(completion_tokens or 0)
+    LLM_CALLS.inc(calls, stage=name)
+    LLM_TOKENS.inc(prompt_tokens, stage=name, kind="prompt")
+    LLM_TOKENS.inc(completion_tokens, stage=name, kind="completion")
+    job = _current_job.get()
+    if job:
+        job.add_llm(name, prompt_tokens, completion_tokens, calls)
+
+
+def record_crew_usage(output):
+    """Record the token usage CrewAI reports on a kickoff() result (ignored if absent)."""
+    usage = getattr(output, "token_usage", None)
+    if usage is None:
+        return
+    record_llm_usage(
+        getattr(usage, "prompt_tokens", 0),
+        getattr(usage, "completion_tokens", 0),
+        getattr(usage, "successful_requests", 0) or 1,
+    )
+
+
+def record_event(name: str, amount: float = 1):
+    """Count a named event, e.g. "search_call" or "cache_hit:facts"."""
+    EVENTS.inc(amount, event=name)
+    job = _current_job.get()
+    if job:
+        job.add(name, amount)
+
+
+def propagate(fn: Callable) -> Callable:
+    """
+    Wrap fn so calls on pool threads record against the caller's job and stage.
+    Each call runs in its own copy of the captured context, so the wrapper can be
+    used from several threads at once.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
@@ -1,2 +1,18 @@
 # Personalization module
-from .investor_memory import InvestorMemory, create_demo_investor
+# investor_memory needs sentence-transformers, so it is imported on first use;
+# vector_store (also used by the claim fact cache) stays importable without it.
+_INVESTOR_MEMORY = (
+    "InvestorMemory",
+    "create_demo_investor",
+    "format_investor_focus",
+    "format_memo_context",
+    "get_embedder",
+    "preload",
+)
+
+
+def __getattr__(name):
+    if name in _INVESTOR_MEMORY:
+        from . import investor_memory
+        return getattr(investor_memory, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,118 @@
+"""
+Bulk Memo Ingestion
+Loads an investor's backlog of historical memos into investor memory in
+batches, with a checkpoint file so an interrupted run resumes where it stopped.
+
+Usage:
+    python -m personalization.ingest --investor-id demo_investor --source memos/
+    python -m personalization.ingest --investor-id demo_investor --source memos.jsonl --batch-size 128
+
+Sources:
+- a directory of .txt / .md files (memo id = file name without extension)
+- a JSONL file, one memo per line: {"memo_id": ..., "text": ..., <other keys become metadata>}
+  A line may carry its own "investor_id" to override --investor-id.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterator, List, Set
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from personalization.investor_memory import InvestorMemory, MEMO_BATCH_SIZE
+
+CHECKPOINT_DIR = os.getenv("INGEST_CHECKPOINT_DIR", "outputs/ingest_checkpoints")
+
+
+def read_memos(source: str, default_investor_id: str) -> Iterator[Dict]:
+    """Yield {"investor_id", "memo_id", "text", "metadata"} from a directory or JSONL file."""
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if not name.endswith((".txt", ".md")):
+                continue
+            with open(os.path.join(source, name), encoding="utf-8") as f:
+                text = f.read()
+            yield {
+                "investor_id": default_investor_id,
+                "memo_id": os.path.splitext(name)[0],
+                "text": text,
+                "metadata": {"source_file": name},
+            }
+        return
+
+    with open(source, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = record.pop("text", "")
+            # "memo_id" wins over "id"; an "id" next to it stays in the metadata
+            memo_id = record.pop("memo_id", None)
+            if memo_id is None:
+                memo_id = record.pop("id", line_no)
+            memo_id = str(memo_id)
+            investor_id = record.pop("investor_id", default_investor_id)
+            yield {"investor_id": investor_id, "memo_id": memo_id, "text": text, "metadata": record}
+
+
+def _checkpoint_path(source: str, investor_id: str) -> str:
+    name = os.path.basename(os.path.normpath(source))
+    return os.path.join(CHECKPOINT_DIR, f"{investor_id}__{name}.json")
+
+
+def _load_checkpoint(path: str) -> Set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return set(json.load(f).get("done", []))
+
+
+def _save_checkpoint(path: str, done: Set[str]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"done": sorted(done)}, f)
+    os.replace(tmp, path)
+
+
+def ingest(source: str, investor_id: str, batch_size: int = MEMO_BATCH_SIZE, resume: bool = True) -> int:
+    """Ingest every memo in `source`. Returns the number of vectors written."""
+    by_investor: Dict[str, List[Dict]] = {}
+    for memo in read_memos(source, investor_id):
+        if not memo["investor_id"]:
+            raise ValueError(f"Memo {memo['memo_id']} has no investor_id (pass --investor-id)")
+        if memo["text"].strip():
+            by_investor.setdefault(memo["investor_id"], []).append(memo)
+
+    memory = InvestorMemory()
+    written = 0
+    for inv_id, memos in by_investor.items():
+        checkpoint = _checkpoint_path(source, inv_id)
+        done = _load_checkpoint(checkpoint) if resume else set()
+        pending = [m for m in memos if m["memo_id"] not in done]
+        print(f"Investor {inv_id}: {len(pending)} memos to ingest ({len(memos) - len(pending)} already done)")
+
+        def on_batch_stored(memo_ids: List[str]):
+            done.update(memo_ids)
+            _save_checkpoint(checkpoint, done)
+            print(f"  ... {len(done)}/{len(memos)} memos stored")
+
+        written += memory.store_memos(inv_id, pending, batch_size=batch_size, on_batch_stored=on_batch_stored)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-ingest historical memos into investor memory.")
+    parser.add_argument("--source", required=True, help="Directory of .txt/.md memos or a JSONL file")
+    parser.add_argument("--investor-id", help="Investor the memos belong to (JSONL lines may override)")
+    parser.add_argument("--batch-size", type=int, default=MEMO_BATCH_SIZE, help="Chunks per embed/upsert batch")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and ingest everything again")
+    args = parser.parse_args()
+
+    written = ingest(args.source, args.investor_id, batch_size=args.batch_size, resume=not args.restart)
+    print(f"Done: {written} vectors written")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,210 @@
 """
 Investor Memory Module
-Stores and retrieves investor profiles, preferences, and historical memos using Pinecone.
+Stores and retrieves investor profiles, preferences, and historical memos in a
+vector store (Pinecone by default, or the local on-disk index; see vector_store.py).
 """
 import os
-from typing import List, Dict, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional
+
+import numpy as np
 from dotenv import load_dotenv
-from pinecone import Pinecone, ServerlessSpec
 from sentence_transformers import SentenceTransformer
 
+from cache import bump_memo_version, profile_digest, text_digest
+from pipeline.tokens import count_tokens
+from .vector_store import get_vector_store
+
 load_dotenv()
 
-class InvestorMemory:
-    def __init__(self):
-        # Initialize Pinecone
-        self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-        self.index_name = os.getenv("PINECONE_INDEX", "sago-investors")
-        
-        # Initialize embedding model (bge-large outputs 1024 dimensions)
-        print("Loading embedding model (this may take a moment on first run)...")
-        self.embedder = SentenceTransformer('BAAI/bge-large-en-v1.5')
-        print("Embedding model loaded!")
-        
-        # Ensure index exists
-        self._ensure_index()
-        
-        # Connect to index
-        self.index = self.pc.Index(self.index_name)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "BAAI/bge-large-en-v1.5")
+
+# Process-wide handle: the embedding model is loaded once and shared by every
+# InvestorMemory (and every concurrent job) in the process. Vector stores are
+# shared the same way by get_vector_store().
+_embedder: Optional[SentenceTransformer] = None
+_shared_lock = threading.Lock()
+
+# Memos longer than this are split into overlapping chunks (one vector each)
+MEMO_CHUNK_CHARS = int(os.getenv("MEMO_CHUNK_CHARS", "1000"))
+MEMO_CHUNK_OVERLAP = int(os.getenv("MEMO_CHUNK_OVERLAP", "150"))
+# Chunks per encode() call and per upsert
+MEMO_BATCH_SIZE = int(os.getenv("MEMO_BATCH_SIZE", "64"))
+
+# Vector store queries per memo retrieval: beyond this many claims, similar claims
+# are grouped and each group is queried once with its centroid (in parallel)
+MEMO_MAX_QUERIES = int(os.getenv("MEMO_MAX_QUERIES", "4"))
+
+# Query embeddings (e.g. deck claims) kept in an in-process LRU keyed by text hash,
+# so claims repeated across decks and investors are only embedded once
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+_embedding_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+# vector id -> digest of the profile last written/seen in the index, so unchanged
+# profiles skip both the embedding pass and the upsert
+_profile_digests: Dict[str, str] = {}
+
+
+def _chunk_ids(base_id: str, count: int) -> List[str]:
+    """Vector ids of a memo's chunks: the base id alone for a single chunk."""
+    return [base_id] if count == 1 else [f"{base_id}#{i}" for i in range(count)]
 
-    
-    def _ensure_index(self):
-        """Create index if it doesn't exist or dimensions don't match."""
-        try:
-            existing_indexes = [idx.name for idx in self.pc.list_indexes()]
-            if self.index_name in existing_indexes:
-                # Index exists, check if we need to delete it
-                print(f"Index {self.index_name} exists, connecting...")
-                return
-            
-            # Create new index
-            self.pc.create_index(
-                name=self.index_name,
-                dimension=1024,  # bge-large embedding dimension
-                metric="cosine",
-                spec=ServerlessSpec(
-                    cloud="aws",
-                    region=os.getenv("PINECONE_ENV", "us-east-1")
-                )
-            )
-            print(f"Created Pinecone index: {self.index_name}")
-        except Exception as e:
-            print(f"Index setup note: {e}")
 
+def chunk_text(text: str, size: int = MEMO_CHUNK_CHARS, overlap: int = MEMO_CHUNK_OVERLAP) -> List[str]:
+    """
+    Split text into chunks of at most `size` chars, breaking on paragraph or
+    sentence boundaries where possible, with `overlap` chars carried over.
+    """
+    text = text.strip()
+    if len(text) <= size:
+        return [text] if text else []
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            # Prefer a paragraph break, then a sentence end, in the back half of the window
+            window = text[start:end]
+            cut = max(window.rfind("\n\n"), window.rfind(". "))
+            if cut > size // 2:
+                end = start + cut + 1
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+        # Start the overlap on a word boundary
+        space = text.find(" ", start, end)
+        if space != -1:
+            start = space + 1
+    return [c for c in chunks if c]
+
+
+def format_memo_context(memos: List[Dict], max_tokens: int) -> Optional[str]:
+    """Render retrieved memos best-first, stopping before the token budget is exceeded."""
+    lines = []
+    used = 0
+    for memo in memos:
+        entry = f"- [{memo['memo_id']}] {memo['text'].strip()}"
+        tokens = count_tokens(entry)
+        if used + tokens > max_tokens:
+            break
+        lines.append(entry)
+        used += tokens + 1
+    return "\n".join(lines) if lines else None
+
+
+def format_investor_focus(profile: Dict) -> Optional[str]:
+    """
+    Format an investor's focus areas, deal-breakers and thesis for injection
+    into the Analyst agent's prompt.
+    """
+    focus_text = []
+    if profile.get("focus_areas"):
+        focus_text.append(f"Focus Areas: {', '.join(profile['focus_areas'])}")
+    if profile.get("deal_breakers"):
+        focus_text.append(f"Deal Breakers: {', '.join(profile['deal_breakers'])}")
+    if profile.get("thesis"):
+        focus_text.append(f"Investment Thesis: {profile['thesis']}")
     
-    def store_investor_profile(self, investor_id: str, profile: Dict):
+    return "\n".join(focus_text) if focus_text else None
+
+
+def cluster_centroids(vectors: List[List[float]], k: int, iterations: int = 10) -> List[List[float]]:
+    """
+    Group vectors into at most k clusters by cosine similarity (spherical k-means,
+    deterministic seeding) and return the unit-length centroid of each cluster.
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = matrix / np.where(norms == 0, 1, norms)
+    if len(matrix) <= k:
+        return matrix.tolist()
+
+    centroids = matrix[np.linspace(0, len(matrix) - 1, k).astype(int)]
+    for _ in range(iterations):
+        labels = np.argmax(matrix @ centroids.T, axis=1)
+        updated = np.stack([
+            matrix[labels == c].sum(axis=0) if np.any(labels == c) else centroids[c] for c in range(k)
+        ])
+        updated /= np.maximum(np.linalg.norm(updated, axis=1, keepdims=True), 1e-12)
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+    labels = np.argmax(matrix @ centroids.T, axis=1)
+    return [centroids[c].tolist() for c in range(k) if np.any(labels == c)]
+
+
+def get_embedder() -> SentenceTransformer:
+    """Load the embedding model on first use and return the shared instance."""
+    global _embedder
+    with _shared_lock:
+        if _embedder is None:
+            # bge-large outputs 1024 dimensions
+            print("Loading embedding model (this may take a moment on first run)...")
+            _embedder = SentenceTransformer(EMBEDDING_MODEL)
+            print("Embedding model loaded!")
+        return _embedder
+
+
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """Embed texts with the shared model in one batched encode() call, serving repeats from the LRU cache."""
+    keys = [text_digest(t) for t in texts]
+    vectors: Dict[str, List[float]] = {}
+    with _embedding_cache_lock:
+        for key in keys:
+            if key in _embedding_cache:
+                _embedding_cache.move_to_end(key)
+                vectors[key] = _embedding_cache[key]
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors:
+            missing.setdefault(key, text)
+    if missing:
+        encoded = get_embedder().encode(list(missing.values()))
+        with _embedding_cache_lock:
+            for key, vector in zip(missing.keys(), encoded):
+                vectors[key] = _embedding_cache[key] = vector.tolist()
+            while len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+                _embedding_cache.popitem(last=False)
+
+    return [vectors[key] for key in keys]
+
+
+def preload():
+    """Warm the shared embedder and index handle (e.g. at worker startup)."""
+    InvestorMemory()
+
+
+class InvestorMemory:
+    def __init__(self, backend: Optional[str] = None):
+        # Shared embedding model
+        self.embedder = get_embedder()
+
+        # Shared vector store ("pinecone" or "local"; defaults to VECTOR_STORE)
+        self.store = get_vector_store(backend)
+
+    def store_investor_profile(self, investor_id: str, profile: Dict) -> bool:
         """
         Store an investor's profile including:
         - Investment thesis
         - Deal-breaker criteria
         - Historical memos/notes
         - Focus areas (sectors, stages, geographies)
+
+        Skips the embedding and upsert when the stored profile digest matches.
+        Returns True if the profile was (re)written.
         """
+        vector_id = f"profile_{investor_id}"
+        digest = profile_digest(profile)
+        if self._stored_profile_digest(vector_id) == digest:
+            print(f"Profile unchanged for investor: {investor_id}, skipping sync")
+            return False
+
         # Create text representation for embedding
         text_parts = []
         if "thesis" in profile:
@@ -76,63 +221,195 @@ class InvestorMemory:
         # Generate embedding
         embedding = self.embedder.encode(full_text).tolist()
         
-        # Upsert to Pinecone
-        self.index.upsert(
+        # Upsert to the vector store
+        self.store.upsert(
             vectors=[{
-                "id": f"profile_{investor_id}",
+                "id": vector_id,
                 "values": embedding,
                 "metadata": {
                     "investor_id": investor_id,
                     "type": "profile",
+                    "profile_digest": digest,
                     **profile
                 }
             }]
         )
+        _profile_digests[vector_id] = digest
         print(f"Stored profile for investor: {investor_id}")
+        return True
+
+    def _stored_profile_digest(self, vector_id: str) -> Optional[str]:
+        """Digest of the stored profile; fetched from the index only the first time per process."""
+        if vector_id not in _profile_digests:
+            try:
+                result = self.store.fetch([vector_id])
+                if vector_id in result:
+                    digest = result[vector_id]["metadata"].get("profile_digest")
+                    if digest:
+                        _profile_digests[vector_id] = digest
+            except Exception as e:
+                print(f"Error fetching stored profile digest: {e}")
+        return _profile_digests.get(vector_id)
     
     def store_memo(self, investor_id: str, memo_id: str, memo_text: str, metadata: Dict = None):
         """Store an investment memo or note from past deals."""
-        embedding = self.embedder.encode(memo_text).tolist()
-        
-        meta = {
-            "investor_id": investor_id,
-            "type": "memo",
-            "text": memo_text[:1000],  # Truncate for metadata storage
-        }
-        if metadata:
-            meta.update(metadata)
-        
-        self.index.upsert(
-            vectors=[{
-                "id": f"memo_{investor_id}_{memo_id}",
-                "values": embedding,
-                "metadata": meta
-            }]
-        )
+        self.store_memos(investor_id, [{"memo_id": memo_id, "text": memo_text, "metadata": metadata}])
         print(f"Stored memo {memo_id} for investor: {investor_id}")
+
+    def store_memos(
+        self,
+        investor_id: str,
+        memos: List[Dict],
+        batch_size: int = MEMO_BATCH_SIZE,
+        on_batch_stored: Optional[Callable[[List[str]], None]] = None,
+    ) -> int:
+        """
+        Store many memos ({"memo_id", "text", "metadata"?}) for one investor.
+        Long memos are split into chunks; chunks are embedded with batched
+        encode() calls and upserted batch_size vectors at a time.
+        on_batch_stored receives the memo ids fully stored after each batch
+        (used for resumable checkpoints). Chunks left over from an earlier,
+        longer version of a memo are deleted once the memo is stored.
+        Returns the number of vectors written.
+        """
+        # Flatten memos into chunk records, remembering which chunk finishes each memo
+        records = []
+        chunk_ids: Dict[str, List[str]] = {}
+        for memo in memos:
+            chunks = chunk_text(memo["text"])
+            base_id = f"memo_{investor_id}_{memo['memo_id']}"
+            chunk_ids[memo["memo_id"]] = _chunk_ids(base_id, len(chunks))
+            for i, chunk in enumerate(chunks):
+                meta = {
+                    "investor_id": investor_id,
+                    "type": "memo",
+                    "memo_id": memo["memo_id"],
+                    "chunk": i,
+                    "chunks": len(chunks),
+                    "text": chunk,
+                }
+                if memo.get("metadata"):
+                    meta.update(memo["metadata"])
+                records.append({
+                    "id": chunk_ids[memo["memo_id"]][i],
+                    "text": chunk,
+                    "metadata": meta,
+                    "completes": memo["memo_id"] if i == len(chunks) - 1 else None,
+                })
+
+        stale = self._stale_chunk_ids(investor_id, chunk_ids)
+
+        written = 0
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            embeddings = self.embedder.encode([r["text"] for r in batch], batch_size=batch_size)
+            self.store.upsert(
+                vectors=[
+                    {"id": r["id"], "values": e.tolist(), "metadata": r["metadata"]}
+                    for r, e in zip(batch, embeddings)
+                ]
+            )
+            written += len(batch)
+            completed = [r["completes"] for r in batch if r["completes"]]
+            leftover = [vid for memo_id in completed for vid in stale.get(memo_id, [])]
+            if leftover:
+                self.store.delete(leftover)
+            # Cached reports built on this investor's earlier memos are stale now
+            bump_memo_version(investor_id)
+            if on_batch_stored:
+                on_batch_stored(completed)
+        return written
+
+    def _stale_chunk_ids(self, investor_id: str, chunk_ids: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Ids stored for earlier versions of these memos that the new chunks do not overwrite."""
+        stale = {}
+        memo_ids = list(chunk_ids)
+        for start in range(0, len(memo_ids), MEMO_BATCH_SIZE):
+            batch = memo_ids[start:start + MEMO_BATCH_SIZE]
+            bases = {memo_id: f"memo_{investor_id}_{memo_id}" for memo_id in batch}
+            # A stored memo has either one unsuffixed vector or chunks <base>#0..#n-1
+            heads = self.store.fetch([vid for base in bases.values() for vid in (base, f"{base}#0")])
+            for memo_id, base in bases.items():
+                if base in heads:
+                    old = [base]
+                elif f"{base}#0" in heads:
+                    count = heads[f"{base}#0"]["metadata"].get("chunks") or self._count_chunks(base)
+                    old = _chunk_ids(base, int(count))
+                else:
+                    continue
+                current = set(chunk_ids[memo_id])
+                leftover = [vid for vid in old if vid not in current]
+                if leftover:
+                    stale[memo_id] = leftover
+        return stale
+
+    def _count_chunks(self, base_id: str) -> int:
+        """Chunks stored under base_id#k, for memos stored before the chunk count was recorded."""
+        count = 1
+        while True:
+            found = self.store.fetch([f"{base_id}#{i}" for i in range(count, count + 100)])
+            if not found:
+                return count
+            count = max(int(vid.rsplit("#", 1)[1]) for vid in found) + 1
     
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in one batched encode() call, serving repeats from the LRU cache."""
+        return embed_texts(texts)
+
+    def get_relevant_memos(
+        self, investor_id: str, queries: List[str], top_k: int = 5, max_queries: int = MEMO_MAX_QUERIES
+    ) -> List[Dict]:
+        """
+        Retrieve the investor's past memo chunks most relevant to any of the queries
+        (e.g. every claim extracted from a deck). Queries are embedded in one batch;
+        more than max_queries of them are clustered and each cluster is searched
+        once with its centroid, so a deck costs at most max_queries store round-trips
+        (run in parallel). Returns the best top_k matches as
+        [{"score", "memo_id", "text", "content"}], best first.
+        """
+        queries = [q for q in queries if q.strip()]
+        if not queries:
+            return []
+
+        vectors = cluster_centroids(self.embed_texts(queries), max(1, max_queries))
+        # Profile vectors share the investor filter, so ask for one extra per query
+        search = lambda vector: self.store.query(vector, top_k=top_k + 1, investor_id=investor_id)
+        with ThreadPoolExecutor(max_workers=len(vectors)) as pool:
+            results = list(pool.map(search, vectors))
+
+        best: Dict[str, Dict] = {}
+        for matches in results:
+            for match in matches:
+                meta = match["metadata"]
+                if meta.get("type") != "memo":
+                    continue
+                if match["id"] not in best or match["score"] > best[match["id"]]["score"]:
+                    best[match["id"]] = {
+                        "score": match["score"],
+                        "memo_id": meta.get("memo_id", match["id"]),
+                        "text": meta.get("text", ""),
+                        "content": meta,
+                    }
+
+        return sorted(best.values(), key=lambda m: m["score"], reverse=True)[:top_k]
+
     def get_relevant_context(self, investor_id: str, query: str, top_k: int = 3) -> List[Dict]:
         """
         Retrieve relevant context from investor's history based on the current pitch deck claims.
         This is used to personalize the Analyst's output.
         """
         # Embed the query (e.g., claims from pitch deck)
-        query_embedding = self.embedder.encode(query).tolist()
+        query_embedding = self.embed_texts([query])[0]
         
         # Search for relevant context from this investor's data
-        results = self.index.query(
-            vector=query_embedding,
-            top_k=top_k,
-            include_metadata=True,
-            filter={"investor_id": {"$eq": investor_id}}
-        )
+        matches = self.store.query(query_embedding, top_k=top_k, investor_id=investor_id)
         
         contexts = []
-        for match in results.matches:
+        for match in matches:
             contexts.append({
-                "score": match.score,
-                "type": match.metadata.get("type"),
-                "content": match.metadata
+                "score": match["score"],
+                "type": match["metadata"].get("type"),
+                "content": match["metadata"]
             })
         
         return contexts
@@ -144,20 +421,11 @@ class InvestorMemory:
         """
         try:
             # Fetch the profile directly
-            result = self.index.fetch(ids=[f"profile_{investor_id}"])
+            result = self.store.fetch([f"profile_{investor_id}"])
             
-            if f"profile_{investor_id}" in result.vectors:
-                meta = result.vectors[f"profile_{investor_id}"].metadata
-                
-                focus_text = []
-                if meta.get("focus_areas"):
-                    focus_text.append(f"Focus Areas: {', '.join(meta['focus_areas'])}")
-                if meta.get("deal_breakers"):
-                    focus_text.append(f"Deal Breakers: {', '.join(meta['deal_breakers'])}")
-                if meta.get("thesis"):
-                    focus_text.append(f"Investment Thesis: {meta['thesis']}")
-                
-                return "\n".join(focus_text) if focus_text else None
+            if f"profile_{investor_id}" in result:
+                meta = result[f"profile_{investor_id}"]["metadata"]
+                return format_investor_focus(meta)
         except Exception as e:
             print(f"Error fetching investor focus: {e}")
         
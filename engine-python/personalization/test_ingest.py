@@ -0,0 +1,79 @@
+"""Tests for memo ingestion: JSONL parsing and re-ingesting changed memos."""
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from cache import CacheStore
+from cache import results as cache_results
+from personalization.ingest import read_memos
+from personalization.investor_memory import InvestorMemory, chunk_text
+from personalization.vector_store import LocalVectorStore
+
+DIM = 8
+
+
+class FakeEmbedder:
+    def encode(self, texts, batch_size=None):
+        return np.array([[len(text) % 7 + 1] + [1.0] * (DIM - 1) for text in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_results, "_memo_versions", CacheStore("memo_versions", path=str(tmp_path / "c.db")))
+    memory = InvestorMemory.__new__(InvestorMemory)
+    memory.embedder = FakeEmbedder()
+    memory.store = LocalVectorStore(str(tmp_path / "vectors"), dimension=DIM)
+    return memory
+
+
+def paragraphs(n):
+    return "\n\n".join(f"Paragraph {i}: " + "The team passed on this deal. " * 20 for i in range(n))
+
+
+def memo_ids(store):
+    return sorted(vid for vid in store.ids() if vid.startswith("memo_"))
+
+
+def test_read_memos_prefers_memo_id_and_keeps_id_as_metadata(tmp_path):
+    source = tmp_path / "memos.jsonl"
+    source.write_text("\n".join(json.dumps(r) for r in [
+        {"memo_id": "m1", "id": "crm-7", "text": "First", "sector": "fintech"},
+        {"id": "crm-8", "text": "Second"},
+        {"text": "Third", "investor_id": "other"},
+    ]))
+    memos = list(read_memos(str(source), "inv"))
+    assert [(m["investor_id"], m["memo_id"]) for m in memos] == [("inv", "m1"), ("inv", "crm-8"), ("other", "3")]
+    assert memos[0]["metadata"] == {"id": "crm-7", "sector": "fintech"}
+    assert memos[1]["metadata"] == {}
+
+
+def test_reingesting_a_shorter_memo_deletes_leftover_chunks(memory):
+    long_text = paragraphs(8)
+    assert len(chunk_text(long_text)) > 3
+
+    memory.store_memos("inv", [{"memo_id": "m1", "text": long_text}, {"memo_id": "m2", "text": "Short memo"}])
+    memory.store_memos("inv", [{"memo_id": "m1", "text": paragraphs(3)}])
+    count = len(chunk_text(paragraphs(3)))
+    assert memo_ids(memory.store) == sorted([f"memo_inv_m1#{i}" for i in range(count)] + ["memo_inv_m2"])
+
+    memory.store_memos("inv", [{"memo_id": "m1", "text": "Now a single chunk"}])
+    assert memo_ids(memory.store) == ["memo_inv_m1", "memo_inv_m2"]
+
+    memory.store_memos("inv", [{"memo_id": "m1", "text": long_text}])
+    assert "memo_inv_m1" not in memory.store.ids()
+    assert len(memo_ids(memory.store)) == len(chunk_text(long_text)) + 1
+
+
+def test_leftover_chunks_of_memos_stored_without_a_chunk_count(memory):
+    # Memos ingested before the chunk count was recorded in the metadata
+    memory.store.upsert([
+        {"id": f"memo_inv_m1#{i}", "values": [1.0] * DIM, "metadata": {"investor_id": "inv", "chunk": i}}
+        for i in range(5)
+    ])
+    memory.store_memos("inv", [{"memo_id": "m1", "text": paragraphs(3)}])
+    count = len(chunk_text(paragraphs(3)))
+    assert count < 5
+    assert memo_ids(memory.store) == [f"memo_inv_m1#{i}" for i in range(count)]
@@ -0,0 +1,125 @@
+"""Tests for the on-disk local vector store (log replay, snapshots, compaction)."""
+import os
+
+import pytest
+
+from personalization import vector_store
+from personalization.vector_store import LocalVectorStore
+
+DIM = 4
+
+
+def vec(vid, *values, **metadata):
+    return {"id": vid, "values": list(values), "metadata": metadata}
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / "vectors")
+
+
+def open_store(directory):
+    return LocalVectorStore(directory, dimension=DIM)
+
+
+def test_fresh_instance_replays_the_log(directory):
+    writer = open_store(directory)
+    reader = open_store(directory)
+    writer.upsert([vec("a", 1, 0, 0, 0, investor_id="i1"), vec("b", 0, 1, 0, 0, investor_id="i2")])
+
+    fresh = open_store(directory)
+    assert sorted(fresh.ids()) == ["a", "b"]
+    assert fresh.fetch(["a"])["a"]["metadata"] == {"investor_id": "i1"}
+    # An instance opened earlier catches up before reading
+    assert reader.size() == 2
+    assert reader.query([0, 1, 0, 0], top_k=1)[0]["id"] == "b"
+
+
+def test_upsert_is_normalized(directory):
+    store = open_store(directory)
+    store.upsert([vec("a", 3, 4, 0, 0)])
+    assert store.fetch(["a"])["a"]["values"] == pytest.approx([0.6, 0.8, 0, 0])
+    assert store.query([3, 4, 0, 0], top_k=1)[0]["score"] == pytest.approx(1.0)
+
+
+def test_reupsert_replaces_vector_and_metadata(directory):
+    store = open_store(directory)
+    store.upsert([vec("a", 1, 0, 0, 0, investor_id="i1", text="old")])
+    store.upsert([vec("a", 0, 0, 1, 0, investor_id="i2", text="new")])
+
+    fresh = open_store(directory)
+    for s in (store, fresh):
+        assert s.size() == 1
+        assert s.fetch(["a"])["a"]["metadata"] == {"investor_id": "i2", "text": "new"}
+        assert s.query([1, 0, 0, 0], top_k=5, investor_id="i1") == []
+        [match] = s.query([0, 0, 1, 0], top_k=5, investor_id="i2")
+        assert match["id"] == "a" and match["score"] == pytest.approx(1.0)
+
+
+def test_delete(directory):
+    store = open_store(directory)
+    store.upsert([vec("a", 1, 0, 0, 0, investor_id="i1"), vec("b", 0, 1, 0, 0, investor_id="i1")])
+    store.delete(["a", "missing"])
+
+    fresh = open_store(directory)
+    for s in (store, fresh):
+        assert s.ids() == ["b"]
+        assert s.fetch(["a"]) == {}
+        assert [m["id"] for m in s.query([1, 0, 0, 0], top_k=5, investor_id="i1")] == ["b"]
+
+
+def test_query_filters_by_investor(directory):
+    store = open_store(directory)
+    store.upsert([
+        vec("a1", 1, 0, 0, 0, investor_id="a"),
+        vec("a2", 0.9, 0.1, 0, 0, investor_id="a"),
+        vec("b1", 1, 0, 0, 0, investor_id="b"),
+        vec("none", 1, 0, 0, 0),
+    ])
+    assert [m["id"] for m in store.query([1, 0, 0, 0], top_k=5, investor_id="a")] == ["a1", "a2"]
+    assert [m["id"] for m in store.query([1, 0, 0, 0], top_k=5, investor_id="b")] == ["b1"]
+    assert store.query([1, 0, 0, 0], top_k=5, investor_id="c") == []
+    assert len(store.query([1, 0, 0, 0], top_k=10)) == 4
+
+
+def test_compaction_at_threshold_replaces_old_snapshot(directory, monkeypatch):
+    monkeypatch.setattr(vector_store, "LOCAL_VECTOR_COMPACT_ROWS", 3)
+    store = open_store(directory)
+    early_reader = open_store(directory)
+
+    store.upsert([vec("a", 1, 0, 0, 0), vec("b", 0, 1, 0, 0)])
+    assert not os.path.exists(os.path.join(directory, "CURRENT"))
+    store.delete(["b"])  # third logged row
+    assert open(os.path.join(directory, "CURRENT")).read() == "1"
+    assert os.path.isdir(os.path.join(directory, "v1"))
+    assert not os.path.exists(os.path.join(directory, "v0.wal"))
+
+    store.upsert([vec("c", 0, 0, 1, 0), vec("d", 0, 0, 0, 1), vec("e", 1, 1, 0, 0)])
+    assert open(os.path.join(directory, "CURRENT")).read() == "2"
+    assert os.path.isdir(os.path.join(directory, "v2"))
+    assert not os.path.exists(os.path.join(directory, "v1"))
+    assert not os.path.exists(os.path.join(directory, "v1.wal"))
+
+    for s in (store, early_reader, open_store(directory)):
+        assert sorted(s.ids()) == ["a", "c", "d", "e"]
+        assert s.query([0, 0, 0, 1], top_k=1)[0]["id"] == "d"
+
+
+def test_compact_on_demand(directory):
+    store = open_store(directory)
+    store.upsert([vec("a", 1, 0, 0, 0, investor_id="i1")])
+    store.compact()
+    assert open(os.path.join(directory, "CURRENT")).read() == "1"
+    fresh = open_store(directory)
+    assert fresh.fetch(["a"])["a"]["metadata"] == {"investor_id": "i1"}
+    assert fresh.query([1, 0, 0, 0], top_k=1, investor_id="i1")[0]["id"] == "a"
+
+
+def test_torn_log_line_is_dropped(directory):
+    store = open_store(directory)
+    store.upsert([vec("a", 1, 0, 0, 0)])
+    # A writer that died mid-append leaves half a line behind
+    with open(os.path.join(directory, "v0.wal"), "ab") as f:
+        f.write(b'{"id": "torn", "val')
+    store.upsert([vec("b", 0, 1, 0, 0)])
+    assert sorted(open_store(directory).ids()) == ["a", "b"]
@@ -0,0 +1,376 @@
+"""
+Vector Store Backends
+Storage behind InvestorMemory. Every backend exposes the same four calls:
+
+- upsert(vectors)                        [{"id", "values", "metadata"}]
+- query(vector, top_k, investor_id)      -> [{"id", "score", "metadata"}] best first
+- fetch(ids)                             -> {id: {"values", "metadata"}}
+- delete(ids)                            unknown ids are ignored
+
+Backends:
+- "pinecone": Pinecone serverless index (default)
+- "local":    in-process NumPy index on disk (memory-mapped snapshot + append-only log)
+"""
+import base64
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking for the local store
+    fcntl = None
+
+VECTOR_STORE = os.getenv("VECTOR_STORE", "pinecone")
+LOCAL_VECTOR_DIR = os.getenv("LOCAL_VECTOR_DIR", "outputs/vector_store")
+EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION", "1024"))  # bge-large
+# Logged upserts folded into a new snapshot of the local store at once
+LOCAL_VECTOR_COMPACT_ROWS = int(os.getenv("LOCAL_VECTOR_COMPACT_ROWS", "1000"))
+
+_stores: Dict[str, object] = {}
+_stores_lock = threading.Lock()
+
+
+class PineconeStore:
+    def __init__(self, index_name: str, dimension: int = EMBEDDING_DIMENSION):
+        from pinecone import Pinecone
+
+        self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+        self.index_name = index_name
+        self.dimension = dimension
+        self._ensure_index()
+        self.index = self.pc.Index(index_name)
+
+    def _ensure_index(self):
+        """Create index if it doesn't exist."""
+        from pinecone import ServerlessSpec
+
+        try:
+            existing_indexes = [idx.name for idx in self.pc.list_indexes()]
+            if self.index_name in existing_indexes:
+                print(f"Index {self.index_name} exists, connecting...")
+                return
+            
+            # Create new index
+            self.pc.create_index(
+                name=self.index_name,
+                dimension=self.dimension,
+                metric="cosine",
+                spec=ServerlessSpec(
+                    cloud="aws",
+                    region=os.getenv("PINECONE_ENV", "us-east-1")
+                )
+            )
+            print(f"Created Pinecone index: {self.index_name}")
+        except Exception as e:
+            print(f"Index setup note: {e}")
+
+    def upsert(self, vectors: List[Dict]):
+        self.index.upsert(vectors=vectors)
+
+    def query(self, vector: List[float], top_k: int, investor_id: Optional[str] = None) -> List[Dict]:
+        results = self.index.query(
+            vector=vector,
+            top_k=top_k,
+            include_metadata=True,
+            filter={"investor_id": {"$eq": investor_id}} if investor_id else None
+        )
+        return [{"id": m.id, "score": m.score, "metadata": m.metadata or {}} for m in results.matches]
+
+    def delete(self, ids: List[str]):
+        if ids:
+            self.index.delete(ids=ids)
+
+    def fetch(self, ids: List[str]) -> Dict[str, Dict]:
+        result = self.index.fetch(ids=ids)
+        return {
+            vid: {"values": list(v.values or []), "metadata": v.metadata or {}}
+            for vid, v in result.vectors.items()
+        }
+
+
+class LocalVectorStore:
+    """
+    Exact cosine search over a NumPy matrix of unit-normalized vectors.
+
+    On disk (<dir>):
+    - CURRENT          number of the live snapshot
+    - v<N>/            snapshot: vectors.npy (float32, rows aligned with ids) and
+                       meta.json ({"ids": [...], "metadata": [...]})
+    - v<N>.wal         write-ahead log of upserts / deletes since snapshot N, one JSON line each
+    - .lock            fcntl lock: shared for reads, exclusive for writes
+
+    Upserts append to the log, so a write costs its own rows rather than a copy
+    of the whole index. Once the log holds LOCAL_VECTOR_COMPACT_ROWS rows it is
+    folded into a new snapshot directory, which goes live with one os.replace of
+    CURRENT. Snapshots are memory-mapped on load; every process replays the log
+    rows it has not seen yet before each read or write.
+    """
+
+    def __init__(self, directory: str = LOCAL_VECTOR_DIR, dimension: int = EMBEDDING_DIMENSION):
+        self.directory = directory
+        self.dimension = dimension
+        self._current_path = os.path.join(directory, "CURRENT")
+        self._lock_path = os.path.join(directory, ".lock")
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+
+        self._version = None
+        self._load()
+
+    # --- disk layout ---------------------------------------------------------
+
+    def _snapshot_dir(self, version: int) -> str:
+        # Version 0 is the original single-directory layout (vectors.npy + meta.json in <dir>)
+        return self.directory if version == 0 else os.path.join(self.directory, f"v{version}")
+
+    def _wal_path(self, version: int) -> str:
+        return os.path.join(self.directory, f"v{version}.wal")
+
+    def _read_current(self) -> int:
+        try:
+            with open(self._current_path) as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Cross-process lock on the store (a no-op where fcntl is unavailable)."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    # --- in-memory state -----------------------------------------------------
+
+    def _reset(self, version: int):
+        """Load snapshot `version` (memory-mapped) and forget any replayed log rows."""
+        self._version = version
+        self._wal_offset = 0
+        self._wal_rows = 0
+        self._extra = np.zeros((0, self.dimension), dtype=np.float32)
+        self._extra_rows = 0
+        self._ids: List[str] = []
+        self._metadata: List[Dict] = []
+        self._positions: Dict[str, int] = {}
+        # investor_id -> live rows (dict used as an ordered set)
+        self._by_investor: Dict[Optional[str], Dict[int, None]] = {}
+
+        snapshot = self._snapshot_dir(version)
+        meta_path = os.path.join(snapshot, "meta.json")
+        if os.path.exists(meta_path):
+            self._base = np.load(os.path.join(snapshot, "vectors.npy"), mmap_mode="r")
+            with open(meta_path) as f:
+                meta = json.load(f)
+            self._ids = meta["ids"]
+            self._metadata = meta["metadata"]
+        else:
+            self._base = np.zeros((0, self.dimension), dtype=np.float32)
+        for row, (vid, metadata) in enumerate(zip(self._ids, self._metadata)):
+            self._positions[vid] = row
+            self._by_investor.setdefault(metadata.get("investor_id"), {})[row] = None
+
+    def _append_row(self, vid: str, values: np.ndarray, metadata: Dict):
+        """Add a row for vid; an older row for the same id stops being live."""
+        old = self._positions.get(vid)
+        if old is not None:
+            self._by_investor.get(self._metadata[old].get("investor_id"), {}).pop(old, None)
+        if self._extra_rows == len(self._extra):
+            grown = np.zeros((max(64, 2 * len(self._extra)), self.dimension), dtype=np.float32)
+            grown[:self._extra_rows] = self._extra[:self._extra_rows]
+            self._extra = grown
+        self._extra[self._extra_rows] = values
+        self._extra_rows += 1
+
+        row = len(self._ids)
+        self._ids.append(vid)
+        self._metadata.append(metadata)
+        self._positions[vid] = row
+        self._by_investor.setdefault(metadata.get("investor_id"), {})[row] = None
+
+    def _remove_row(self, vid: str):
+        row = self._positions.pop(vid, None)
+        if row is not None:
+            self._by_investor.get(self._metadata[row].get("investor_id"), {}).pop(row, None)
+
+    def _replay(self):
+        """Apply log lines written since the last replay (complete lines only)."""
+        try:
+            with open(self._wal_path(self._version), "rb") as f:
+                f.seek(self._wal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            record = json.loads(line)
+            if record.get("op") == "delete":
+                self._remove_row(record["id"])
+            else:
+                values = np.frombuffer(base64.b64decode(record["values"]), dtype=np.float32)
+                self._append_row(record["id"], values, record.get("metadata") or {})
+            self._wal_rows += 1
+        self._wal_offset += end
+
+    def _load(self):
+        """Catch up with snapshots and log rows written by other processes."""
+        with self._file_lock(exclusive=False):
+            self._sync()
+
+    def _sync(self):
+        version = self._read_current()
+        if version != self._version:
+            self._reset(version)
+        self._replay()
+
+    def _vectors_at(self, rows: np.ndarray) -> np.ndarray:
+        base = len(self._base)
+        in_base = rows < base
+        out = np.empty((len(rows), self.dimension), dtype=np.float32)
+        out[in_base] = self._base[rows[in_base]]
+        out[~in_base] = self._extra[rows[~in_base] - base]
+        return out
+
+    def _compact(self):
+        """Fold the log into a new snapshot and switch CURRENT to it. Caller holds the exclusive lock."""
+        rows = np.asarray(sorted(self._positions.values()), dtype=np.int64)
+        version = self._version + 1
+        snapshot = self._snapshot_dir(version)
+        tmp = f"{snapshot}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        np.save(os.path.join(tmp, "vectors.npy"), self._vectors_at(rows))
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump({"ids": [self._ids[r] for r in rows], "metadata": [self._metadata[r] for r in rows]}, f)
+        shutil.rmtree(snapshot, ignore_errors=True)
+        os.replace(tmp, snapshot)
+        with open(f"{self._current_path}.tmp", "w") as f:
+            f.write(str(version))
+        os.replace(f"{self._current_path}.tmp", self._current_path)
+
+        # Readers mapping the old snapshot keep their (unlinked) copy until they reload
+        old = self._version
+        if old == 0:
+            for name in ("vectors.npy", "meta.json"):
+                if os.path.exists(os.path.join(self.directory, name)):
+                    os.remove(os.path.join(self.directory, name))
+        else:
+            shutil.rmtree(self._snapshot_dir(old), ignore_errors=True)
+        if os.path.exists(self._wal_path(old)):
+            os.remove(self._wal_path(old))
+        self._reset(version)
+
+    # --- public API ----------------------------------------------------------
+
+    def upsert(self, vectors: List[Dict]):
+        if not vectors:
+            return
+        lines = []
+        for v in vectors:
+            values = np.asarray(v["values"], dtype=np.float32)
+            norm = np.linalg.norm(values)
+            values = values / norm if norm else values
+            lines.append(json.dumps({
+                "id": v["id"],
+                "values": base64.b64encode(values.tobytes()).decode("ascii"),
+                "metadata": v.get("metadata") or {},
+            }))
+
+        self._append_log(lines)
+
+    def delete(self, ids: List[str]):
+        """Remove vectors by id (unknown ids are ignored)."""
+        if ids:
+            self._append_log([json.dumps({"op": "delete", "id": vid}) for vid in ids])
+
+    def _append_log(self, lines: List[str]):
+        with self._lock, self._file_lock(exclusive=True):
+            self._sync()
+            with open(self._wal_path(self._version), "ab") as f:
+                # Drop a torn line left by a writer that died mid-append
+                f.truncate(self._wal_offset)
+                f.write(("\n".join(lines) + "\n").encode("utf-8"))
+            self._replay()
+            if self._wal_rows >= LOCAL_VECTOR_COMPACT_ROWS:
+                self._compact()
+
+    def ids(self) -> List[str]:
+        """Ids of all live vectors."""
+        with self._lock:
+            self._load()
+            return list(self._positions)
+
+    def compact(self):
+        """Fold the write-ahead log into a new snapshot now."""
+        with self._lock, self._file_lock(exclusive=True):
+            self._sync()
+            if self._wal_rows:
+                self._compact()
+
+    def size(self) -> int:
+        """Number of live vectors."""
+        with self._lock:
+            self._load()
+            return len(self._positions)
+
+    def query(self, vector: List[float], top_k: int, investor_id: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            self._load()
+            rows = list(self._by_investor.get(investor_id, {})) if investor_id else list(self._positions.values())
+            if not rows or top_k <= 0:
+                return []
+
+            q = np.asarray(vector, dtype=np.float32)
+            norm = np.linalg.norm(q)
+            q = q / norm if norm else q
+
+            candidates = np.asarray(rows, dtype=np.int64)
+            scores = self._vectors_at(candidates) @ q
+            k = min(top_k, len(candidates))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [
+                {
+                    "id": self._ids[candidates[i]],
+                    "score": float(scores[i]),
+                    "metadata": self._metadata[candidates[i]],
+                }
+                for i in best
+            ]
+
+    def fetch(self, ids: List[str]) -> Dict[str, Dict]:
+        with self._lock:
+            self._load()
+            found = [vid for vid in ids if vid in self._positions]
+            if not found:
+                return {}
+            rows = np.asarray([self._positions[vid] for vid in found], dtype=np.int64)
+            return {
+                vid: {"values": values.tolist(), "metadata": self._metadata[row]}
+                for vid, row, values in zip(found, rows, self._vectors_at(rows))
+            }
+
+
+def get_vector_store(backend: Optional[str] = None):
+    """Return the process-wide store for `backend` ("pinecone" or "local")."""
+    backend = backend or VECTOR_STORE
+    with _stores_lock:
+        if backend not in _stores:
+            if backend == "local":
+                _stores[backend] = LocalVectorStore()
+            elif backend == "pinecone":
+                _stores[backend] = PineconeStore(os.getenv("PINECONE_INDEX", "sago-investors"))
+            else:
+                raise ValueError(f"Unknown vector store backend: {backend}")
+        return _stores[backend]
@@ -0,0 +1,14 @@
+# Pipeline stages module
+from .claims import parse_claims, merge_claims, has_figures
+from .chunking import chunk_pages
+from .compaction import compact_pages, claim_density
+from .tokens import count_tokens
+from .verification import (
+    StreamingVerification,
+    format_verification_report,
+    parse_status,
+    extract_urls,
+    VERIFICATION_STATUSES
+)
+from .records import build_claim_records, count_metric_keywords, parse_metric, parse_figures, parse_verification_report
+from .scheduler import StageGraph
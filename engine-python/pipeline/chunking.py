@@ -0,0 +1,56 @@
+"""
+Deck Chunking
+Splits extracted deck text into Scribe-sized chunks along page (slide)
+boundaries so every part of a long deck is read, and the chunks can be
+processed concurrently. Chunk sizes are measured in tokens.
+"""
+import re
+from typing import List
+
+from .tokens import count_tokens, split_tokens
+
+
+def _split_oversized(text: str, max_tokens: int) -> List[str]:
+    """Split one page that is too long on paragraph, then line, then hard token boundaries."""
+    for separator in ("\n\n", "\n"):
+        pieces = [p for p in text.split(separator) if p.strip()]
+        if len(pieces) > 1:
+            return _pack(pieces, max_tokens, separator)
+    return split_tokens(text, max_tokens)
+
+
+def _pack(pieces: List[str], max_tokens: int, separator: str = "\n\n") -> List[str]:
+    """Greedily pack consecutive pieces into chunks of at most max_tokens."""
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        tokens = count_tokens(piece)
+        if tokens > max_tokens:
+            if current:
+                chunks.append(separator.join(current))
+                current, size = [], 0
+            chunks.extend(_split_oversized(piece, max_tokens))
+            continue
+        # A separator costs about one token
+        if current and size + 1 + tokens > max_tokens:
+            chunks.append(separator.join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += tokens + (1 if size else 0)
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+
+def chunk_pages(pages: List[str], max_tokens: int) -> List[str]:
+    """
+    Group consecutive pages into chunks of at most max_tokens without splitting
+    a page unless it is larger than a chunk by itself. Whitespace runs are
+    collapsed first so the budget is spent on content.
+    """
+    cleaned = [re.sub(r"[ \t]+", " ", page).strip() for page in pages]
+    return _pack(cleaned, max_tokens)
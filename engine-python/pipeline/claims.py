@@ -0,0 +1,56 @@
+"""
+Claim Parsing
+Turns the Scribe's free-text output into a structured list of claims.
+"""
+import re
+from typing import List
+
+# Bullets ("-", "*", "•") and numbered items ("1.", "2)")
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_MARKDOWN = re.compile(r"[*_`]+")
+
+
+def parse_claims(text: str) -> List[str]:
+    """
+    Parse a bulleted / numbered list of claims into plain strings, in order.
+    Headings, intro lines and duplicates are dropped. If the text has no list
+    markers at all, every non-empty line is treated as a claim.
+    """
+    if not text:
+        return []
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    bulleted = [line for line in lines if _BULLET.match(line)]
+    candidates = bulleted or lines
+
+    claims = []
+    seen = set()
+    for line in candidates:
+        claim = _MARKDOWN.sub("", _BULLET.sub("", line)).strip()
+        # Section headings ("Financials:") and fragments are not checkable claims
+        if len(claim) < 10 or claim.endswith(":"):
+            continue
+        key = re.sub(r"\s+", " ", claim.lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        claims.append(claim)
+    return claims
+
+
+def merge_claims(claim_lists: List[List[str]]) -> List[str]:
+    """Concatenate per-chunk claim lists in chunk order, dropping duplicates."""
+    merged = []
+    seen = set()
+    for claims in claim_lists:
+        for claim in claims:
+            key = re.sub(r"\s+", " ", claim.lower()).strip(" .")
+            if key not in seen:
+                seen.add(key)
+                merged.append(claim)
+    return merged
+
+
+def has_figures(claim: str) -> bool:
+    """Whether a claim contains a number (what web search can confirm or contradict)."""
+    return bool(re.search(r"\d", claim))
@@ -0,0 +1,151 @@
+"""
+Deck Compaction
+Prepares extracted deck text for the Scribe within a token budget:
+- lines repeated across most slides (headers, footers, confidentiality
+  notices, page numbers) are dropped,
+- table rules, dot leaders, OCR debris and whitespace runs are collapsed,
+- if the deck is still over budget, slides are ranked by claim density
+  (figures, metric keywords and named entities per token) and the densest
+  fill the budget first. Kept slides stay in deck order.
+"""
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from .chunking import chunk_pages
+from .records import count_metric_keywords
+from .tokens import count_tokens
+
+# Slides larger than the whole budget are ranked in pieces of about this many tokens
+SECTION_TOKENS = 256
+
+# A line is boilerplate if it appears on at least this share of slides (and on 3+ slides)
+BOILERPLATE_MIN_SHARE = 0.5
+BOILERPLATE_MIN_PAGES = 3
+
+# Slide markers in plain-text decks ("--- PAGE 2: Traction ---", "Slide 3")
+_SLIDE_MARKER = re.compile(r"^\s*(?:-{2,}\s*)?(?:page|slide)\s+\d+\b.*$", re.IGNORECASE | re.MULTILINE)
+_RULE_LINE = re.compile(r"^[\s|+\-=_~*#.:·•─━│┃┼┌┐└┘├┤┬┴]*$")
+_DOT_LEADER = re.compile(r"(?:\s?[.·…]){4,}\s?")
+_PUNCT_RUN = re.compile(r"([-=_~*|])\1{2,}")
+_HYPHEN_BREAK = re.compile(r"(\w)-\n(\w)")
+# A bare page number ("7", "103") on a line of its own
+_PAGE_NUMBER = re.compile(r"\s*\d{1,4}\s*")
+
+_FIGURE = re.compile(
+    r"[$€£]\s?\d[\d,.]*|\d[\d,.]*\s?(?:%|x\b|[kmb]\b|bn\b|mm\b|million\b|billion\b|thousand\b)",
+    re.IGNORECASE,
+)
+_NUMBER = re.compile(r"\b\d[\d,.]*\b")
+# Multi-word proper names and acronyms (customers, investors, partners, ARR...)
+_ENTITY = re.compile(r"\b(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+|[A-Z]{2,})\b")
+
+
+def split_slides(text: str) -> List[str]:
+    """Split a plain-text deck on its slide markers (the whole text if it has fewer than two)."""
+    starts = [m.start() for m in _SLIDE_MARKER.finditer(text)]
+    if len(starts) < 2:
+        return [text]
+    slides = [text[:starts[0]]] if text[:starts[0]].strip() else []
+    slides += [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)])]
+    return slides
+
+
+def clean_page(text: str) -> str:
+    """Collapse whitespace and table / OCR artifacts, keeping one content line per line."""
+    text = _HYPHEN_BREAK.sub(r"\1\2", text)
+    lines = []
+    for line in text.splitlines():
+        if _RULE_LINE.match(line):
+            continue
+        line = _DOT_LEADER.sub(" ", line)
+        line = _PUNCT_RUN.sub(" ", line)
+        line = re.sub(r"\s*\|\s*", " | ", line)
+        line = re.sub(r"\s+", " ", line).strip(" |")
+        alnum = sum(ch.isalnum() for ch in line)
+        # OCR debris: stray marks, or lines that are mostly symbols
+        if alnum < 2 or alnum < 0.4 * len(line):
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _line_key(line: str) -> str:
+    # Page numbers and dates differ between otherwise identical footers; data lines
+    # only count as repeats when identical ("Revenue: $1M" vs "Revenue: $2M", "1 | 2")
+    line = line.lower()
+    if _PAGE_NUMBER.fullmatch(line):
+        return "#"
+    if _FIGURE.search(line) or not re.search(r"[a-z]", line):
+        return line
+    return re.sub(r"\d+", "#", line)
+
+
+def strip_boilerplate(pages: List[str]) -> List[str]:
+    """Drop lines that repeat across most pages (headers, footers, page numbers)."""
+    if len(pages) < BOILERPLATE_MIN_PAGES:
+        return pages
+    seen = Counter()
+    for page in pages:
+        seen.update({_line_key(line) for line in page.splitlines()})
+    threshold = max(BOILERPLATE_MIN_PAGES, BOILERPLATE_MIN_SHARE * len(pages))
+    repeated = {key for key, count in seen.items() if count >= threshold}
+    if not repeated:
+        return pages
+    return ["\n".join(line for line in page.splitlines() if _line_key(line) not in repeated) for page in pages]
+
+
+def claim_density(text: str, tokens: int = None) -> float:
+    """Figures, metric keywords and named entities per 100 tokens."""
+    tokens = tokens if tokens is not None else count_tokens(text)
+    if not tokens:
+        return 0.0
+    figures = len(_FIGURE.findall(text))
+    numbers = len(_NUMBER.findall(text))
+    metrics = count_metric_keywords(text)
+    entities = len(_ENTITY.findall(text))
+    score = 3 * figures + (numbers - figures if numbers > figures else 0) + 2 * metrics + entities
+    # Very short slides (title cards) should not win on ratio alone
+    return 100 * score / max(tokens, 40)
+
+
+def compact_pages(pages: List[str], max_tokens: int) -> Tuple[List[str], Dict]:
+    """
+    Clean the deck's pages and fit them into max_tokens (0 = no limit), keeping
+    the most claim-dense slides. Returns (pages in deck order, stats) where
+    stats has pages_in / pages_out / tokens_in / tokens_out.
+    """
+    # Plain-text decks arrive as one page; PDFs are already split per slide
+    slides = split_slides(pages[0]) if len(pages) == 1 else list(pages)
+    tokens_in = sum(count_tokens(slide) for slide in slides)
+
+    cleaned = [slide for slide in strip_boilerplate([clean_page(slide) for slide in slides]) if slide.strip()]
+    if max_tokens > 0:
+        # Slides bigger than the whole budget (e.g. a plain-text deck) compete section by section
+        units = []
+        for slide in cleaned:
+            if count_tokens(slide) > max_tokens:
+                units.extend(chunk_pages([slide], min(SECTION_TOKENS, max_tokens)))
+            else:
+                units.append(slide)
+        cleaned = units
+    sizes = [count_tokens(slide) for slide in cleaned]
+
+    kept = list(range(len(cleaned)))
+    if max_tokens > 0 and sum(sizes) > max_tokens:
+        ranked = sorted(kept, key=lambda i: claim_density(cleaned[i], sizes[i]), reverse=True)
+        kept, used = [], 0
+        for i in ranked:
+            if used + sizes[i] <= max_tokens:
+                kept.append(i)
+                used += sizes[i]
+        kept.sort()
+
+    result = [cleaned[i] for i in kept]
+    stats = {
+        "pages_in": len(slides),
+        "pages_out": len(result),
+        "tokens_in": tokens_in,
+        "tokens_out": sum(sizes[i] for i in kept),
+    }
+    return result, stats
@@ -0,0 +1,150 @@
+"""
+Claim Records
+Turns the claims list and verification report into typed rows for the
+claims / claim_verifications tables, so they can be queried without
+parsing report text.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .claims import parse_claims
+from .verification import parse_status, extract_urls
+
+# Metric keywords, checked in order (first match wins)
+_METRICS = [
+    ("tam", r"\b(tam|total addressable market)\b"),
+    ("sam", r"\b(sam|serviceable addressable market)\b"),
+    ("som", r"\b(som|serviceable obtainable market)\b"),
+    ("market_size", r"\bmarket\b"),
+    ("burn", r"\b(burn|runway)\b"),
+    ("arr", r"\b(arr|annual recurring revenue)\b"),
+    ("mrr", r"\b(mrr|monthly recurring revenue)\b"),
+    ("revenue", r"\b(revenue|sales|gmv)\b"),
+    ("growth", r"\b(growth|grew|growing|yoy|mom|cagr)\b"),
+    ("valuation", r"\bvaluation\b"),
+    ("funding", r"\b(raise|raising|raised|funding|round|seed|series [a-e])\b"),
+    ("margin", r"\bmargins?\b"),
+    ("customers", r"\b(customers|clients|users|merchants|subscribers|downloads)\b"),
+    ("team", r"\b(employees|team|headcount)\b"),
+]
+_METRICS = [(name, re.compile(pattern, re.IGNORECASE)) for name, pattern in _METRICS]
+_GROWTH = dict(_METRICS)["growth"]
+
+_MULTIPLIERS = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "mm": 1e6, "mn": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+    "t": 1e12, "trillion": 1e12,
+}
+# A whole number with its currency and magnitude - never part of a word or a
+# longer number (the "2B" of "B2B", the "1" of "10x" or "1.5x")
+_NUMBER = re.compile(
+    r"(?<![\w.])(?P<currency>[$€£])?\s?(?P<number>\d+(?:,\d{3})*(?:\.\d+)?)\s?"
+    r"(?P<suffix>%|trillion|billion|million|thousand|bn|mm|mn|[kmbtx])?(?![a-z\d]|\.\d)",
+    re.IGNORECASE,
+)
+_CURRENCIES = {"$": "USD", "€": "EUR", "£": "GBP"}
+
+_SECTION = re.compile(r"^### Claim \d+\s*$", re.MULTILINE)
+_CLAIM_LINE = re.compile(r"^- Claim:\s*(.+)$", re.MULTILINE)
+_EVIDENCE = re.compile(r"Evidence:\s*(.+?)(?:\n\s*[-*]?\s*\**Source|\Z)", re.IGNORECASE | re.DOTALL)
+
+
+def count_metric_keywords(text: str) -> int:
+    """How many metric keywords (TAM, ARR, revenue, growth, customers...) a text mentions."""
+    return sum(len(pattern.findall(text)) for _, pattern in _METRICS)
+
+
+def parse_metric(claim: str) -> Tuple[Optional[str], Optional[float], Optional[str]]:
+    """
+    The metric a claim is about and its headline figure, e.g.
+    "TAM of $12.5B" -> ("tam", 12500000000.0, "USD"). Unknown parts are None.
+    """
+    metric = next((name for name, pattern in _METRICS if pattern.search(claim)), None)
+
+    # Prefer a figure with a currency, percentage or magnitude over a bare year / count
+    best = None
+    for match in _NUMBER.finditer(claim):
+        number = float(match.group("number").replace(",", ""))
+        suffix = (match.group("suffix") or "").lower()
+        currency = match.group("currency")
+        if suffix in ("%", "x"):
+            candidate = (number, suffix)
+        elif currency:
+            candidate = (number * _MULTIPLIERS.get(suffix, 1), _CURRENCIES[currency])
+        elif suffix:
+            candidate = (number * _MULTIPLIERS[suffix], None)
+        elif best is None and not (1900 <= number <= 2100 and number.is_integer()):
+            best = (number, None)
+            continue
+        else:
+            continue
+        best = candidate
+        break
+
+    if best is None:
+        return metric, None, None
+    # "Revenue grew 300%" is a growth rate, not a revenue figure
+    if best[1] == "%" and _GROWTH.search(claim):
+        metric = "growth"
+    return metric, best[0], best[1]
+
+
+def parse_figures(claim: str) -> List[str]:
+    """
+    Every figure in a claim in a canonical form, sorted: "USD 10000000000" for
+    "$10B" / "$10 billion", "40%", "3x", "year 2024", bare numbers as values.
+    Two claims state the same facts only if their figures are equal.
+    """
+    figures = []
+    for match in _NUMBER.finditer(claim):
+        number = float(match.group("number").replace(",", ""))
+        suffix = (match.group("suffix") or "").lower()
+        currency = match.group("currency")
+        if suffix in ("%", "x"):
+            figures.append(f"{number:g}{suffix}")
+        elif currency:
+            figures.append(f"{_CURRENCIES[currency]} {number * _MULTIPLIERS.get(suffix, 1):.12g}")
+        elif suffix:
+            figures.append(f"{number * _MULTIPLIERS[suffix]:.12g}")
+        elif 1900 <= number <= 2100 and number.is_integer():
+            figures.append(f"year {number:.0f}")
+        else:
+            figures.append(f"{number:g}")
+    return sorted(figures)
+
+
+def parse_verification_report(report: str) -> List[Dict]:
+    """Inverse of format_verification_report: [{"claim", "result"}] in report order."""
+    results = []
+    for section in _SECTION.split(report or "")[1:]:
+        match = _CLAIM_LINE.search(section)
+        if not match:
+            continue
+        results.append({"claim": match.group(1).strip(), "result": section[match.end():].strip()})
+    return results
+
+
+def build_claim_records(claims: str, verification: str) -> List[Dict]:
+    """
+    One record per extracted claim, in order, with its parsed metric / value and,
+    for verified claims, a "verification" dict (status, evidence, source_urls).
+    """
+    verified = {
+        item["claim"]: item["result"] for item in parse_verification_report(verification)
+    }
+
+    records = []
+    for index, claim in enumerate(parse_claims(claims)):
+        metric, value, unit = parse_metric(claim)
+        record = {"index": index, "text": claim, "metric": metric, "value": value, "unit": unit}
+        result = verified.get(claim)
+        if result is not None:
+            evidence = _EVIDENCE.search(result)
+            record["verification"] = {
+                "status": parse_status(result) or "UNVERIFIED",
+                "evidence": evidence.group(1).strip() if evidence else None,
+                "source_urls": extract_urls(result),
+            }
+        records.append(record)
+    return records
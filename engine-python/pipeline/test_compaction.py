@@ -0,0 +1,40 @@
+"""Tests for deck compaction (boilerplate stripping and density ranking)."""
+from pipeline.compaction import claim_density, compact_pages, strip_boilerplate
+
+
+def deck(*bodies):
+    return [f"Acme Corp - Confidential\n{body}\n{i}" for i, body in enumerate(bodies, start=9)]
+
+
+def test_strip_boilerplate_drops_repeated_footers_and_page_numbers():
+    pages = deck("ARR of $2.4M", "Team of 12 engineers", "Seed round of $3M", "Partnership with Stripe")
+    assert strip_boilerplate(pages) == [
+        "ARR of $2.4M", "Team of 12 engineers", "Seed round of $3M", "Partnership with Stripe",
+    ]
+
+
+def test_strip_boilerplate_keeps_differing_data_lines():
+    pages = [f"Revenue: ${n}M\nSlide body {n}" for n in range(1, 5)]
+    assert [page.splitlines()[0] for page in strip_boilerplate(pages)] == [
+        "Revenue: $1M", "Revenue: $2M", "Revenue: $3M", "Revenue: $4M",
+    ]
+
+
+def test_strip_boilerplate_needs_enough_pages():
+    pages = ["Footer\n12", "Footer\n13"]
+    assert strip_boilerplate(pages) == pages
+
+
+def test_claim_density_prefers_figures_and_metrics():
+    assert claim_density("ARR grew 40% to $2.4M with 3,000 customers") > claim_density(
+        "We are a passionate team building the future of commerce together"
+    )
+
+
+def test_compact_pages_keeps_densest_slides_in_order():
+    filler = "We believe in building delightful products for everyone. " * 8
+    pages = [filler, "TAM of $10B and ARR of $2.4M growing 40% MoM", filler, "3,000 paying customers, 120% NRR"]
+    kept, stats = compact_pages(pages, 60)
+    assert kept == [pages[1], pages[3]]
+    assert stats["pages_in"] == 4 and stats["pages_out"] == 2
+    assert stats["tokens_out"] <= 60 < stats["tokens_in"]
@@ -0,0 +1,102 @@
+"""Tests for claim figure parsing and claim record building."""
+import pytest
+
+from pipeline.records import build_claim_records, parse_figures, parse_metric, parse_verification_report
+from pipeline.verification import format_verification_report
+
+
+@pytest.mark.parametrize("claim, expected", [
+    ("TAM of $10B", ("tam", 10e9, "USD")),
+    ("TAM of $10 billion", ("tam", 10e9, "USD")),
+    ("Total addressable market of $12.5bn", ("tam", 12.5e9, "USD")),
+    ("ARR of $2.4M", ("arr", 2.4e6, "USD")),
+    ("MRR reached $150k", ("mrr", 150e3, "USD")),
+    ("Raised €3 million seed round", ("funding", 3e6, "EUR")),
+    ("Revenue of £1,200,000 in 2023", ("revenue", 1.2e6, "GBP")),
+    ("Gross margins of 72%", ("margin", 72.0, "%")),
+    ("Revenue grew 40% MoM", ("growth", 40.0, "%")),
+    ("10x growth since launch", ("growth", 10.0, "x")),
+    ("3,000 paying customers", ("customers", 3000.0, None)),
+    ("2 million users", ("customers", 2e6, None)),
+])
+def test_parse_metric(claim, expected):
+    metric, value, unit = parse_metric(claim)
+    assert (metric, unit) == (expected[0], expected[2])
+    assert value == pytest.approx(expected[1])
+
+
+def test_parse_metric_prefers_currency_over_year():
+    assert parse_metric("In 2021 the company booked $5M in sales") == ("revenue", 5e6, "USD")
+
+
+def test_parse_metric_ignores_years_and_words_with_digits():
+    assert parse_metric("B2B platform founded in 2019") == (None, None, None)
+    assert parse_metric("Launched in Q3 2024 with a strong team") == ("team", None, None)
+
+
+def test_parse_metric_range_takes_first_figure():
+    assert parse_metric("Market of $5B-$10B") == ("market_size", 5e9, "USD")
+    assert parse_metric("Burn of $200k to $300k per month") == ("burn", 200e3, "USD")
+
+
+def test_parse_metric_without_figures():
+    assert parse_metric("Partnership with Stripe") == (None, None, None)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("TAM is $10B", "The TAM is $10 billion"),
+    ("ARR of $2,500,000", "ARR of $2.5M"),
+    ("40% MoM growth in 2024", "Growth in 2024 was 40% MoM"),
+])
+def test_parse_figures_equal_for_same_facts(a, b):
+    assert parse_figures(a) == parse_figures(b)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("TAM is $10B", "TAM is $100B"),
+    ("40% MoM growth", "4% MoM growth"),
+    ("ARR of $2M in 2023", "ARR of $2M in 2024"),
+    ("Revenue of $5M", "Revenue of €5M"),
+    ("3x growth", "30x growth"),
+])
+def test_parse_figures_differ_for_different_facts(a, b):
+    assert parse_figures(a) != parse_figures(b)
+
+
+def test_parse_figures_canonical_forms():
+    assert parse_figures("$1.5M ARR, 40% margin, 3x growth, 500 customers since 2020") == [
+        "3x", "40%", "500", "USD 1500000", "year 2020",
+    ]
+
+
+def test_build_claim_records_joins_verification():
+    claims = "- TAM of $10B\n- 3,000 paying customers\n- Partnership with Stripe"
+    verification = format_verification_report([
+        {
+            "claim": "TAM of $10B",
+            "result": "- Status: CONFIRMED\n- Evidence: Analyst reports agree.\n- Source: https://example.com/tam",
+        },
+        {"claim": "3,000 paying customers", "result": "- Status: unverified\n- Evidence: No sources."},
+    ])
+
+    records = build_claim_records(claims, verification)
+    assert [r["index"] for r in records] == [0, 1, 2]
+    assert records[0]["metric"] == "tam" and records[0]["value"] == 10e9 and records[0]["unit"] == "USD"
+    assert records[0]["verification"] == {
+        "status": "CONFIRMED",
+        "evidence": "Analyst reports agree.",
+        "source_urls": ["https://example.com/tam"],
+    }
+    assert records[1]["verification"]["status"] == "UNVERIFIED"
+    assert records[1]["verification"]["source_urls"] == []
+    assert "verification" not in records[2]
+
+
+def test_build_claim_records_without_verification():
+    records = build_claim_records("- ARR of $2.4M", "No verifiable claims were extracted from the deck.")
+    assert len(records) == 1 and "verification" not in records[0]
+
+
+def test_parse_verification_report_round_trip():
+    results = [{"claim": "TAM of $10B", "result": "- Status: CONFIRMED"}, {"claim": "ARR of $2M", "result": "x"}]
+    assert parse_verification_report(format_verification_report(results)) == results
@@ -0,0 +1,54 @@
+"""
+Token Counting
+Prompt budgets are measured in model tokens (tiktoken) rather than characters.
+When tiktoken or its encoding files are unavailable, counts fall back to the
+usual ~4 characters per token estimate.
+"""
+import os
+import threading
+from typing import List
+
+# gpt-4o family encoding; close enough for budgeting on other providers
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "o200k_base")
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+_encoding_lock = threading.Lock()
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """The shared tiktoken encoding, or None if it cannot be loaded (loaded once)."""
+    global _encoding, _encoding_loaded
+    if _encoding_loaded:
+        return _encoding
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+            except Exception as e:
+                print(f"[Tokens] tiktoken unavailable ({e}); estimating {CHARS_PER_TOKEN} chars per token")
+            _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in text."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def split_tokens(text: str, max_tokens: int) -> List[str]:
+    """Hard-split text into pieces of at most max_tokens tokens."""
+    encoding = _get_encoding()
+    if encoding is None:
+        size = max(1, max_tokens * CHARS_PER_TOKEN)
+        return [text[start:start + size] for start in range(0, len(text), size)]
+    ids = encoding.encode(text, disallowed_special=())
+    return [encoding.decode(ids[start:start + max_tokens]) for start in range(0, len(ids), max(1, max_tokens))]
+
@@ -0,0 +1,108 @@
+"""
+Claim Verification Stage
+Verifies claims concurrently with ClaimVerifierTool as the Scribe extracts
+them and merges the results into a single report in selection order.
+"""
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from metrics import attribute_to, propagate
+from .claims import has_figures
+
+VERIFICATION_STATUSES = ("CONFIRMED", "CONTRADICTED", "UNVERIFIED")
+
+_STATUS = re.compile(r"Status:\W*(CONFIRMED|CONTRADICTED|UNVERIFIED)", re.IGNORECASE)
+_URL = re.compile(r"https?://[^\s<>()\[\]\"']+")
+
+
+def parse_status(text: str) -> Optional[str]:
+    """The first CONFIRMED / CONTRADICTED / UNVERIFIED status in a verification result."""
+    match = _STATUS.search(text or "")
+    return match.group(1).upper() if match else None
+
+
+def extract_urls(text: str) -> List[str]:
+    """Source URLs cited in a verification result, in order, without duplicates."""
+    urls = []
+    for url in _URL.findall(text or ""):
+        url = url.rstrip(".,;:*")
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+
+def _verify_one(verifier, claim: str) -> Dict:
+    try:
+        result = verifier(claim)
+    except Exception as e:
+        result = f"- Status: UNVERIFIED\n- Evidence: Verification failed: {e}"
+    return {"claim": claim, "result": result}
+
+
+class StreamingVerification:
+    """
+    Verifies claims while the Scribe is still extracting. Claims are offered in
+    deck order as each chunk is parsed; claims with figures start verifying
+    straight away, and claims without figures only fill whatever budget is left
+    once extraction is done. Up to `limit` claims are verified: those with
+    figures first, each group in deck order.
+    """
+
+    def __init__(self, limit: int, max_workers: int = 4, verifier: Optional[Callable[[str], str]] = None):
+        if verifier is None:
+            from tools.verification_tool import ClaimVerifierTool
+            verifier = ClaimVerifierTool()._run
+        self.limit = limit
+        self.selected: List[str] = []
+        self._deferred: List[str] = []
+        self._futures = []
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="verify")
+        # Verifier LLM usage is counted under "verification" whichever stage offers the claim
+        with attribute_to("verification"):
+            self._verify = propagate(lambda claim: _verify_one(verifier, claim))
+
+    def _submit(self, claim: str):
+        self.selected.append(claim)
+        self._futures.append(self._pool.submit(self._verify, claim))
+
+    def offer(self, claims: List[str]):
+        """Add newly extracted claims (in deck order)."""
+        with self._lock:
+            for claim in claims:
+                if has_figures(claim):
+                    if len(self.selected) < self.limit:
+                        self._submit(claim)
+                else:
+                    self._deferred.append(claim)
+
+    def finish(self) -> List[Dict]:
+        """Top up with claims without figures, wait, and return [{"claim", "result"}] in selection order."""
+        with self._lock:
+            for claim in self._deferred:
+                if len(self.selected) >= self.limit:
+                    break
+                self._submit(claim)
+            self._deferred = []
+            futures = list(self._futures)
+        try:
+            return [future.result() for future in futures]
+        finally:
+            self._pool.shutdown(wait=False)
+
+    def cancel(self):
+        """Drop claims not yet started (used when the job fails)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def format_verification_report(results: List[Dict]) -> str:
+    """Render verification results in the report format the Analyst expects."""
+    if not results:
+        return "No verifiable claims were extracted from the deck."
+
+    sections = []
+    for i, item in enumerate(results, 1):
+        sections.append(f"### Claim {i}\n- Claim: {item['claim']}\n{item['result'].strip()}")
+    return "\n\n".join(sections)
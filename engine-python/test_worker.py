@@ -0,0 +1,62 @@
+"""Tests for the worker's result-cached deck analysis."""
+import pytest
+
+pytest.importorskip("crewai")
+
+import worker
+from cache import CacheStore, ResultCache, bump_memo_version
+from cache import results as cache_results
+
+PROFILE = {"thesis": "Seed-stage fintech", "deal_breakers": [], "focus_areas": ["fintech"], "notes": ""}
+DECK = "ARR of $2.4M growing 40% MoM"
+
+
+class FakePipeline:
+    """Stands in for run_pipeline: the report cites the investor's current memos."""
+
+    def __init__(self):
+        self.memos = {}
+        self.runs = []
+
+    def __call__(self, investor_id, profile, deck_content, deck_path, stages=None, on_checkpoint=None):
+        self.runs.append(investor_id)
+        return "- ARR of $2.4M", "### Claim 1", f"report citing {self.memos.get(investor_id)}"
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    monkeypatch.setattr(worker, "result_cache", ResultCache(worker.PIPELINE_VERSION, path=path))
+    monkeypatch.setattr(cache_results, "_memo_versions", CacheStore("memo_versions", path=path))
+    fake = FakePipeline()
+    monkeypatch.setattr(worker, "run_pipeline", fake)
+    return fake
+
+
+def test_same_profile_different_memos_get_their_own_reports(pipeline):
+    pipeline.memos.update({"a": "memo A", "b": "memo B"})
+    assert worker.analyze_deck("a", PROFILE, DECK)[2] == "report citing memo A"
+    assert worker.analyze_deck("b", PROFILE, DECK)[2] == "report citing memo B"
+    assert worker.analyze_deck("a", PROFILE, DECK)[2] == "report citing memo A"
+    assert pipeline.runs == ["a", "b"]
+
+
+def test_memo_ingest_invalidates_cached_report(pipeline):
+    pipeline.memos["a"] = "memo A"
+    worker.analyze_deck("a", PROFILE, DECK)
+    pipeline.memos["a"] = "memo A, revised"
+    bump_memo_version("a")
+    assert worker.analyze_deck("a", PROFILE, DECK)[2] == "report citing memo A, revised"
+    assert pipeline.runs == ["a", "a"]
+
+
+def test_investors_without_sql_profile_do_not_share_reports(pipeline):
+    pipeline.memos.update({"a": "memo A", "b": "memo B"})
+    assert worker.analyze_deck("a", None, DECK)[2] == "report citing memo A"
+    assert worker.analyze_deck("b", None, DECK)[2] == "report citing memo B"
+
+
+def test_generic_report_is_shared(pipeline):
+    worker.analyze_deck(None, None, DECK)
+    worker.analyze_deck(None, None, DECK)
+    assert pipeline.runs == [None]
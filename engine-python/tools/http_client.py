@@ -0,0 +1,85 @@
+"""
+Shared HTTP clients for outbound tool calls
+One pooled, keep-alive session per process with connect/read timeouts and
+bounded, jittered retries. Used by the search tool and the OpenAI client in
+ClaimVerifierTool. Verification runs claims on threads, so these sync clients
+are shared across concurrent verifications.
+"""
+import os
+import threading
+from typing import Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+
+# Transient statuses worth retrying (rate limiting and upstream hiccups)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_openai_clients: Dict[tuple, object] = {}
+
+
+def get_session() -> requests.Session:
+    """Process-wide pooled requests session with retries."""
+    global _session
+    with _lock:
+        if _session is None:
+            retry = Retry(
+                total=HTTP_MAX_RETRIES,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=None,  # our POSTs (search queries) are idempotent
+                backoff_factor=HTTP_BACKOFF_BASE,
+                backoff_jitter=HTTP_BACKOFF_BASE,
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def post_json(url: str, payload: Dict, headers: Optional[Dict] = None) -> Dict:
+    """POST a JSON body on the shared session and return the decoded response. Raises on HTTP errors."""
+    response = get_session().post(
+        url, json=payload, headers=headers, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def get_openai_client(base_url: Optional[str] = None, api_key: Optional[str] = None):
+    """OpenAI client sharing one pooled httpx connection pool per (base_url, api_key)."""
+    from openai import OpenAI
+
+    key = (base_url, api_key)
+    with _lock:
+        client = _openai_clients.get(key)
+        if client is None:
+            client = OpenAI(
+                base_url=base_url,
+                api_key=api_key,
+                timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+                max_retries=HTTP_MAX_RETRIES,
+                http_client=httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE
+                    )
+                ),
+            )
+            _openai_clients[key] = client
+        return client
+
@@ -3,9 +3,95 @@ Custom Search Tool with explicit URL extraction
 Wraps SerperDevTool to format results with clear URL citations
 """
 import os
+import re
+from typing import Dict, List
 from crewai.tools import BaseTool
 from pydantic import Field
-import requests
+
+from cache import CacheStore
+from metrics import record_event
+from tools.http_client import post_json
+
+# Overridable so the tool can be pointed at a local stub server
+SERPER_BASE_URL = os.getenv("SERPER_BASE_URL", "https://google.serper.dev")
+
+# Serper results are cached per normalized query, shared across jobs and workers
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", str(24 * 3600)))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "20000"))
+
+_search_cache = None
+
+
+def get_search_cache() -> CacheStore:
+    """Process-wide search result cache (created on first use)."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = CacheStore(
+            "serper_search", ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES
+        )
+    return _search_cache
+
+
+def search_cache_stats() -> Dict:
+    """Hit/miss/coalesced counters for the search cache."""
+    return get_search_cache().stats()
+
+
+def normalize_query(query: str) -> str:
+    """Case-, whitespace- and trailing-punctuation-insensitive form of a search query."""
+    query = re.sub(r"\s+", " ", query.strip().lower())
+    return query.strip(" .?!,;:\"'")
+
+
+def search_organic(query: str, num: int = 5) -> List[Dict]:
+    """
+    Return Serper's organic results for a query, served from the cache when possible.
+    Identical queries in flight at the same time share one request.
+    Raises on HTTP / API errors (errors are never cached).
+    """
+    api_key = os.getenv("SERPER_API_KEY")
+    if not api_key:
+        raise RuntimeError("SERPER_API_KEY not set")
+
+    def fetch():
+        record_event("search_call")
+        data = post_json(
+            f"{SERPER_BASE_URL}/search",
+            {"q": query, "num": num},
+            headers={
+                "X-API-KEY": api_key,
+                "Content-Type": "application/json"
+            },
+        )
+        return data.get("organic", [])[:num]
+
+    record_event("search_request")
+    return get_search_cache().get_or_compute(f"{num}:{normalize_query(query)}", fetch)
+
+
+def format_search_results(query: str, organic: List[Dict]) -> str:
+    """Render organic results with explicit URLs for an LLM to cite."""
+    results = []
+
+    for i, item in enumerate(organic[:5], 1):
+        title = item.get("title", "No title")
+        link = item.get("link", "No URL")
+        snippet = item.get("snippet", "No description")
+
+        results.append(
+            f"**Result {i}:**\n"
+            f"  Title: {title}\n"
+            f"  URL: {link}\n"
+            f"  Summary: {snippet}\n"
+        )
+
+    if not results:
+        return f"No search results found for: {query}"
+
+    output = f"=== SEARCH RESULTS FOR: {query} ===\n\n"
+    output += "\n".join(results)
+    output += "\n\n=== USE THE URLs ABOVE AS CITATIONS IN YOUR REPORT ==="
+    return output
 
 
 class SearchWithCitations(BaseTool):
@@ -19,45 +105,11 @@ class SearchWithCitations(BaseTool):
     
     def _run(self, query: str) -> str:
         """Execute search and return formatted results with URLs."""
-        api_key = os.getenv("SERPER_API_KEY")
-        if not api_key:
+        if not os.getenv("SERPER_API_KEY"):
             return "Error: SERPER_API_KEY not set"
         
         try:
-            response = requests.post(
-                "https://google.serper.dev/search",
-                headers={
-                    "X-API-KEY": api_key,
-                    "Content-Type": "application/json"
-                },
-                json={"q": query, "num": 5}
-            )
-            data = response.json()
-            
-            results = []
-            organic = data.get("organic", [])
-            
-            for i, item in enumerate(organic[:5], 1):
-                title = item.get("title", "No title")
-                link = item.get("link", "No URL")
-                snippet = item.get("snippet", "No description")
-                
-                results.append(
-                    f"**Result {i}:**\n"
-                    f"  Title: {title}\n"
-                    f"  URL: {link}\n"
-                    f"  Summary: {snippet}\n"
-                )
-            
-            if not results:
-                return f"No search results found for: {query}"
-            
-            output = f"=== SEARCH RESULTS FOR: {query} ===\n\n"
-            output += "\n".join(results)
-            output += "\n\n=== USE THE URLs ABOVE AS CITATIONS IN YOUR REPORT ==="
-            
-            return output
-            
+            return format_search_results(query, search_organic(query, num=5))
         except Exception as e:
             return f"Search failed: {str(e)}"
 
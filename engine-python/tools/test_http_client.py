@@ -0,0 +1,110 @@
+"""Tests for the shared HTTP session against a local stub server."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from tools import http_client
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.requests += 1
+            server.ports.add(self.client_address[1])
+            failures = server.failures
+            server.failures = max(0, failures - 1)
+        if server.delay:
+            time.sleep(server.delay)
+        status = 503 if failures else 200
+        payload = json.dumps({"echo": json.loads(body or b"{}")} if status == 200 else {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.ports = set()
+    server.failures = 0
+    server.delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_session(monkeypatch):
+    monkeypatch.setattr(http_client, "_session", None)
+    monkeypatch.setattr(http_client, "HTTP_BACKOFF_BASE", 0.01)
+    yield
+    if http_client._session is not None:
+        http_client._session.close()
+
+
+def test_post_json_round_trip(stub):
+    assert http_client.post_json(f"{stub.url}/search", {"q": "tam"}) == {"echo": {"q": "tam"}}
+
+
+def test_session_is_shared_and_keeps_connections_alive(stub):
+    for i in range(5):
+        http_client.post_json(f"{stub.url}/search", {"q": i})
+    assert http_client.get_session() is http_client.get_session()
+    assert stub.requests == 5
+    assert len(stub.ports) == 1
+
+
+def test_transient_errors_are_retried(stub, monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_MAX_RETRIES", 3)
+    stub.failures = 2
+    assert http_client.post_json(f"{stub.url}/search", {"q": "x"}) == {"echo": {"q": "x"}}
+    assert stub.requests == 3
+
+
+def test_retries_are_bounded(stub, monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_MAX_RETRIES", 2)
+    stub.failures = 10
+    with pytest.raises(requests.HTTPError):
+        http_client.post_json(f"{stub.url}/search", {"q": "x"})
+    assert stub.requests == 3
+
+
+def test_read_timeout(stub, monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_READ_TIMEOUT", 0.2)
+    monkeypatch.setattr(http_client, "HTTP_MAX_RETRIES", 0)
+    stub.delay = 1.0
+    started = time.perf_counter()
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http_client.post_json(f"{stub.url}/search", {"q": "slow"})
+    assert time.perf_counter() - started < 1.0
+
+
+def test_concurrent_calls_share_the_pool(stub):
+    stub.delay = 0.05
+    threads = [
+        threading.Thread(target=http_client.post_json, args=(f"{stub.url}/search", {"q": i}))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stub.requests == 8
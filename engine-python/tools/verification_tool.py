@@ -1,33 +1,45 @@
 import os
-from crewai_tools import SerperDevTool
+import threading
 from crewai.tools import BaseTool
-from openai import OpenAI
 from dotenv import load_dotenv
 
+from cache import get_fact_cache
+from llm import complete
+from metrics import record_event
+from pipeline.verification import parse_status, extract_urls
+from tools.search_tool import format_search_results, search_organic
+
 load_dotenv()
 
 # Shared log file path
 VERIFICATION_LOG = "outputs/verification_log.md"
 
+# Claims are verified concurrently; serialize appends to the shared log
+_log_lock = threading.Lock()
+
 class ClaimVerifierTool(BaseTool):
     name: str = "Verify Claim"
-    description: str = "Verifies a SINGLE claim using web search and returns a concise YES/NO summary. Input should be the claim string."
+    description: str = "Verifies a SINGLE claim using web search and returns a concise status with evidence and source URLs. Input should be the claim string."
 
     def _run(self, claim: str) -> str:
-        # 1. Search (using existing SerperDevTool logic)
-        search_tool = SerperDevTool(n_results=3)
+        # 0. Reuse a fresh verdict for the same (or a near-identical) claim
+        fact_cache = get_fact_cache()
+        cached = fact_cache.lookup(claim)
+        if cached:
+            record_event("cache_hit:facts")
+            return cached["result"]
+
+        # 1. Search (returns results with explicit source URLs). A failed search
+        # yields no verdict at all, so nothing is judged - or cached - from an error
         try:
-            search_result = search_tool.run(search_query=claim)
+            organic = search_organic(claim, num=5)
         except Exception as e:
-            return f"Error during search: {str(e)}"
+            return f"- Status: UNVERIFIED\n- Evidence: Search failed: {str(e)}"
+        search_result = format_search_results(claim, organic)
+        search_urls = {item["link"].rstrip("/") for item in organic if item.get("link")}
 
         # 2. Synthesize using separate LLM call (The "Chunking" trick)
         try:
-            client = OpenAI(
-                base_url=os.getenv("OPENAI_API_BASE"),
-                api_key=os.getenv("OPENAI_API_KEY")
-            )
-            
             prompt = f"""
             You are a strict fact checker. 
             
@@ -38,22 +50,25 @@ class ClaimVerifierTool(BaseTool):
             
             Task: Verify the claim based on the evidence.
             Output format:
-            - Status: [VERIFIED / FALSE / UNVERIFIED]
-            - Explanation: [Concise 1-sentence explanation citing the source if available]
+            - Status: [CONFIRMED / CONTRADICTED / UNVERIFIED]
+            - Evidence: [Concise 1-sentence explanation of what the sources say]
+            - Source: [The URL(s) from the search results that support the status]
             """
 
-            response = client.chat.completions.create(
-                model=os.getenv("OPENAI_MODEL_NAME"),
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            result = response.choices[0].message.content
+            result = complete("verifier", [
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt}
+            ])
             
             # 3. Log result to file (persistent record)
             self._log_verification(claim, result)
+
+            # 4. Share the verdict with later decks making the same claim, but only
+            # when it is backed by a source the search actually returned
+            status = parse_status(result)
+            sources = [url for url in extract_urls(result) if url.rstrip("/") in search_urls]
+            if status and sources:
+                fact_cache.store(claim, status, result, sources)
             
             return result
             
@@ -64,7 +79,7 @@ class ClaimVerifierTool(BaseTool):
         """Append verification result to shared log file."""
         try:
             os.makedirs(os.path.dirname(VERIFICATION_LOG), exist_ok=True)
-            with open(VERIFICATION_LOG, "a") as f:
+            with _log_lock, open(VERIFICATION_LOG, "a") as f:
                 f.write(f"## Claim: {claim}\n")
                 f.write(f"{result}\n\n---\n\n")
         except Exception:
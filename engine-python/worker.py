@@ -6,7 +6,11 @@ import os
 import sys
 import json
 import redis
+import signal
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,7 +19,22 @@ load_dotenv()
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db.models import SessionLocal, get_job_by_id, get_investor_by_id
-from db.models import update_job_started, update_job_completed, update_job_failed
+from db.models import update_job_started, update_job_completed, update_job_retrying, update_job_failed
+from db.models import update_job_checkpoint, get_job_checkpoint
+from db.models import insert_job_metrics, ACTIVE_JOB_STATUSES
+from jobqueue import JobQueue
+from cache import ResultCache, file_digest, text_digest, profile_digest, memo_version, get_fact_cache
+from tools.search_tool import search_cache_stats
+from extraction import extract_document, document_text, start_ocr_pool
+from pipeline import chunk_pages, merge_claims, parse_claims, StreamingVerification, format_verification_report
+from pipeline import compact_pages
+from pipeline import StageGraph
+from pipeline import build_claim_records
+from llm import stage_config
+from metrics import (
+    current_job, track_job, stage, propagate, record_crew_usage, record_event, record_job_status,
+    start_metrics_server, METRICS_PORT,
+)
 
 # Redis connection
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6380")
@@ -24,215 +43,647 @@ redis_client = redis.from_url(REDIS_URL)
 # Queue name
 JOB_QUEUE = "sago:jobs"
 
+# Number of analyses run concurrently by this process. Jobs spend nearly all of
+# their time waiting on LLM and search round-trips, so threads are sufficient.
+WORKER_CONCURRENCY = max(1, int(os.getenv("WORKER_CONCURRENCY", "4")))
 
-def run_analysis(job_id: str, investor_id: str = None, deck_content: str = None, deck_path: str = None):
-    """Run the CrewAI analysis pipeline."""
-    from crewai import Task, Crew, Process, LLM
+# BLPOP timeout in seconds; bounds how long a shutdown request can go unnoticed
+POLL_TIMEOUT = int(os.getenv("WORKER_POLL_TIMEOUT", "5"))
+
+# Reliable mode keeps each taken job in a per-worker processing list until it is
+# acked, so jobs held by a crashed worker are requeued by the reaper.
+RELIABLE_QUEUE = os.getenv("WORKER_RELIABLE_QUEUE", "true").lower() in ("1", "true", "yes")
+VISIBILITY_TIMEOUT = int(os.getenv("WORKER_VISIBILITY_TIMEOUT", "60"))
+HEARTBEAT_INTERVAL = max(1, VISIBILITY_TIMEOUT // 3)
+
+# Attempts per job (recorded in analysis_jobs.attempts) before it is marked failed
+MAX_JOB_ATTEMPTS = int(os.getenv("WORKER_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("WORKER_RETRY_BASE_DELAY", "30"))
+
+job_queue = JobQueue(
+    redis_client,
+    JOB_QUEUE,
+    worker_id=os.getenv("WORKER_ID"),
+    reliable=RELIABLE_QUEUE,
+    visibility_timeout=VISIBILITY_TIMEOUT,
+    retry_base_delay=RETRY_BASE_DELAY,
+)
+
+# Jobs for the same deck and investor are coalesced: the first one runs and the
+# duplicates get its result. The claim doubles as an idempotency window, so
+# duplicates arriving this many seconds after it completed are answered from it
+# too (0 disables). Waiting duplicates re-check every WORKER_DEDUP_RECHECK seconds.
+DEDUP_WINDOW = int(os.getenv("WORKER_DEDUP_WINDOW", "1800"))
+DEDUP_RECHECK = float(os.getenv("WORKER_DEDUP_RECHECK", "30"))
+
+# Load the embedding model and vector index at startup instead of on the first job
+PRELOAD_EMBEDDER = os.getenv("WORKER_PRELOAD_EMBEDDER", "true").lower() in ("1", "true", "yes")
+
+# Deck tokens sent to the Scribe per job after compaction (0 = no limit), tokens per
+# Scribe call (split on slide boundaries), and Scribe calls run at once
+SCRIBE_TOKEN_BUDGET = int(os.getenv("SCRIBE_TOKEN_BUDGET", "8000"))
+SCRIBE_CHUNK_TOKENS = int(os.getenv("SCRIBE_CHUNK_TOKENS", "1000"))
+SCRIBE_CONCURRENCY = int(os.getenv("SCRIBE_CONCURRENCY", "4"))
+
+# Past memos retrieved per job for the Analyst, and their token budget
+MEMO_TOP_K = int(os.getenv("MEMO_TOP_K", "5"))
+MEMO_CONTEXT_TOKENS = int(os.getenv("MEMO_CONTEXT_TOKENS", "800"))
+
+# Bump whenever agent prompts or task descriptions change so cached results are not reused
+PIPELINE_VERSION = "5"
+
+# Claims verified per deck, and how many verifications run at once
+VERIFY_MAX_CLAIMS = int(os.getenv("VERIFY_MAX_CLAIMS", "5"))
+VERIFY_CONCURRENCY = int(os.getenv("VERIFY_CONCURRENCY", "4"))
+
+# Shared across job slots; keyed on deck hash, pipeline version, investor, profile digest and memo version
+result_cache = ResultCache(PIPELINE_VERSION)
+
+# Set on SIGTERM/SIGINT: stop taking new jobs and drain the in-flight ones
+shutdown_event = threading.Event()
+
+# Each pool thread (job slot) owns one Session from SessionLocal
+_slot_state = threading.local()
+
+
+def get_slot_session():
+    """Return the DB session owned by the current job slot, creating it on first use."""
+    if getattr(_slot_state, "db", None) is None:
+        _slot_state.db = SessionLocal()
+    return _slot_state.db
+
+
+def get_investor_profile(db, investor_id: str) -> Optional[Dict]:
+    """Load an investor's profile fields from SQL (None if unknown)."""
+    if not investor_id:
+        return None
+    investor = get_investor_by_id(db, investor_id)
+    if not investor:
+        return None
+    print(f"[Worker] Loaded SQL context for investor {investor_id}")
+    return {
+        "thesis": investor.investment_thesis or "",
+        "deal_breakers": investor.deal_breakers or [],
+        "focus_areas": investor.focus_areas or [],
+        "notes": investor.notes or ""
+    }
+
+
+def load_investor_context(investor_id: str, profile: Dict) -> str:
+    """Build the Analyst's personalization context and keep the Vector DB profile in sync."""
+    from personalization.investor_memory import InvestorMemory, format_investor_focus
+
+    # Focus string comes straight from the SQL profile - no fetch round-trip
+    investor_context = format_investor_focus(profile) or ""
+
+    # Sync Profile to Vector DB (Lazy Sync) - skipped when the profile digest is unchanged
+    try:
+        memory = InvestorMemory()
+        memory.store_investor_profile(investor_id, profile)
+    except Exception as e:
+        print(f"[Worker] Vector DB warning: {e}. Using SQL context only.")
+
+    return investor_context
+
+
+def load_investor_focus(investor_id: str) -> Optional[str]:
+    """Investor focus from the Vector DB profile, for callers without a SQL profile (main.py)."""
+    try:
+        from personalization.investor_memory import InvestorMemory
+        return InvestorMemory().get_investor_focus(investor_id)
+    except Exception as e:
+        print(f"[Worker] Investor personalization not available: {e}")
+        return None
+
+
+def load_memo_context(investor_id: str, claims: str) -> Optional[str]:
+    """Retrieve the investor's past memos most relevant to the deck's claims, within the token budget."""
+    try:
+        from personalization.investor_memory import InvestorMemory, format_memo_context
+        memory = InvestorMemory()
+        memos = memory.get_relevant_memos(investor_id, parse_claims(claims), top_k=MEMO_TOP_K)
+        memo_context = format_memo_context(memos, max_tokens=MEMO_CONTEXT_TOKENS)
+        if memo_context:
+            print(f"[Worker] Using {len(memos)} past memos for personalization")
+        return memo_context
+    except Exception as e:
+        print(f"[Worker] Memo retrieval warning: {e}. Continuing without past memos.")
+        return None
+
+
+def extract_deck_content(deck_content: str = None, deck_path: str = None) -> Tuple[str, List[str]]:
+    """
+    Get the deck text from the file at deck_path (OCR for image-only pages) or the provided content.
+    Returns (full text, per-page texts). Raises if no text can be extracted, so the
+    job is retried / failed instead of analyzing (and caching) an error message.
+    """
+    # Priority 1: Read from deck_path if provided (direct file path)
+    if deck_path and os.path.exists(deck_path):
+        print(f"[Worker] Reading deck from path: {deck_path}")
+        try:
+            extracted = extract_document(deck_path)
+        except Exception as e:
+            raise RuntimeError(f"Could not read pitch deck {deck_path}: {e}") from e
+        deck_content = document_text(extracted)
+        pages = [p["text"] for p in extracted["pages"] if p["text"].strip()]
+        print(
+            f"[Worker] Extracted {len(deck_content)} chars from {len(extracted['pages'])} pages "
+            f"(method={extracted['method']}, {extracted['seconds']:.2f}s, cached={extracted['cached']})"
+        )
+        if not pages:
+            raise RuntimeError(
+                "Could not extract text from pitch deck. Please ensure the PDF is readable or contains text."
+            )
+        return deck_content, pages
+
+    # Priority 2: Use provided deck_content
+    if deck_content and deck_content.strip():
+        print(f"[Worker] Using provided deck_content ({len(deck_content)} chars)")
+        return deck_content, [deck_content]
+
+    # Priority 3: No content found
+    if deck_path:
+        raise RuntimeError(f"Pitch deck not found at {deck_path} and no deck_content given")
+    raise RuntimeError("Job has neither a deck_path nor deck_content")
+
+
+def _scribe_chunk(chunk: str) -> List[str]:
+    """Run the Scribe on one chunk of deck text. Returns the parsed claims."""
+    from crewai import Task, Crew, Process
     from agents.scribe import create_scribe_agent
-    from agents.researcher import create_researcher_agent
-    from agents.analyst import create_analyst_agent
-    
-    print(f"[Worker] Starting analysis for job {job_id}")
-    
-    # Configure Gemini LLM
-    gemini_api_key = os.getenv("GOOGLE_API_KEY")
-    if gemini_api_key and gemini_api_key != 'YOUR_GEMINI_API_KEY_HERE':
-        print("[Worker] Using Google Gemini API")
-        # CrewAI will use this via environment variable
-        os.environ["OPENAI_API_KEY"] = "NA"  # Disable OpenAI
+
+    scribe = create_scribe_agent()
+    task = Task(
+        description=f'''Extract key claims from the following pitch deck text.
+        Focus on the COMPANY being pitched (ignore sample dashboard data like example store names).
+        Extract specific numbers, metrics, market sizes, growth rates, and revenue figures about the company.
+        
+        PITCH DECK TEXT:
+        {chunk}''',
+        agent=scribe,
+        expected_output='A bulleted list of specific, verifiable claims about the company with numbers and dates.'
+    )
+    crew = Crew(agents=[scribe], tasks=[task], verbose=True, process=Process.sequential)
+    result = crew.kickoff()
+    record_crew_usage(result)
+    return parse_claims(str(task.output) if task.output else str(result))
+
+
+def compact_deck(pages: List[str]) -> List[str]:
+    """Strip boilerplate / artifacts and fit the deck into the Scribe token budget, densest slides first."""
+    compacted, stats = compact_pages(pages, SCRIBE_TOKEN_BUDGET)
+    record_event("deck_tokens:extracted", stats["tokens_in"])
+    record_event("deck_tokens:scribe", stats["tokens_out"])
+    print(
+        f"[Worker] Compaction: {stats['tokens_in']} -> {stats['tokens_out']} tokens, "
+        f"{stats['pages_out']}/{stats['pages_in']} slides kept (budget {SCRIBE_TOKEN_BUDGET or 'none'})"
+    )
+    # Never hand the Scribe nothing when the deck had text (e.g. all lines looked like noise)
+    return compacted or pages
+
+
+def run_scribe(pages: List[str], on_claims: Optional[Callable[[List[str]], None]] = None) -> str:
+    """
+    Run the Scribe over the whole deck: pages are packed into chunks, chunks are
+    processed concurrently, and the claims are merged in deck order without duplicates.
+    on_claims receives each chunk's new claims, in deck order, as soon as they are
+    known (so verification can start before the last chunk is done).
+    Returns the bulleted claims list.
+    """
+    chunks = chunk_pages(pages, SCRIBE_CHUNK_TOKENS)
+    print(f"[Worker] Scribe: {len(chunks)} chunk(s) from {len(pages)} page(s), up to {SCRIBE_CONCURRENCY} in parallel")
+    if not chunks:
+        return ""
+
+    claims: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(SCRIBE_CONCURRENCY, len(chunks)))) as pool:
+        futures = [pool.submit(propagate(_scribe_chunk), chunk) for chunk in chunks]
+        # Waiting in chunk order releases each chunk's claims as early as deck order allows
+        for future in futures:
+            merged = merge_claims([claims, future.result()])
+            new_claims, claims = merged[len(claims):], merged
+            if on_claims and new_claims:
+                on_claims(new_claims)
+
+    print(f"[Worker] Scribe extracted {len(claims)} unique claims")
+    return "\n".join(f"- {claim}" for claim in claims)
+
+
+def run_pipeline(
+    investor_id: Optional[str],
+    profile: Optional[Dict],
+    deck_content: Optional[str] = None,
+    deck_path: Optional[str] = None,
+    stages: Optional[Dict] = None,
+    on_checkpoint: Optional[Callable[..., None]] = None,
+) -> Tuple[str, str, str]:
+    """
+    Run the analysis as a stage graph. Returns (claims, verification, report).
+
+        extraction --> compaction --> scribe --+--> verification --+
+                                               +--> memo_context --+--> analyst
+        investor_context ------------------------------------------+
+
+    Extraction and the investor profile sync run side by side, claims are
+    verified as soon as the Scribe releases them, memo retrieval runs alongside
+    verification, and only the Analyst waits on everything.
+
+    `stages` holds results that are already known (result cache or an earlier
+    attempt's checkpoint): with "claims" extraction and the Scribe are skipped,
+    with "verification" as well only personalization and the Analyst run.
+    on_checkpoint(status, **results) is called as stages finish: "extracted",
+    "claims_ready" (claims=...) and "verified" (verification=...).
+    """
+    stages = stages or {}
+    checkpoint = on_checkpoint or (lambda status, **results: None)
+    graph = StageGraph("job")
+    graph.add(
+        "investor_context",
+        lambda: (
+            load_investor_context(investor_id, profile) if profile
+            else load_investor_focus(investor_id) if investor_id else None
+        ),
+        label="personalization",
+    )
+
+    verifier = None
+    if "verification" not in stages:
+        verifier = StreamingVerification(VERIFY_MAX_CLAIMS, max_workers=VERIFY_CONCURRENCY)
+
+    if "claims" in stages:
+        graph.add("claims", lambda: stages["claims"], label="cache")
     else:
-        print("[Worker] Warning: GOOGLE_API_KEY not set, falling back to local LLM")
-    
-    db = SessionLocal()
-    
+        def extract():
+            pages = extract_deck_content(deck_content, deck_path)[1]
+            checkpoint("extracted")
+            return pages
+
+        def scribe(compaction):
+            claims = run_scribe(compaction, on_claims=verifier.offer if verifier else None)
+            checkpoint("claims_ready", claims=claims)
+            return claims
+
+        graph.add("extraction", extract)
+        graph.add("compaction", lambda extraction: compact_deck(extraction), after=["extraction"])
+        graph.add("claims", scribe, after=["compaction"], label="scribe")
+
+    if "verification" in stages:
+        graph.add("verification", lambda: stages["verification"], label="cache")
+    else:
+        def verify(claims):
+            if "claims" in stages:
+                # Claims came from a checkpoint, so none were streamed in by the Scribe
+                verifier.offer(parse_claims(claims))
+            print(f"[Worker] Verifying {min(VERIFY_MAX_CLAIMS, len(parse_claims(claims)))} claims "
+                  f"with up to {VERIFY_CONCURRENCY} in parallel")
+            verification = format_verification_report(verifier.finish())
+            checkpoint("verified", verification=verification)
+            return verification
+
+        graph.add("verification", verify, after=["claims"])
+
+    graph.add(
+        "memo_context",
+        lambda claims: load_memo_context(investor_id, claims) if investor_id else None,
+        after=["claims"],
+        label="personalization",
+    )
+    graph.add(
+        "report",
+        lambda claims, verification, investor_context, memo_context: run_analyst(
+            claims, verification, investor_context, memo_context
+        ),
+        after=["claims", "verification", "investor_context", "memo_context"],
+        label="analyst",
+    )
+
     try:
-        # Mark job as started
-        update_job_started(db, job_id)
-        
-        # Get investor context for personalization
-        investor_context = None
-
-        if investor_id:
-            investor = get_investor_by_id(db, investor_id)
-            if investor:
-                # 1. Start with SQL data
-                parts = []
-                if investor.focus_areas:
-                    parts.append(f"Focus Areas: {', '.join(investor.focus_areas)}")
-                if investor.deal_breakers:
-                    parts.append(f"Deal Breakers: {', '.join(investor.deal_breakers)}")
-                if investor.investment_thesis:
-                    parts.append(f"Investment Thesis: {investor.investment_thesis}")
-                
-                sql_context = "\n".join(parts)
-                print(f"[Worker] Loaded SQL context for investor {investor_id}")
-                
-                # 2. Try Vector DB (Memory)
-                try:
-                    from personalization.investor_memory import InvestorMemory
-                    memory = InvestorMemory()
-                    
-                    # Sync Profile to Vector DB (Lazy Sync)
-                    profile = {
-                        "thesis": investor.investment_thesis or "",
-                        "deal_breakers": investor.deal_breakers or [],
-                        "focus_areas": investor.focus_areas or [],
-                        "notes": investor.notes or ""
-                    }
-                    memory.store_investor_profile(investor_id, profile)
-                    
-                    # Get Focus from Memory (retrieves formatted string)
-                    vector_context = memory.get_investor_focus(investor_id)
-                    
-                    if vector_context:
-                        investor_context = vector_context
-                        print(f"[Worker] Using Vector DB context for personalization")
-                    else:
-                        investor_context = sql_context
-                        
-                except Exception as e:
-                    print(f"[Worker] Vector DB warning: {e}. Falling back to SQL.")
-                    investor_context = sql_context
-        
-        # Debug: Log what we received
-        print(f"[Worker] DEBUG: deck_path = {deck_path}")
-        print(f"[Worker] DEBUG: deck_path exists = {os.path.exists(deck_path) if deck_path else 'N/A'}")
-        print(f"[Worker] DEBUG: deck_content length = {len(deck_content) if deck_content else 0}")
-        
-        # Priority 1: Read from deck_path if provided (direct file path)
-        if deck_path and os.path.exists(deck_path):
-            print(f"[Worker] Reading PDF from path: {deck_path}")
-            try:
-                from pypdf import PdfReader
-                reader = PdfReader(deck_path)
-                text_parts = []
-                for page in reader.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-                deck_content = "\n\n".join(text_parts)
-                print(f"[Worker] Extracted {len(deck_content)} chars from {len(reader.pages)} pages")
-                
-                # If no text extracted, try OCR
-                if len(deck_content.strip()) < 100:
-                    print("[Worker] No text found, attempting OCR...")
-                    try:
-                        from pdf2image import convert_from_path
-                        import pytesseract
-                        
-                        images = convert_from_path(deck_path, dpi=150)
-                        ocr_text_parts = []
-                        for i, img in enumerate(images):
-                            text = pytesseract.image_to_string(img)
-                            if text.strip():
-                                ocr_text_parts.append(text)
-                            print(f"[Worker] OCR page {i+1}: {len(text)} chars")
-                        
-                        if ocr_text_parts:
-                            deck_content = "\n\n".join(ocr_text_parts)
-                            print(f"[Worker] OCR extracted {len(deck_content)} chars from {len(images)} pages")
-                    except Exception as ocr_error:
-                        print(f"[Worker] OCR failed: {ocr_error}")
-                        
-            except Exception as e:
-                print(f"[Worker] PDF extraction from path failed: {e}")
-                # Try reading as text file
-                try:
-                    with open(deck_path, 'r', encoding='utf-8') as f:
-                        deck_content = f.read()
-                except:
-                    deck_content = f"Error reading file: {e}"
-        # Priority 2: Use provided deck_content
-        elif deck_content and deck_content.strip():
-            print(f"[Worker] Using provided deck_content ({len(deck_content)} chars)")
-        # Priority 3: No content found
-        else:
-            deck_content = "Error: Could not extract text from pitch deck. Please ensure the PDF is readable or contains text."
-            print(f"[Worker] Failed to extract content from {deck_path}")
-        
-        print(f"[Worker] Deck content preview: {deck_content[:200]}...")
+        results = graph.run()
+    except Exception:
+        if verifier:
+            verifier.cancel()
+        raise
+    return results["claims"], results["verification"], results["report"]
 
+
+def analyze_deck(
+    investor_id: Optional[str],
+    profile: Optional[Dict],
+    deck_content: Optional[str] = None,
+    deck_path: Optional[str] = None,
+    checkpoint: Optional[Dict] = None,
+    on_checkpoint: Optional[Callable[..., None]] = None,
+) -> Tuple[str, str, str]:
+    """
+    Analyze one deck behind the content-addressed result cache: identical decks
+    reuse the cached claims and verification (and the report, for the same
+    investor, profile and memos), everything else runs through run_pipeline. `checkpoint` holds stages
+    finished by an earlier attempt. Returns (claims, verification, report).
+    """
+    investor_digest = profile_digest(profile)
+    if investor_id:
+        # The Analyst also reads the investor's past memos (and its Vector DB profile)
+        investor_digest = f"{investor_id}:{investor_digest}:{memo_version(investor_id)}"
+    deck_hash = None
+    if deck_path and os.path.exists(deck_path):
+        deck_hash = file_digest(deck_path)
+    elif deck_content and deck_content.strip():
+        deck_hash = text_digest(deck_content)
+
+    stages = result_cache.get_stages(deck_hash) if deck_hash else None
+    report = result_cache.get_report(deck_hash, investor_digest) if stages else None
+    if stages and report:
+        print(f"[Worker] Result cache hit for deck {deck_hash[:12]} (stages + report)")
+        record_event("cache_hit:result_report")
+        return stages["claims"], stages["verification"], report
+
+    if stages:
+        print(f"[Worker] Result cache hit for deck {deck_hash[:12]} (stages), running Analyst only")
+        record_event("cache_hit:result_stages")
+    elif checkpoint:
+        print(f"[Worker] Resuming from checkpoint ({', '.join(checkpoint)})")
+        record_event("checkpoint_resume")
+    claims, verification, report = run_pipeline(
+        investor_id, profile, deck_content, deck_path, stages=stages or checkpoint, on_checkpoint=on_checkpoint
+    )
+    if deck_hash and claims and verification and not stages:
+        result_cache.set_stages(deck_hash, claims, verification)
+    if deck_hash and report:
+        result_cache.set_report(deck_hash, investor_digest, report)
+    return claims, verification, report
+
+
+def publish_progress(job_id: str, status: str, **fields):
+    """Publish a job progress event on Redis; a failed publish never fails the job."""
+    try:
+        job_queue.publish_progress(job_id, status, **fields)
+    except Exception as e:
+        print(f"[Worker] Could not publish progress for job {job_id}: {e}")
+
+
+def checkpoint_writer(job_id: str, attempt: int) -> Callable[..., None]:
+    """
+    run_pipeline on_checkpoint callback: stores each checkpoint on the job row and
+    publishes it. Called from stage threads, so each write uses its own session.
+    """
+    def write(status: str, claims: Optional[str] = None, verification: Optional[str] = None):
+        db = SessionLocal()
+        try:
+            stored = update_job_checkpoint(db, job_id, status, attempt, claims=claims, verification=verification)
+        except Exception as e:
+            db.rollback()
+            print(f"[Worker] Could not store checkpoint {status} for job {job_id}: {e}")
+            return
+        finally:
+            db.close()
+        if not stored:
+            print(f"[Worker] Job {job_id} attempt {attempt} was superseded, checkpoint {status} not stored")
+            return
+        print(f"[Worker] Job {job_id} checkpoint: {status}")
+        fields = {"claims": len(parse_claims(claims))} if claims is not None else {}
+        publish_progress(job_id, status, attempt=attempt, **fields)
+
+    return write
+
+
+def run_analyst(
+    claims: str, verification: str, investor_context: Optional[str], memo_context: Optional[str] = None
+) -> str:
+    """Run the Analyst on the extracted claims and verification report."""
+    from crewai import Task, Crew, Process
+    from agents.analyst import create_analyst_agent
+
+    analyst = create_analyst_agent(investor_context=investor_context, memo_context=memo_context)
+    task = Task(
+        description=f'''Review the extracted claims and verification report critically.
+        Focus on the COMPANY being pitched, not sample data or example stores.
+        For each major claim, identify:
+        1. Red flags or inconsistencies
+        2. What information is missing
+        3. Key questions to ask the founders
         
-        # Create all 3 agents
-        scribe = create_scribe_agent()
-        researcher = create_researcher_agent()
-        analyst = create_analyst_agent(investor_context=investor_context)
-        
-        # Create tasks - full pipeline with web research
-        task1 = Task(
-            description=f'''Extract key claims from the following pitch deck text.
-            Focus on the COMPANY being pitched (ignore sample dashboard data like example store names).
-            Extract specific numbers, metrics, market sizes, growth rates, and revenue figures about the company.
-            
-            PITCH DECK TEXT:
-            {deck_content[:4000]}''',
-            agent=scribe,
-            expected_output='A bulleted list of specific, verifiable claims about the company with numbers and dates.'
-        )
+        Include a References section at the end with the source URLs from the verification report.
         
-        task2 = Task(
-            description='''Verify the Top 3 most important claims about the company using web search.
-            For each claim:
-            1. Search for supporting or contradicting evidence
-            2. Include the source URLs from search results in your report
-            
-            Format your verification report like this:
-            - Claim: [the claim]
-            - Status: CONFIRMED / CONTRADICTED / UNVERIFIED
-            - Evidence: [summary of what you found]
-            - Source: [the URL from search results]''',
-            agent=researcher,
-            expected_output='A verification report with status and source URLs for each claim.',
-            context=[task1]
-        )
+        Be skeptical and thorough.
         
-        task3 = Task(
-            description='''Review the extracted claims and verification report critically.
-            Focus on the COMPANY being pitched, not sample data or example stores.
-            For each major claim, identify:
-            1. Red flags or inconsistencies
-            2. What information is missing
-            3. Key questions to ask the founders
-            
-            Include a References section at the end with the source URLs from the verification report.
-            
-            Be skeptical and thorough.''',
-            agent=analyst,
-            expected_output='A detailed due diligence report with red flags, missing info, questions, and a References section with URLs.',
-            context=[task1, task2]
-        )
+        EXTRACTED CLAIMS:
+        {claims}
         
-        # Create and run crew
-        crew = Crew(
-            agents=[scribe, researcher, analyst],
-            tasks=[task1, task2, task3],
-            verbose=True,
-            process=Process.sequential,
-        )
+        VERIFICATION REPORT:
+        {verification}''',
+        agent=analyst,
+        expected_output='A detailed due diligence report with red flags, missing info, questions, and a References section with URLs.'
+    )
+    crew = Crew(agents=[analyst], tasks=[task], verbose=True, process=Process.sequential)
+    result = crew.kickoff()
+    record_crew_usage(result)
+    return str(result)
 
+
+def run_analysis(job_id: str, investor_id: str = None, deck_content: str = None, deck_path: str = None) -> str:
+    """
+    Run the analysis for one job, collecting per-stage metrics that are exported
+    to Prometheus and stored in job_metrics. Returns the resulting job status.
+    """
+    with track_job(job_id) as job_metrics:
+        status = _run_analysis(job_id, investor_id, deck_content, deck_path)
+    record_job_status(status)
+    if status != "skipped":
+        publish_progress(job_id, status, attempt=job_metrics.attempt)
+
+    summary = job_metrics.to_dict()
+    summary["totals"] = job_metrics.totals()
+    stages = ", ".join(f"{name}={seconds:.1f}s" for name, seconds in summary["stages"].items())
+    print(
+        f"[Worker] Job {job_id} {status} in {summary['seconds']:.1f}s ({stages}); "
+        f"llm={summary['totals']} counters={summary['counters']}"
+    )
+    if job_metrics.attempt:
+        db = get_slot_session()
+        try:
+            insert_job_metrics(db, job_id, job_metrics.attempt, status, summary)
+        except Exception as e:
+            db.rollback()
+            print(f"[Worker] Could not store metrics for job {job_id}: {e}")
+        finally:
+            db.close()
+    return status
+
+
+def _run_analysis(job_id: str, investor_id: str = None, deck_content: str = None, deck_path: str = None) -> str:
+    """
+    Run the CrewAI analysis pipeline.
+    Returns the resulting job status: "completed", "retrying", "failed" or
+    "skipped" (job already finished or taken over by another worker).
+    """
+    print(f"[Worker] Starting analysis for job {job_id}")
+    
+    db = get_slot_session()
+    
+    attempt = 0
+    try:
+        # Mark job as started
+        attempt = update_job_started(db, job_id)
+        current_job().attempt = attempt
+        if attempt == 0:
+            # Unknown job, or a duplicate delivery of one that already finished
+            print(f"[Worker] Job {job_id} is not pending or running, skipping")
+            return "skipped"
+        if attempt > MAX_JOB_ATTEMPTS:
+            print(f"[Worker] Job {job_id} exceeded {MAX_JOB_ATTEMPTS} attempts, giving up")
+            update_job_failed(db, job_id, f"Gave up after {MAX_JOB_ATTEMPTS} attempts", attempt)
+            return "failed"
+        publish_progress(job_id, "running", attempt=attempt)
         
-        result = crew.kickoff()
-        
-        # Extract results
-        claims = str(task1.output) if task1.output else ""
-        verification = str(task2.output) if task2.output else ""
-        report = str(result)
-        
-        # Update job as completed
-        update_job_completed(db, job_id, claims, verification, report)
+        # Get investor profile for personalization
+        profile = get_investor_profile(db, investor_id)
+        # A retry picks up the stages its earlier attempts already paid for
+        checkpoint = get_job_checkpoint(db, job_id) if attempt > 1 else None
+
+        # Unknown investors get a generic analysis (no vector DB lookups)
+        claims, verification, report = analyze_deck(
+            investor_id if profile else None, profile, deck_content, deck_path,
+            checkpoint=checkpoint, on_checkpoint=checkpoint_writer(job_id, attempt),
+        )
 
+        # Update job as completed, with claims / verifications as queryable rows
+        with stage("persist"):
+            claim_records = build_claim_records(claims, verification)
+            completed = update_job_completed(db, job_id, claims, verification, report, claim_records, attempt)
+        if not completed:
+            # Another worker took the job over (e.g. after our heartbeat lapsed); its attempt wins
+            print(f"[Worker] Job {job_id} attempt {attempt} was superseded, discarding result")
+            return "skipped"
+        print(f"[Worker] Stored {len(claim_records)} claim records for job {job_id}")
 
         print(f"[Worker] Job {job_id} completed successfully")
+        print(
+            f"[Worker] Cache stats: results={result_cache.stats()} search={search_cache_stats()} "
+            f"facts={get_fact_cache().stats()}"
+        )
+        return "completed"
         
     except Exception as e:
-        print(f"[Worker] Job {job_id} failed: {str(e)}")
-        update_job_failed(db, job_id, str(e))
+        print(f"[Worker] Job {job_id} failed (attempt {attempt}/{MAX_JOB_ATTEMPTS}): {str(e)}")
+        db.rollback()
+        if 0 < attempt < MAX_JOB_ATTEMPTS:
+            update_job_retrying(db, job_id, str(e), attempt)
+            return "retrying"
+        update_job_failed(db, job_id, str(e), attempt or None)
+        return "failed"
     finally:
+        # Returns the connection to the pool; the session is reused by the next job in this slot
         db.close()
 
 
-def process_job(job_data: dict):
-    """Process a single job from the queue."""
+def job_fingerprint(
+    investor_id: Optional[str],
+    profile: Optional[Dict],
+    deck_content: Optional[str],
+    deck_path: Optional[str],
+) -> Optional[str]:
+    """
+    Identity of a job's work: deck content hash + investor + investor profile
+    digest + pipeline version (None if no deck). An edited thesis is new work.
+    """
+    if deck_path and os.path.exists(deck_path):
+        deck_hash = file_digest(deck_path)
+    elif deck_content and deck_content.strip():
+        deck_hash = text_digest(deck_content)
+    else:
+        return None
+    return f"{deck_hash}:{investor_id or '-'}:{profile_digest(profile)}:v{PIPELINE_VERSION}"
+
+
+def load_job_fingerprint(investor_id: Optional[str], deck_content: Optional[str], deck_path: Optional[str]) -> Optional[str]:
+    """job_fingerprint with the investor's current SQL profile."""
+    db = get_slot_session()
+    try:
+        profile = get_investor_profile(db, investor_id)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return job_fingerprint(investor_id, profile, deck_content, deck_path)
+
+
+def copy_job_result(db, source_job_id: str, job_ids: List[str]) -> int:
+    """Complete unfinished jobs with a completed job's results. Returns how many were completed."""
+    source = get_job_by_id(db, source_job_id)
+    if not source or source.status != "completed":
+        return 0
+    raw = lambda value: (value.get("raw") if isinstance(value, dict) else value) or ""
+    claims, verification = raw(source.claims_extracted), raw(source.verification_results)
+    claim_records = build_claim_records(claims, verification)
+
+    copied = 0
+    for job_id in job_ids:
+        if update_job_completed(
+            db, job_id, claims, verification, source.final_report, claim_records,
+            from_statuses=ACTIVE_JOB_STATUSES,
+        ):
+            copied += 1
+            publish_progress(job_id, "completed", deduplicated_from=str(source_job_id))
+    return copied
+
+
+def coalesce_job(job_id: str, fingerprint: str) -> Optional[str]:
+    """
+    Check for an identical job (same deck and investor) before running this one.
+    Returns None if this job should run (it now holds the claim), "completed" if
+    a finished duplicate's result was copied, "deferred" if a duplicate is still
+    in flight (this job waits for its result), or "skipped" if this job is done.
+    """
+    for _ in range(2):
+        leader = job_queue.claim_leader(fingerprint, job_id, DEDUP_WINDOW)
+        if leader == job_id:
+            return None
+        db = get_slot_session()
+        try:
+            source = get_job_by_id(db, leader)
+            status = source.status if source else None
+            if status == "completed":
+                if copy_job_result(db, leader, [job_id]):
+                    print(f"[Worker] Job {job_id} is a duplicate of completed job {leader}, result copied")
+                    record_event("dedup:copied")
+                    return "completed"
+                return "skipped"
+            if status in ACTIVE_JOB_STATUSES:
+                job_queue.add_waiting(fingerprint, job_id, DEDUP_WINDOW)
+                print(f"[Worker] Job {job_id} is a duplicate of in-flight job {leader}, waiting for its result")
+                record_event("dedup:deferred")
+                return "deferred"
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        # The claim holder failed or no longer exists: take over
+        job_queue.release_leader(fingerprint, leader)
+    return None
+
+
+def finish_leader(job_id: str, fingerprint: str, status: str):
+    """Hand the claim holder's outcome to the duplicates waiting on it."""
+    if status == "completed":
+        waiting = [other for other in job_queue.pop_waiting(fingerprint) if other != job_id]
+        if waiting:
+            db = get_slot_session()
+            try:
+                copied = copy_job_result(db, job_id, waiting)
+            finally:
+                db.close()
+            record_event("dedup:fanned_out", copied)
+            print(f"[Worker] Job {job_id} result copied to {copied} duplicate job(s)")
+        # The claim stays until the window ends, so later duplicates reuse this result
+    elif status == "failed":
+        # Waiting duplicates take over on their next check
+        job_queue.release_leader(fingerprint, job_id)
+
+
+def process_job(job_data: dict) -> str:
+    """Process a single job from the queue. Returns the resulting job status."""
     job_id = job_data.get("job_id")
     investor_id = job_data.get("investor_id")
     deck_content = job_data.get("deck_content")
@@ -240,43 +691,155 @@ def process_job(job_data: dict):
     
     if not job_id:
         print("[Worker] Invalid job data - no job_id")
-        return
+        return "failed"
     
     print(f"[Worker] Processing job - deck_path: {deck_path}, has_content: {bool(deck_content)}")
-    run_analysis(job_id, investor_id, deck_content, deck_path)
+    fingerprint = None
+    if DEDUP_WINDOW > 0:
+        try:
+            fingerprint = load_job_fingerprint(investor_id, deck_content, deck_path)
+        except Exception as e:
+            print(f"[Worker] Could not load investor profile for job {job_id} duplicate check: {e}. Running it anyway.")
+    if fingerprint:
+        try:
+            outcome = coalesce_job(job_id, fingerprint)
+        except Exception as e:
+            print(f"[Worker] Duplicate check failed for job {job_id}: {e}. Running it anyway.")
+            outcome, fingerprint = None, None
+        if outcome:
+            return outcome
+
+    status = run_analysis(job_id, investor_id, deck_content, deck_path)
+    if fingerprint:
+        try:
+            finish_leader(job_id, fingerprint, status)
+        except Exception as e:
+            print(f"[Worker] Could not hand job {job_id} result to duplicates: {e}")
+    return status
+
+
+def _handle_shutdown(signum, frame):
+    """Signal handler - stop pulling jobs and let running ones finish."""
+    print(f"[Worker] Received signal {signum}, draining in-flight jobs...")
+    shutdown_event.set()
+
+
+def _run_slot(raw: bytes, job: dict, slots: threading.BoundedSemaphore):
+    """Run one job on a pool thread, ack or reschedule it, and free its slot."""
+    try:
+        status = process_job(job)
+        if status == "retrying":
+            delay = job_queue.retry(raw, job, job.get("attempt", 1))
+            print(f"[Worker] Job {job.get('job_id')} scheduled for retry in {delay:.0f}s")
+        elif status == "deferred":
+            job_queue.defer(raw, job, DEDUP_RECHECK)
+        else:
+            job_queue.ack(raw)
+    except Exception as e:
+        print(f"[Worker] Unexpected error in job slot: {e}")
+        try:
+            job_queue.retry(raw, job, job.get("attempt", 1))
+        except Exception:
+            pass  # Still in the processing list; handed back on shutdown or by the reaper
+    finally:
+        slots.release()
+
+
+def _maintenance_loop(stop: threading.Event):
+    """Heartbeat this worker, promote due retries and recover jobs from dead workers."""
+    while not stop.is_set():
+        try:
+            job_queue.heartbeat()
+            job_queue.promote_due()
+            job_queue.reap()
+        except redis.ConnectionError as e:
+            print(f"[Worker] Redis connection error in maintenance: {e}")
+        except Exception as e:
+            print(f"[Worker] Maintenance error: {e}")
+        stop.wait(HEARTBEAT_INTERVAL)
 
 
 def main():
-    """Main worker loop - listens for jobs on Redis queue."""
+    """Main worker loop - listens for jobs on Redis queue and runs them on a bounded pool."""
     print(f"[Worker] Starting job worker, listening on {JOB_QUEUE}...")
     print(f"[Worker] Redis: {REDIS_URL}")
-    
-    while True:
+    print(f"[Worker] Concurrency: {WORKER_CONCURRENCY} job slots")
+    print(f"[Worker] Reliable queue: {RELIABLE_QUEUE} (worker id {job_queue.worker_id})")
+    models = ", ".join(f"{s}={stage_config(s)['model']}" for s in ("scribe", "analyst", "verifier"))
+    print(f"[Worker] LLM models: {models}")
+
+    # Before any other thread starts (embedder, metrics server, maintenance, job slots)
+    start_ocr_pool()
+
+    if PRELOAD_EMBEDDER:
+        try:
+            from personalization.investor_memory import preload
+            preload()
+            print("[Worker] Investor memory preloaded")
+        except Exception as e:
+            print(f"[Worker] Investor memory preload skipped: {e}")
+
+    signal.signal(signal.SIGTERM, _handle_shutdown)
+    signal.signal(signal.SIGINT, _handle_shutdown)
+
+    try:
+        if start_metrics_server():
+            print(f"[Worker] Metrics on :{METRICS_PORT}/metrics")
+    except OSError as e:
+        print(f"[Worker] Metrics endpoint disabled: {e}")
+
+    # A job is only popped once a slot is free, so jobs never pile up in-process
+    # where a crash would lose them.
+    slots = threading.BoundedSemaphore(WORKER_CONCURRENCY)
+    executor = ThreadPoolExecutor(max_workers=WORKER_CONCURRENCY, thread_name_prefix="analysis")
+
+    # A crash restart keeps the same worker id, and reap() never touches our own list
+    try:
+        job_queue.recover()
+    except redis.ConnectionError as e:
+        print(f"[Worker] Could not recover jobs from a previous run: {e}")
+
+    # Heartbeats must keep going while in-flight jobs drain after shutdown
+    maintenance_stop = threading.Event()
+    maintenance = threading.Thread(
+        target=_maintenance_loop, args=(maintenance_stop,), name="maintenance", daemon=True
+    )
+    maintenance.start()
+
+    while not shutdown_event.is_set():
+        if not slots.acquire(timeout=1):
+            continue
+
         try:
-            # Block and wait for job (timeout 0 = wait forever)
-            result = redis_client.blpop(JOB_QUEUE, timeout=30)
-            
+            result = job_queue.fetch(POLL_TIMEOUT)
+
             if result:
-                queue_name, job_data = result
-                job = json.loads(job_data)
+                raw, job = result
                 print(f"[Worker] Received job: {job}")
-                process_job(job)
+                executor.submit(_run_slot, raw, job, slots)
             else:
                 # Timeout - just continue waiting
-                pass
-                
+                slots.release()
+
         except redis.ConnectionError as e:
+            slots.release()
             print(f"[Worker] Redis connection error: {e}")
             time.sleep(5)  # Wait before retry
         except json.JSONDecodeError as e:
+            slots.release()
             print(f"[Worker] Invalid job JSON: {e}")
-        except KeyboardInterrupt:
-            print("[Worker] Shutting down...")
-            break
         except Exception as e:
+            slots.release()
             print(f"[Worker] Unexpected error: {e}")
             time.sleep(1)
 
+    print("[Worker] Shutting down, waiting for in-flight jobs...")
+    executor.shutdown(wait=True)
+    maintenance_stop.set()
+    maintenance.join()
+    job_queue.close()
+    print("[Worker] All jobs drained, bye.")
+
 
 if __name__ == "__main__":
     main()
@@ -6,6 +6,26 @@ import type { Job, Investor } from './api';
 
 type Tab = 'analysis' | 'investors' | 'gmail';
 
+// Jobs still being worked on, with what the worker is doing at each checkpoint
+const PROGRESS_LABELS: Record<string, string> = {
+  pending: 'Waiting for a worker...',
+  running: 'Reading the pitch deck...',
+  extracted: 'Scribe is extracting claims...',
+  claims_ready: 'Verifying claims...',
+  verified: 'Analyst is writing the report...',
+  retrying: 'Retrying after an error...',
+};
+
+// Raw text of a checkpointed JSONB column ({"raw": "..."})
+function checkpointText(value?: string): string | undefined {
+  if (!value) return undefined;
+  try {
+    return JSON.parse(value).raw;
+  } catch {
+    return undefined;
+  }
+}
+
 function App() {
   const [activeTab, setActiveTab] = useState<Tab>('analysis');
   const [jobs, setJobs] = useState<Job[]>([]);
@@ -322,13 +342,19 @@ function App() {
                   Upload a pitch deck to get started
                 </p>
               </div>
-            ) : selectedJob.status === 'pending' || selectedJob.status === 'running' ? (
+            ) : selectedJob.status in PROGRESS_LABELS ? (
               <div className="report-empty">
                 <div className="spinner"></div>
                 <p style={{ marginTop: '1.5rem' }}>Analysis in progress...</p>
                 <p style={{ fontSize: '0.875rem', color: 'var(--text-muted)', marginTop: '0.5rem' }}>
-                  Scribe → Researcher → Analyst
+                  {PROGRESS_LABELS[selectedJob.status]}
                 </p>
+                {checkpointText(selectedJob.claims_extracted) && (
+                  <div className="report-body markdown-content" style={{ marginTop: '1.5rem', textAlign: 'left' }}>
+                    <h3>Extracted Claims</h3>
+                    <ReactMarkdown>{checkpointText(selectedJob.claims_extracted)}</ReactMarkdown>
+                  </div>
+                )}
               </div>
             ) : selectedJob.status === 'failed' ? (
               <div className="report-empty">
@@ -23,7 +23,7 @@ export interface Job {
     id: string;
     deck_id?: string;
     investor_id?: string;
-    status: 'pending' | 'running' | 'completed' | 'failed';
+    status: 'pending' | 'running' | 'extracted' | 'claims_ready' | 'verified' | 'retrying' | 'completed' | 'failed';
     claims_extracted?: string;
     verification_results?: string;
     final_report?: string;